@@ -1,27 +1,31 @@
-from flask import Flask, render_template, request, jsonify, send_file, make_response
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, send_file, make_response
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import json
+import time
+import uuid
+import hashlib
+import zlib
 import traceback
 import logging
-import numpy as np
+import atexit
+import threading
+import multiprocessing
+import zipfile
 import csv
 from io import StringIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from sqlalchemy import and_, or_, update, inspect, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from werkzeug.utils import secure_filename
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
-app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx'}
-
-db = SQLAlchemy(app)
+db = SQLAlchemy()
 
 class ResumeAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -58,6 +62,18 @@ class ResumeAnalysis(db.Model):
     analysis_report = db.Column(db.Text)
     processing_time = db.Column(db.Float)  # Processing time in seconds
     
+    # Deduplication of re-uploaded documents
+    content_hash = db.Column(db.String(64))  # SHA-256 of the uploaded file
+    pipeline_version = db.Column(db.String(20))
+    model_version = db.Column(db.String(40))  # Classifier version that produced the analysis
+    
+    # Eligibility of the same resume for every department (JSON), filled by all_departments analyses
+    department_scores = db.Column(db.Text)
+    
+    __table_args__ = (
+        db.Index('ix_resume_analysis_dedupe', 'content_hash', 'department', 'pipeline_version'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -82,47 +98,231 @@ class ResumeAnalysis(db.Model):
             'analysis_report': self.analysis_report,
             'skills': json.loads(self.skills) if self.skills else [],
             'upload_date': self.upload_date.strftime('%Y-%m-%d %H:%M:%S'),
-            'processing_time': self.processing_time
+            'processing_time': self.processing_time,
+            'content_hash': self.content_hash,
+            'pipeline_version': self.pipeline_version,
+            'model_version': self.model_version,
+            'department_scores': json.loads(self.department_scores) if self.department_scores else None
+        }
+
+class AnalysisJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, done, failed
+    filename = db.Column(db.String(200), nullable=False)
+    original_filename = db.Column(db.String(200))
+    file_path = db.Column(db.String(300), nullable=False)  # Where the upload is persisted, if enabled
+    file_data = db.Column(db.LargeBinary)  # Uploaded document, cleared once the job finishes
+    department = db.Column(db.String(50), nullable=False)  # Empty for the best match of an all_departments job
+    all_departments = db.Column(db.Boolean, default=False)
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.String(500))
+    analysis_id = db.Column(db.Integer, db.ForeignKey('resume_analysis.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'original_filename': self.original_filename,
+            'department': self.department,
+            'all_departments': bool(self.all_departments),
+            'attempts': self.attempts,
+            'error': self.error,
+            'analysis_id': self.analysis_id,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
+            'started_at': self.started_at.strftime('%Y-%m-%d %H:%M:%S') if self.started_at else None,
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else None
         }
 
-# Import components with error handling
+class ExtractedText(db.Model):
+    """Normalized text extracted from a document, keyed by the document's content hash"""
+    content_hash = db.Column(db.String(64), primary_key=True)
+    compressed_text = db.Column(db.LargeBinary, nullable=False)  # zlib-compressed UTF-8
+    char_count = db.Column(db.Integer)
+    backend = db.Column(db.String(30))  # Extraction backend that produced the text
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @property
+    def text(self):
+        return zlib.decompress(self.compressed_text).decode('utf-8')
+
+# Import components with error handling (extraction backends, scikit-learn
+# and numpy are only imported once the components below are first used)
 try:
-    from utils.parser import ResumeParser
-    from models.classifier import ResumeClassifier
-    from models.ranker import ResumeRanker
-    from config.departments import (
-        get_all_departments, 
-        calculate_eligibility_score,
-        get_ai_authenticity_status,
-        get_final_decision
+    from utils.extraction_sandbox import create_extraction_sandbox, EXTRACTION_SANDBOXES
+    from utils.pdf_extractor import load_backends
+    from utils.pipeline import (
+        ResumePipeline,
+        AnalysisError,
+        init_worker_pipeline,
+        analyze_file_in_worker,
+        analyze_text_in_worker,
+        PIPELINE_VERSION
     )
+    from config.departments import get_all_departments, get_best_department
     logger.info("✅ All modules imported successfully")
 except ImportError as e:
     logger.error(f"❌ Import error: {e}")
     raise
 
-# Initialize components
-parser = ResumeParser()
-classifier = ResumeClassifier()
-ranker = ResumeRanker()
+# Components are built on first use, or up front by warm_up()
+_pipeline = None
+_ranker = None
+_feature_store = None
+_corpus_matrix = None
 
-# Create tables
-with app.app_context():
-    try:
-        db.create_all()
-        logger.info("✅ Database tables created successfully")
-    except Exception as e:
-        logger.error(f"❌ Database error: {e}")
+def get_pipeline():
+    """Build the analysis pipeline (parser, classifier, extraction sandboxes) on first use"""
+    global _pipeline
+    if _pipeline is None:
+        # Extraction runs in recyclable child processes (see EXTRACTION_* settings)
+        _pipeline = ResumePipeline(sandbox=create_extraction_sandbox(EXTRACTION_SANDBOXES))
+        logger.info("✅ Analysis pipeline initialized")
+    return _pipeline
+
+def get_ranker():
+    """Build the candidate ranker on first use"""
+    global _ranker
+    if _ranker is None:
+        from models.ranker import ResumeRanker
+        _ranker = ResumeRanker()
+    return _ranker
+
+def get_feature_store():
+    """The feature store of the current app, or None when FEATURE_STORE_DIR is empty"""
+    global _feature_store
+    directory = current_app.config['FEATURE_STORE_DIR']
+    if not directory:
+        return None
+    if _feature_store is None or _feature_store.directory != directory:
+        from utils.feature_store import FeatureStore
+        _feature_store = FeatureStore(directory)
+    return _feature_store
+
+def get_corpus_matrix():
+    """The corpus matrix of the current app, or None when CORPUS_MATRIX_DIR is empty"""
+    global _corpus_matrix
+    directory = current_app.config['CORPUS_MATRIX_DIR']
+    if not directory:
+        return None
+    if _corpus_matrix is None or _corpus_matrix.directory != directory:
+        from utils.corpus_matrix import CorpusMatrix
+        _corpus_matrix = CorpusMatrix(directory)
+    return _corpus_matrix
+
+def warm_up():
+    """Load every component now instead of on the first request that needs it"""
+    start = time.perf_counter()
+    # Imported before the extraction sandboxes fork, so they inherit the backends
+    load_backends()
+    get_pipeline()
+    get_ranker()
+    logger.info(f"🔥 Components warmed up in {time.perf_counter() - start:.2f}s")
+
+def ensure_schema():
+    """Add columns and indexes introduced after a table was first created (SQLite has no migrations here)"""
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info(f"🛠️ Added column {table.name}.{column.name}")
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+bp = Blueprint('main', __name__)
+
+def create_app(config=None):
+    """
+    Application factory
+    
+    Args:
+        config: Optional dictionary of settings overriding the defaults
+    
+    Returns:
+        Flask application with tables created; heavy components are loaded
+        on first use, or right away when WARM_UP is enabled
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['UPLOAD_FOLDER'] = 'uploads'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
+    app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'docx'}
+    # Uploads are analyzed from memory; keep a copy of the original file in UPLOAD_FOLDER only if enabled
+    app.config['PERSIST_UPLOADS'] = os.environ.get('PERSIST_UPLOADS', 'False').lower() == 'true'
+    # SQLite is shared with the analysis worker processes, so wait on locks instead of failing fast
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30}}
+    
+    # Asynchronous analysis queue
+    app.config['ASYNC_ANALYSIS'] = os.environ.get('ASYNC_ANALYSIS', 'False').lower() == 'true'
+    app.config['ANALYSIS_WORKERS'] = int(os.environ.get('ANALYSIS_WORKERS', 2))
+    app.config['JOB_POLL_INTERVAL'] = 1.0  # Seconds an idle worker waits before polling again
+    app.config['JOB_LEASE_SECONDS'] = 300  # Running jobs older than this are considered abandoned
+    app.config['JOB_MAX_ATTEMPTS'] = 3
+    
+    # Batch analysis
+    app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 2))
+    app.config['BATCH_MAX_FILES'] = 500
+    app.config['BATCH_MAX_BYTES'] = 256 * 1024 * 1024  # Uncompressed size of all documents in one batch
+    app.config['BATCH_COMMIT_SIZE'] = 100  # Rows inserted per transaction
+    app.config['BATCH_FILE_TIMEOUT'] = int(os.environ.get('BATCH_FILE_TIMEOUT', 120))  # Seconds to wait for each document
+    
+    # Columnar features of every saved analysis (empty to disable), see utils/feature_store.py
+    app.config['FEATURE_STORE_DIR'] = os.environ.get('FEATURE_STORE_DIR', 'data/feature_store')
+    # Sparse TF-IDF matrix of every analyzed resume (empty to disable), see utils/corpus_matrix.py
+    app.config['CORPUS_MATRIX_DIR'] = os.environ.get('CORPUS_MATRIX_DIR', 'data/corpus_matrix')
+    
+    # Build the pipeline and ranker before serving instead of on the first request
+    app.config['WARM_UP'] = os.environ.get('WARM_UP', 'False').lower() == 'true'
+    if config:
+        app.config.update(config)
+    
+    db.init_app(app)
+    app.register_blueprint(bp)
+    
+    # Create tables
+    with app.app_context():
+        try:
+            db.create_all()
+            ensure_schema()
+            logger.info("✅ Database tables created successfully")
+        except Exception as e:
+            logger.error(f"❌ Database error: {e}")
+    
+    if app.config['WARM_UP']:
+        warm_up()
+    return app
+
+def __getattr__(name):
+    """Create the default application on first access of app.app (e.g. gunicorn app:app)"""
+    global app
+    if name == 'app':
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def allowed_file(filename):
     """Check if the file extension is allowed"""
     return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def form_flag(name):
+    """Read a boolean flag from the submitted form"""
+    return request.form.get(name, '').lower() in ('1', 'true', 'yes')
 
 def cleanup_old_files():
     """Clean up files older than 24 hours"""
     try:
-        upload_dir = app.config['UPLOAD_FOLDER']
+        upload_dir = current_app.config['UPLOAD_FOLDER']
         if not os.path.exists(upload_dir):
             return
         
@@ -137,26 +337,589 @@ def cleanup_old_files():
     except Exception as e:
         logger.error(f"❌ Error cleaning up files: {e}")
 
-@app.route('/')
+# Per-process cache counters, exposed on /api/cache/stats
+dedupe_stats = {'hits': 0, 'misses': 0}
+text_cache_stats = {'hits': 0, 'misses': 0}
+
+# Columns that describe an upload rather than the analysis, never copied between rows
+UPLOAD_COLUMNS = {'id', 'filename', 'original_filename', 'upload_date', 'processing_time'}
+
+def compute_content_hash(data):
+    """SHA-256 hex digest of an uploaded document"""
+    return hashlib.sha256(data).hexdigest()
+
+def find_cached_analysis(content_hash, department, all_departments=False):
+    """
+    Look up a stored analysis of the same document, department and pipeline version
+    
+    With all_departments only analyses that carry the department score matrix
+    qualify, and a missing department matches the one scored for the best
+    department
+    """
+    query = ResumeAnalysis.query.filter_by(content_hash=content_hash, pipeline_version=PIPELINE_VERSION)
+    if department or not all_departments:
+        query = query.filter_by(department=department)
+    if all_departments:
+        query = query.filter(ResumeAnalysis.department_scores.isnot(None))
+    query = query.order_by(ResumeAnalysis.id.desc())
+    
+    if all_departments and not department:
+        cached = next((
+            analysis for analysis in query.all()
+            if analysis.department == get_best_department(json.loads(analysis.department_scores))
+        ), None)
+    else:
+        cached = query.first()
+    
+    if cached is None:
+        dedupe_stats['misses'] += 1
+    else:
+        dedupe_stats['hits'] += 1
+    return cached
+
+def cached_analysis_fields(source, processing_time):
+    """Copy the analysis columns of a stored row for a repeat upload"""
+    fields = {
+        column.name: getattr(source, column.name)
+        for column in ResumeAnalysis.__table__.columns
+        if column.name not in UPLOAD_COLUMNS
+    }
+    fields['processing_time'] = processing_time
+    return fields
+
+def load_extracted_text(content_hash):
+    """Return cached extracted text for a document, or None"""
+    cached = db.session.get(ExtractedText, content_hash)
+    if cached is None:
+        text_cache_stats['misses'] += 1
+        return None
+    text_cache_stats['hits'] += 1
+    return cached.text
+
+def store_extracted_text(content_hash, extracted_text, backend=None):
+    """Cache extracted text; committed together with the caller's next commit"""
+    db.session.execute(
+        sqlite_insert(ExtractedText).values(
+            content_hash=content_hash,
+            compressed_text=zlib.compress(extracted_text.encode('utf-8'), 6),
+            char_count=len(extracted_text),
+            backend=backend,
+            created_at=datetime.utcnow()
+        ).on_conflict_do_nothing()
+    )
+
+def analyze_document(data, file_ext, department, content_hash, start_time, all_departments=False):
+    """Run the pipeline, skipping text extraction when the document's text is cached"""
+    cached_text = load_extracted_text(content_hash)
+    if cached_text is not None:
+        fields, meta = get_pipeline().analyze_text(cached_text, department, start_time, all_departments)
+        meta['extraction'] = {'backend': 'text-cache'}
+        meta['text'] = cached_text
+    else:
+        fields, meta = get_pipeline().analyze_file(data, file_ext, department, start_time, all_departments)
+        if meta.get('text'):
+            store_extracted_text(content_hash, meta['text'], meta['extraction'].get('backend'))
+    fields['content_hash'] = content_hash
+    return fields, meta
+
+_upload_writer = ThreadPoolExecutor(max_workers=1)
+
+def _write_upload(file_path, data):
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(data)
+        logger.info(f"📁 File saved: {os.path.basename(file_path)}")
+    except Exception as e:
+        logger.error(f"❌ Error saving upload {file_path}: {e}")
+
+def persist_upload(filename, data, deferred=True):
+    """Keep the original document in UPLOAD_FOLDER when PERSIST_UPLOADS is enabled"""
+    if not current_app.config['PERSIST_UPLOADS']:
+        return
+    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    if deferred:
+        # Off the request thread: the analysis never reads this copy
+        _upload_writer.submit(_write_upload, file_path, data)
+    else:
+        _write_upload(file_path, data)
+
+_analysis_writer = ThreadPoolExecutor(max_workers=1)
+
+def _append_analyses(feature_store, corpus_matrix, ids, texts, fields_list):
+    if feature_store is not None:
+        try:
+            feature_store.append(
+                ids,
+                texts,
+                [json.loads(fields.get('skills') or '{}') for fields in fields_list],
+                [json.loads(fields.get('work_experience') or '{}') for fields in fields_list],
+                [json.loads(fields.get('education') or '{}') for fields in fields_list]
+            )
+        except Exception as e:
+            logger.error(f"❌ Error recording features of analyses {ids[0]}-{ids[-1]}: {e}")
+    if corpus_matrix is not None:
+        try:
+            corpus_matrix.append(ids, texts)
+        except Exception as e:
+            logger.error(f"❌ Error adding analyses {ids[0]}-{ids[-1]} to the corpus matrix: {e}")
+    schedule_compaction([store for store in (feature_store, corpus_matrix) if store is not None])
+
+_compactor = None
+_compactor_pid = None
+_compactions = {}  # Store directory -> its pending compaction in this process
+
+def _compact_store(store):
+    try:
+        merged = store.compact(tiered=True)
+        if merged:
+            logger.info(f"🗜️ Merged {merged} shards in {store.directory}")
+    except Exception as e:
+        logger.error(f"❌ Error compacting {store.directory}: {e}")
+
+def schedule_compaction(stores):
+    """
+    Merge the small shards of stores that have too many, on a background
+    thread, so neither requests nor the analysis writer wait for a merge
+    """
+    global _compactor, _compactor_pid
+    if _compactor_pid != os.getpid():
+        # Threads do not survive a fork, so each job worker starts its own
+        _compactor = ThreadPoolExecutor(max_workers=1)
+        _compactor_pid = os.getpid()
+        _compactions.clear()
+    for store in stores:
+        pending = _compactions.get(store.directory)
+        if (pending is None or pending.done()) and store.compaction_due():
+            _compactions[store.directory] = _compactor.submit(_compact_store, store)
+
+def stored_text(content_hash):
+    """Extracted text of a document for the feature store and corpus matrix ('' when it is not cached)"""
+    cached = db.session.get(ExtractedText, content_hash) if content_hash else None
+    return cached.text if cached is not None else ''
+
+def record_analyses(ids, texts, fields_list, deferred=True):
+    """
+    Append saved analyses to the feature store and the corpus matrix
+    
+    Featurizing and writing run off the request thread, one shard (and
+    corpus segment) per call
+    
+    Args:
+        ids: Analysis ids
+        texts: Extracted text per analysis ('' when not available)
+        fields_list: Column values per analysis (skills, work_experience and education JSON)
+        deferred: Write on the background thread; job workers pass False because
+            the writer thread of the parent process does not survive the fork
+    """
+    feature_store = get_feature_store()
+    corpus_matrix = get_corpus_matrix()
+    if (feature_store is None and corpus_matrix is None) or not ids:
+        return
+    args = (feature_store, corpus_matrix, list(ids), [text or '' for text in texts], list(fields_list))
+    if deferred:
+        _analysis_writer.submit(_append_analyses, *args)
+    else:
+        _append_analyses(*args)
+
+def _delete_analyses(stores, ids):
+    for store in stores:
+        try:
+            store.delete(ids)
+        except Exception as e:
+            logger.error(f"❌ Error recording deletion of analyses {ids} in {store.directory}: {e}")
+
+def forget_analyses(ids):
+    """
+    Hide deleted analyses in the feature store and the corpus matrix; their
+    rows are dropped by the next compaction
+    
+    Queued on the same thread as record_analyses, so a deletion is never
+    recorded before the rows it hides
+    """
+    stores = [store for store in (get_feature_store(), get_corpus_matrix()) if store is not None]
+    if stores and ids:
+        _analysis_writer.submit(_delete_analyses, stores, list(ids))
+
+def save_analysis(filename, original_filename, fields):
+    """Persist pipeline output as a ResumeAnalysis row"""
+    analysis = ResumeAnalysis(filename=filename, original_filename=original_filename, **fields)
+    db.session.add(analysis)
+    db.session.commit()
+    return analysis
+
+def save_analyses_bulk(rows):
+    """
+    Persist many pipeline outputs, one transaction per BATCH_COMMIT_SIZE rows
+    
+    Args:
+        rows: List of (filename, original_filename, fields) tuples
+    
+    Returns:
+        List of analysis dictionaries in input order
+    """
+    saved = []
+    chunk_size = current_app.config['BATCH_COMMIT_SIZE']
+    for i in range(0, len(rows), chunk_size):
+        chunk = [
+            ResumeAnalysis(filename=filename, original_filename=original_filename, **fields)
+            for filename, original_filename, fields in rows[i:i + chunk_size]
+        ]
+        db.session.add_all(chunk)
+        db.session.flush()
+        # Serialize before commit so expired attributes are not reloaded row by row
+        saved.extend(analysis.to_dict() for analysis in chunk)
+        db.session.commit()
+    return saved
+
+_batch_executor = None
+
+def get_batch_executor():
+    """Lazily create the process pool shared by batch requests"""
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ProcessPoolExecutor(
+            max_workers=current_app.config['BATCH_WORKERS'],
+            initializer=init_worker_pipeline
+        )
+    return _batch_executor
+
+def reset_batch_executor(executor):
+    """
+    Discard a broken or stuck batch pool so the next batch starts a new one
+    
+    Worker processes are terminated: shutdown() alone would leave a hung
+    analysis running for good
+    """
+    global _batch_executor
+    if _batch_executor is executor:
+        _batch_executor = None
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    logger.warning(f"♻️ Batch pool reset ({len(processes)} workers stopped)")
+
+def submit_batch_task(fn, *args):
+    """Submit to the batch pool, replacing it once if a worker died since the last batch"""
+    executor = get_batch_executor()
+    try:
+        return executor.submit(fn, *args)
+    except BrokenProcessPool:
+        reset_batch_executor(executor)
+        return get_batch_executor().submit(fn, *args)
+
+class BatchLimitError(ValueError):
+    """A batch has more documents than BATCH_MAX_FILES or more bytes than BATCH_MAX_BYTES"""
+
+def collect_batch_uploads(files):
+    """
+    Read uploaded files (expanding ZIP archives) into memory
+    
+    Limits are checked against the sizes in each archive's directory
+    before any member is inflated
+    
+    Returns:
+        Tuple of (documents, errors): documents are (original_filename,
+        filename, data, content_hash) tuples, errors are per-file
+        result dictionaries
+    
+    Raises:
+        BatchLimitError: The batch exceeds BATCH_MAX_FILES or BATCH_MAX_BYTES
+    """
+    documents = []
+    errors = []
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    max_files = current_app.config['BATCH_MAX_FILES']
+    max_bytes = current_app.config['BATCH_MAX_BYTES']
+    totals = {'files': 0, 'bytes': 0}
+    
+    def accept(original_name, size):
+        """Validate one document and count it against the batch limits; returns its safe name or None"""
+        original_filename = secure_filename(os.path.basename(original_name))
+        if not original_filename or not allowed_file(original_filename):
+            errors.append({
+                'filename': original_name,
+                'success': False,
+                'error': 'Invalid file type. Only PDF and DOCX files are allowed.'
+            })
+            return None
+        totals['files'] += 1
+        totals['bytes'] += size
+        if totals['files'] > max_files:
+            raise BatchLimitError(f"Too many files. Maximum is {max_files} per batch.")
+        if totals['bytes'] > max_bytes:
+            raise BatchLimitError(f"Batch too large. Maximum is {max_bytes // (1024 * 1024)}MB of documents.")
+        return original_filename
+    
+    def store(original_filename, data):
+        filename = f"{timestamp}_{len(documents):04d}_{original_filename}"
+        documents.append((original_filename, filename, data, compute_content_hash(data)))
+    
+    for file in files:
+        if not file.filename:
+            continue
+        if file.filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(file.stream) as archive:
+                    accepted = []
+                    for member in archive.infolist():
+                        if member.is_dir() or os.path.basename(member.filename).startswith('.'):
+                            continue
+                        if member.file_size > current_app.config['MAX_CONTENT_LENGTH']:
+                            errors.append({'filename': member.filename, 'success': False, 'error': 'File too large'})
+                            continue
+                        original_filename = accept(member.filename, member.file_size)
+                        if original_filename:
+                            accepted.append((original_filename, member))
+                    # Reads stop at the directory's file_size, so the limits above hold
+                    for original_filename, member in accepted:
+                        store(original_filename, archive.read(member))
+            except zipfile.BadZipFile:
+                errors.append({'filename': file.filename, 'success': False, 'error': 'Invalid ZIP archive'})
+        else:
+            data = file.read()
+            original_filename = accept(file.filename, len(data))
+            if original_filename:
+                store(original_filename, data)
+    
+    return documents, errors
+
+def enqueue_analysis_job(filename, original_filename, data, department, all_departments=False):
+    """Persist a queued analysis job (document included) and make sure workers are running"""
+    job = AnalysisJob(
+        filename=filename,
+        original_filename=original_filename,
+        file_path=os.path.join(current_app.config['UPLOAD_FOLDER'], filename),
+        file_data=data,
+        department=department or '',
+        all_departments=all_departments
+    )
+    db.session.add(job)
+    db.session.commit()
+    logger.info(f"📥 Queued analysis job {job.id} for {filename}")
+    start_job_workers()
+    return job
+
+def claim_next_job():
+    """Atomically claim the oldest queued job (or one abandoned by a dead worker)"""
+    lease_cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_LEASE_SECONDS'])
+    claimable = or_(
+        AnalysisJob.status == 'queued',
+        and_(AnalysisJob.status == 'running', AnalysisJob.started_at < lease_cutoff)
+    )
+    candidates = AnalysisJob.query.filter(claimable).order_by(AnalysisJob.created_at).limit(10).all()
+    
+    for job in candidates:
+        if job.attempts >= current_app.config['JOB_MAX_ATTEMPTS']:
+            job.status = 'failed'
+            job.error = job.error or 'Exceeded maximum attempts'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            continue
+        
+        # The attempts counter doubles as an optimistic lock between workers
+        result = db.session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job.id, AnalysisJob.attempts == job.attempts, claimable)
+            .values(status='running', started_at=datetime.utcnow(), attempts=job.attempts + 1)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return db.session.get(AnalysisJob, job.id)
+    
+    return None
+
+def renew_job_lease(engine, job_id, attempt, stop, interval):
+    """Heartbeat thread: keep a running job's lease fresh until stopped or the job is lost"""
+    while not stop.wait(interval):
+        try:
+            with engine.begin() as connection:
+                result = connection.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id, AnalysisJob.attempts == attempt, AnalysisJob.status == 'running')
+                    .values(started_at=datetime.utcnow())
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not renew the lease of job {job_id}: {e}")
+            continue
+        if result.rowcount != 1:
+            return
+
+def process_job(job):
+    """Run the analysis pipeline for a claimed job and record the outcome"""
+    # The attempts value set by the claim identifies this run; the lease is
+    # renewed while it works, and the outcome is written only if it still owns the job
+    attempt = job.attempts
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=renew_job_lease,
+        args=(db.engine, job.id, attempt, stop, current_app.config['JOB_LEASE_SECONDS'] / 3),
+        name=f'job-lease-{job.id}', daemon=True
+    )
+    heartbeat.start()
+    
+    analysis = None
+    try:
+        start_time = datetime.now()
+        if job.file_data is not None:
+            data = job.file_data
+        else:
+            # Jobs queued before documents were stored in the job row
+            with open(job.file_path, 'rb') as f:
+                data = f.read()
+        content_hash = compute_content_hash(data)
+        department = job.department or None
+        all_departments = bool(job.all_departments)
+        
+        cached = find_cached_analysis(content_hash, department, all_departments)
+        if cached is not None:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            fields = cached_analysis_fields(cached, processing_time)
+            text = stored_text(content_hash)
+        else:
+            file_ext = os.path.splitext(job.original_filename or job.filename)[1].lower()
+            fields, meta = analyze_document(data, file_ext, department, content_hash, start_time, all_departments)
+            text = meta.get('text')
+            persist_upload(job.filename, data, deferred=False)
+        # Flushed, not committed: the row is kept only together with the job's outcome
+        analysis = ResumeAnalysis(filename=job.filename, original_filename=job.original_filename, **fields)
+        db.session.add(analysis)
+        db.session.flush()
+        outcome = {'status': 'done', 'analysis_id': analysis.id, 'error': None, 'file_data': None}
+    except AnalysisError as e:
+        outcome = {'status': 'failed', 'error': str(e), 'file_data': None}
+    except Exception as e:
+        db.session.rollback()
+        analysis = None
+        logger.error(f"❌ Job {job.id} failed: {e}")
+        logger.error(traceback.format_exc())
+        outcome = {'status': 'failed', 'error': f'Analysis failed: {str(e)}'[:500]}
+    finally:
+        stop.set()
+        heartbeat.join()
+    
+    outcome['finished_at'] = datetime.utcnow()
+    result = db.session.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job.id, AnalysisJob.attempts == attempt, AnalysisJob.status == 'running')
+        .values(**outcome)
+    )
+    if result.rowcount != 1:
+        # The lease expired and another worker claimed the job; its result wins
+        db.session.rollback()
+        logger.warning(f"⚠️ Job {job.id} was reclaimed by another worker; discarding this result")
+        return job
+    # Recorded before the job reads as done, so pollers find it in the stores
+    if analysis is not None:
+        record_analyses([analysis.id], [text], [fields], deferred=False)
+    db.session.commit()
+    db.session.refresh(job)
+    logger.info(f"🏁 Job {job.id} {job.status}")
+    return job
+
+def job_worker_loop(app):
+    """Worker process entry point: poll the job table and process jobs forever"""
+    global _pipeline
+    parent_pid = os.getppid()
+    # The inherited sandboxes belong to the parent process; start our own
+    if _pipeline is None:
+        _pipeline = ResumePipeline(sandbox=create_extraction_sandbox())
+    else:
+        _pipeline.sandbox = create_extraction_sandbox()
+        # A background training thread does not survive the fork
+        if not _pipeline.classifier.is_trained:
+            _pipeline.classifier.load_or_train_model()
+    
+    with app.app_context():
+        # Never reuse SQLite connections inherited from the parent process
+        db.engine.dispose()
+        while os.getppid() == parent_pid:
+            try:
+                job = claim_next_job()
+                if job is None:
+                    time.sleep(current_app.config['JOB_POLL_INTERVAL'])
+                    continue
+                process_job(job)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"❌ Job worker error: {e}")
+                time.sleep(current_app.config['JOB_POLL_INTERVAL'])
+            finally:
+                db.session.remove()
+
+_job_workers = []
+
+def start_job_workers():
+    """Start (or top up) the pool of local analysis worker processes"""
+    _job_workers[:] = [worker for worker in _job_workers if worker.is_alive()]
+    for _ in range(current_app.config['ANALYSIS_WORKERS'] - len(_job_workers)):
+        # Not daemonic so workers can run their own extraction sandbox;
+        # they exit on their own once the parent process is gone
+        worker = multiprocessing.Process(target=job_worker_loop, args=(current_app._get_current_object(),))
+        worker.start()
+        _job_workers.append(worker)
+        logger.info(f"👷 Started analysis worker (pid {worker.pid})")
+
+@atexit.register
+def stop_job_workers():
+    """Terminate worker processes on shutdown instead of waiting for them"""
+    for worker in _job_workers:
+        if worker.is_alive():
+            worker.terminate()
+    for worker in _job_workers:
+        worker.join(timeout=5)
+    _job_workers.clear()
+
+def has_pending_jobs():
+    """Check for jobs left queued or running by a previous process"""
+    return AnalysisJob.query.filter(AnalysisJob.status.in_(['queued', 'running'])).first() is not None
+
+@bp.route('/')
 def index():
     """Main page"""
     return render_template('index.html')
 
-@app.route('/health')
+@bp.route('/health')
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint; model_ready turns true once the classifier is loaded or trained"""
+    # Only reads the pipeline of this worker: a probe must not fork extraction sandboxes
+    classifier = _pipeline.classifier if _pipeline else None
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
-        'database': 'connected' if db.session.bind else 'disconnected'
+        'database': 'connected' if db.session.bind else 'disconnected',
+        'model_ready': classifier.is_trained if classifier else False,
+        'model_status': classifier.status if classifier else 'not_loaded',
+        'model_version': classifier.model_version if classifier else None
+    })
+
+@bp.route('/api/cache/stats')
+def cache_stats():
+    """Hit/miss counters for the analysis caches of this worker process"""
+    def summarize(stats):
+        lookups = stats['hits'] + stats['misses']
+        return {
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_ratio': round(stats['hits'] / lookups, 4) if lookups else 0.0
+        }
+    
+    # Reported once the pipeline exists; looking at the stats should not load the model
+    prediction_cache = _pipeline.classifier.prediction_cache if _pipeline else None
+    return jsonify({
+        'dedupe': dict(summarize(dedupe_stats), pipeline_version=PIPELINE_VERSION),
+        'text_cache': summarize(text_cache_stats),
+        'predictions': prediction_cache.summary() if prediction_cache else None
     })
 
-@app.route('/favicon.ico')
+@bp.route('/favicon.ico')
 def favicon():
     """Serve favicon"""
     return send_file('static/favicon.svg', mimetype='image/svg+xml')
 
-@app.route('/api/departments', methods=['GET'])
+@bp.route('/api/departments', methods=['GET'])
 def get_departments():
     """Get list of available departments"""
     try:
@@ -172,15 +935,16 @@ def get_departments():
             'error': str(e)
         }), 500
 
-@app.route('/analyze', methods=['POST'])
+@bp.route('/analyze', methods=['POST'])
 def analyze_resume():
     """Analyze uploaded resume"""
     start_time = datetime.now()
     
     try:
-        # Get selected department
+        # Get selected department (optional when scoring against all departments)
         selected_department = request.form.get('department')
-        if not selected_department:
+        all_departments = form_flag('all_departments')
+        if not selected_department and not all_departments:
             return jsonify({'error': 'Please select a department'}), 400
         
         # Check if file was uploaded
@@ -197,192 +961,181 @@ def analyze_resume():
         if not allowed_file(file.filename):
             return jsonify({
                 'error': 'Invalid file type. Only PDF and DOCX files are allowed.',
-                'allowed_extensions': list(app.config['ALLOWED_EXTENSIONS'])
+                'allowed_extensions': list(current_app.config['ALLOWED_EXTENSIONS'])
             }), 400
         
-        # Secure filename and save file
+        # Secure filename and read the upload into memory
         original_filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"{timestamp}_{original_filename}"
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Ensure upload directory exists
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
         
-        file.save(file_path)
-        logger.info(f"📁 File saved: {filename}")
+        data = file.read()
+        content_hash = compute_content_hash(data)
         
-        # Extract text from file
-        file_ext = os.path.splitext(original_filename)[1].lower()
-        text = parser.extract_text(file_path, file_ext)
+        # Repeat upload of an already analyzed document: clone the stored analysis
+        cached = find_cached_analysis(content_hash, selected_department, all_departments)
+        if cached is not None:
+            processing_time = (datetime.now() - start_time).total_seconds()
+            fields = cached_analysis_fields(cached, processing_time)
+            analysis = save_analysis(filename, original_filename, fields)
+            record_analyses([analysis.id], [stored_text(content_hash)], [fields])
+            logger.info(f"♻️ Reused analysis {cached.id} for {filename}")
+            
+            response_data = analysis.to_dict()
+            response_data['cached'] = True
+            response_data['cached_from'] = cached.id
+            return jsonify(response_data)
         
-        if not text or len(text.strip()) < 50:
-            # Clean up the uploaded file
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return jsonify({
-                'error': 'Could not extract sufficient text from document. The file may be corrupted, scanned, or contain mostly images.'
-            }), 400
+        # Opt-in asynchronous mode: queue the job and return its id immediately
+        if form_flag('async') or current_app.config['ASYNC_ANALYSIS']:
+            job = enqueue_analysis_job(filename, original_filename, data, selected_department, all_departments)
+            response = jsonify(job.to_dict())
+            response.headers['Location'] = f"/jobs/{job.id}"
+            return response, 202
         
-        logger.info(f"📝 Extracted {len(text)} characters from resume")
-        
-        # Parse resume information
-        personal_info = parser.parse_personal_info(text)
-        skills = parser.extract_skills(text)
-        experience = parser.extract_experience(text)
-        education = parser.extract_education(text)
+        file_ext = os.path.splitext(original_filename)[1].lower()
+        try:
+            fields, meta = analyze_document(data, file_ext, selected_department, content_hash, start_time, all_departments)
+        except AnalysisError as e:
+            return jsonify({'error': str(e)}), 400
         
-        logger.info(f"👤 Candidate: {personal_info['name']} | Skills: {sum(len(s) for s in skills.values())}")
+        analysis = save_analysis(filename, original_filename, fields)
+        record_analyses([analysis.id], [meta.get('text')], [fields])
+        persist_upload(filename, data)
         
-        # Classify resume
-        status, department, ranking_score = classifier.classify_resume(text, skills)
+        # Return analysis results
+        response_data = analysis.to_dict()
+        response_data['processing_time'] = meta['processing_time']
+        response_data['text_length'] = meta['text_length']
+        response_data['total_skills'] = meta['total_skills']
+        response_data['extraction'] = meta.get('extraction', {})
+        response_data['sections'] = meta.get('sections', {})
+        response_data['cached'] = False
         
-        # Use selected department instead of auto-classified
-        department = selected_department
+        return jsonify(response_data)
         
-        # Fraud detection
-        fraud_score, fraud_findings = classifier.detect_fraud(text, skills, experience)
+    except Exception as e:
+        logger.error(f"❌ Analysis failed: {str(e)}")
+        logger.error(traceback.format_exc())
         
-        # Prepare candidate data for eligibility scoring
-        all_skills = []
-        for category in skills.values():
-            all_skills.extend(category)
+        return jsonify({
+            'error': f'Analysis failed: {str(e)}',
+            'details': 'Please check the file format and try again.'
+        }), 500
+
+@bp.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze a ZIP archive or multiple uploaded resumes on a process pool"""
+    start_time = time.perf_counter()
+    
+    try:
+        selected_department = request.form.get('department')
+        all_departments = form_flag('all_departments')
+        if not selected_department and not all_departments:
+            return jsonify({'error': 'Please select a department'}), 400
         
-        candidate_data = {
-            'skills': all_skills,
-            'experience_years': experience['total_years'],
-            'education': json.dumps(education, ensure_ascii=False),
-            'work_experience': json.dumps(experience, ensure_ascii=False)
-        }
+        files = request.files.getlist('file')
+        if not files:
+            return jsonify({'error': 'No file uploaded'}), 400
         
-        # Calculate eligibility score
-        eligibility_result = calculate_eligibility_score(candidate_data, department)
+        try:
+            documents, errors = collect_batch_uploads(files)
+        except BatchLimitError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Get AI authenticity status
-        ai_authenticity = get_ai_authenticity_status(fraud_score)
+        logger.info(f"📦 Batch of {len(documents)} documents for {selected_department or 'all departments'}")
         
-        # Get final decision
-        final_decision, decision_reason = get_final_decision(
-            fraud_score, 
-            eligibility_result, 
-            fraud_score
-        )
+        # Documents analyzed before are cloned instead of being sent to the pool
+        rows = []
+        texts = []
+        pending = []
+        for original_filename, filename, data, content_hash in documents:
+            cached = find_cached_analysis(content_hash, selected_department, all_departments)
+            if cached is not None:
+                rows.append((filename, original_filename, cached_analysis_fields(cached, 0.0)))
+                texts.append(stored_text(content_hash))
+            else:
+                pending.append((original_filename, filename, data, content_hash, load_extracted_text(content_hash)))
         
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
-        
-        # Create comprehensive analysis report
-        analysis_report = f"""
-COMPREHENSIVE RESUME ANALYSIS REPORT
-====================================
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Processing Time: {processing_time:.2f} seconds
-
-CANDIDATE INFORMATION:
-────────────────────
-Name: {personal_info['name'] or 'Not specified'}
-Email: {personal_info['email'] or 'Not specified'}
-Phone: {personal_info['phone'] or 'Not specified'}
-Location: {personal_info['location'] or 'Not specified'}
-
-DEPARTMENT & ELIGIBILITY:
-────────────────────────
-Selected Department: {department}
-Eligibility Score: {eligibility_result['total_score']:.1f}/{eligibility_result['min_score_required']}
-Skill Match: {eligibility_result['skill_match_percentage']:.1f}%
-Status: {eligibility_result['message']}
-
-SCORE BREAKDOWN:
-───────────────
-• Skills: {eligibility_result['breakdown']['skill_score']:.1f}
-• Experience: {eligibility_result['breakdown']['experience_score']:.1f}
-• Education: {eligibility_result['breakdown']['education_score']:.1f}
-• Projects/Certs: {eligibility_result['breakdown']['projects_score']:.1f}
-
-EXPERIENCE & EDUCATION:
-──────────────────────
-Total Experience: {experience['total_years']} years
-Highest Education: {education['highest_degree']}
-
-SKILLS ANALYSIS:
-───────────────
-Total Skills Categories: {len(skills)}
-Total Skills Detected: {sum(len(skills[cat]) for cat in skills)}
-
-{json.dumps(skills, indent=2, ensure_ascii=False)}
-
-AI AUTHENTICITY & FRAUD DETECTION:
-─────────────────────────────────
-AI Authenticity Status: {ai_authenticity}
-Overall Fraud Score: {fraud_score}%
-Findings:
-{chr(10).join(['• ' + finding for finding in fraud_findings]) if fraud_findings else '• No significant fraud indicators detected'}
-
-FINAL DECISION:
-──────────────
-Decision: {final_decision}
-Reason: {decision_reason}
-{'✅ RECOMMENDED FOR HIRING' if final_decision == 'Shortlisted' else '❌ NOT RECOMMENDED'}
-"""
-
-        # Save analysis to database
-        analysis = ResumeAnalysis(
-            filename=filename,
-            original_filename=original_filename,
-            candidate_name=personal_info['name'],
-            candidate_email=personal_info['email'],
-            candidate_phone=personal_info['phone'],
-            candidate_location=personal_info['location'],
-            work_experience=json.dumps(experience, ensure_ascii=False),
-            education=json.dumps(education, ensure_ascii=False),
-            skills=json.dumps(skills, ensure_ascii=False),
-            classification_status=final_decision,
-            department=department,
-            ranking_score=ranking_score,
-            experience_years=experience['total_years'],
-            education_level=education['highest_degree'],
-            overall_fraud_score=fraud_score,
-            ai_generated_score=fraud_score,
-            eligibility_score=eligibility_result['total_score'],
-            skill_match_percentage=eligibility_result['skill_match_percentage'],
-            ai_authenticity_status=ai_authenticity,
-            final_decision=final_decision,
-            final_decision_reason=decision_reason,
-            analysis_report=analysis_report,
-            processing_time=processing_time
-        )
+        # Documents with cached text skip extraction entirely
+        futures = [
+            submit_batch_task(analyze_text_in_worker, cached_text, selected_department, all_departments)
+            if cached_text is not None else
+            submit_batch_task(
+                analyze_file_in_worker,
+                data,
+                os.path.splitext(original_filename)[1].lower(),
+                selected_department,
+                all_departments
+            )
+            for original_filename, _, data, _, cached_text in pending
+        ]
         
-        db.session.add(analysis)
-        db.session.commit()
+        broken_executors = set()
+        for (original_filename, filename, data, content_hash, cached_text), future in zip(pending, futures):
+            try:
+                # Documents run in submission order, so earlier ones have finished by now
+                fields, meta = future.result(timeout=current_app.config['BATCH_FILE_TIMEOUT'])
+                fields['content_hash'] = content_hash
+                if meta.get('text'):
+                    store_extracted_text(content_hash, meta['text'], meta['extraction'].get('backend'))
+                rows.append((filename, original_filename, fields))
+                texts.append(meta.get('text') or cached_text)
+                persist_upload(filename, data)
+            except FutureTimeoutError:
+                errors.append({'filename': original_filename, 'success': False, 'error': 'Analysis timed out'})
+                broken_executors.add(_batch_executor)
+            except BrokenProcessPool:
+                errors.append({'filename': original_filename, 'success': False, 'error': 'Analysis worker crashed'})
+                broken_executors.add(_batch_executor)
+            except Exception as e:
+                errors.append({'filename': original_filename, 'success': False, 'error': str(e)})
+        for executor in broken_executors - {None}:
+            reset_batch_executor(executor)
         
-        logger.info(f"✅ Analysis completed: {status} | {department} | Score: {ranking_score}")
+        saved = save_analyses_bulk(rows)
+        record_analyses([analysis['id'] for analysis in saved], texts, [fields for _, _, fields in rows])
+        results = [
+            {'filename': analysis['original_filename'], 'success': True, 'analysis': analysis}
+            for analysis in saved
+        ] + errors
         
-        # Return analysis results
-        response_data = analysis.to_dict()
-        response_data['processing_time'] = processing_time
-        response_data['text_length'] = len(text)
-        response_data['total_skills'] = sum(len(skills[cat]) for cat in skills)
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"✅ Batch completed: {len(saved)} analyzed, {len(errors)} failed in {elapsed:.2f}s")
         
-        return jsonify(response_data)
+        return jsonify({
+            'department': selected_department,
+            'total_files': len(saved) + len(errors),
+            'succeeded': len(saved),
+            'failed': len(errors),
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_second': round(len(saved) / elapsed, 2) if elapsed > 0 else 0,
+            'results': results
+        })
         
     except Exception as e:
-        logger.error(f"❌ Analysis failed: {str(e)}")
+        db.session.rollback()
+        logger.error(f"❌ Batch analysis failed: {str(e)}")
         logger.error(traceback.format_exc())
-        
-        # Clean up uploaded file if it exists
-        try:
-            file_path_to_remove = locals().get('file_path')
-            if file_path_to_remove and os.path.exists(file_path_to_remove):
-                os.remove(file_path_to_remove)
-        except:
-            pass
-        
-        return jsonify({
-            'error': f'Analysis failed: {str(e)}',
-            'details': 'Please check the file format and try again.'
-        }), 500
+        return jsonify({'error': f'Batch analysis failed: {str(e)}'}), 500
+
+@bp.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status of an asynchronous analysis job"""
+    job = db.session.get(AnalysisJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response_data = job.to_dict()
+    if job.status == 'done' and job.analysis_id:
+        analysis = db.session.get(ResumeAnalysis, job.analysis_id)
+        response_data['result'] = analysis.to_dict() if analysis else None
+    elif job.status in ('queued', 'running'):
+        start_job_workers()
+    
+    return jsonify(response_data)
 
-@app.route('/history')
+@bp.route('/history')
 def history():
     """Display analysis history"""
     try:
@@ -392,7 +1145,7 @@ def history():
         logger.error(f"❌ History error: {e}")
         return render_template('history.html', analyses=[])
 
-@app.route('/dashboard')
+@bp.route('/dashboard')
 def dashboard():
     """Display analytics dashboard"""
     try:
@@ -407,8 +1160,8 @@ def dashboard():
                 departments[analysis.department] = departments.get(analysis.department, 0) + 1
         
         # Average scores
-        avg_ranking = np.mean([a.ranking_score for a in analyses]) if analyses else 0
-        avg_fraud = np.mean([a.overall_fraud_score for a in analyses]) if analyses else 0
+        avg_ranking = sum(a.ranking_score for a in analyses) / total if analyses else 0
+        avg_fraud = sum(a.overall_fraud_score for a in analyses) / total if analyses else 0
         
         return render_template('dashboard.html',
                              total_resumes=total,
@@ -429,19 +1182,19 @@ def dashboard():
                              avg_ranking=0,
                              avg_fraud=0)
 
-@app.route('/api/shortlist')
+@bp.route('/api/shortlist')
 def get_shortlisted():
     """API endpoint for shortlisted candidates"""
     try:
         accepted_candidates = ResumeAnalysis.query.filter_by(classification_status='Accepted').all()
         candidates_data = [candidate.to_dict() for candidate in accepted_candidates]
-        top_candidates = ranker.get_top_candidates_all_departments(candidates_data, top_n=5)
+        top_candidates = get_ranker().get_top_candidates_all_departments(candidates_data, top_n=5)
         return jsonify(top_candidates)
     except Exception as e:
         logger.error(f"❌ Shortlist API error: {e}")
         return jsonify({'error': 'Failed to get shortlisted candidates'}), 500
 
-@app.route('/api/analyses')
+@bp.route('/api/analyses')
 def get_analyses():
     """API endpoint for all analyses"""
     try:
@@ -451,7 +1204,7 @@ def get_analyses():
         logger.error(f"❌ Analyses API error: {e}")
         return jsonify({'error': 'Failed to get analyses'}), 500
 
-@app.route('/export/csv')
+@bp.route('/export/csv')
 def export_csv():
     """Export all analyses to CSV"""
     try:
@@ -498,7 +1251,7 @@ def export_csv():
         logger.error(f"❌ CSV export error: {e}")
         return jsonify({'error': 'Failed to export CSV'}), 500
 
-@app.route('/analysis/<int:analysis_id>')
+@bp.route('/analysis/<int:analysis_id>')
 def get_analysis(analysis_id):
     """Get specific analysis by ID"""
     try:
@@ -508,19 +1261,60 @@ def get_analysis(analysis_id):
         logger.error(f"❌ Analysis {analysis_id} error: {e}")
         return jsonify({'error': 'Analysis not found'}), 404
 
-@app.route('/delete/<int:analysis_id>', methods=['DELETE'])
+@bp.route('/analysis/<int:analysis_id>/reanalyze', methods=['POST'])
+def reanalyze(analysis_id):
+    """Re-run parsing, classification and scoring from the cached text of an analysis"""
+    start_time = datetime.now()
+    
+    try:
+        source = db.session.get(ResumeAnalysis, analysis_id)
+        if source is None:
+            return jsonify({'error': 'Analysis not found'}), 404
+        
+        payload = request.get_json(silent=True) or {}
+        department = payload.get('department') or request.form.get('department') or source.department
+        all_departments = bool(payload.get('all_departments')) or form_flag('all_departments')
+        
+        cached_text = load_extracted_text(source.content_hash) if source.content_hash else None
+        if cached_text is None:
+            return jsonify({'error': 'Extracted text is not available for this analysis. Please upload the document again.'}), 409
+        
+        try:
+            fields, meta = get_pipeline().analyze_text(cached_text, department, start_time, all_departments)
+        except AnalysisError as e:
+            return jsonify({'error': str(e)}), 400
+        fields['content_hash'] = source.content_hash
+        
+        analysis = save_analysis(source.filename, source.original_filename, fields)
+        record_analyses([analysis.id], [cached_text], [fields])
+        logger.info(f"🔁 Re-analyzed {analysis_id} as {analysis.id} for {department}")
+        
+        response_data = analysis.to_dict()
+        response_data['reanalyzed_from'] = analysis_id
+        response_data['text_length'] = meta['text_length']
+        response_data['total_skills'] = meta['total_skills']
+        response_data['sections'] = meta.get('sections', {})
+        return jsonify(response_data)
+        
+    except Exception as e:
+        logger.error(f"❌ Re-analysis of {analysis_id} failed: {e}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': f'Re-analysis failed: {str(e)}'}), 500
+
+@bp.route('/delete/<int:analysis_id>', methods=['DELETE'])
 def delete_analysis(analysis_id):
     """Delete analysis by ID"""
     try:
         analysis = ResumeAnalysis.query.get_or_404(analysis_id)
         
         # Delete associated file
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], analysis.filename)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], analysis.filename)
         if os.path.exists(file_path):
             os.remove(file_path)
         
         db.session.delete(analysis)
         db.session.commit()
+        forget_analyses([analysis_id])
         
         logger.info(f"🗑️ Deleted analysis: {analysis_id}")
         return jsonify({'message': 'Analysis deleted successfully'})
@@ -529,15 +1323,15 @@ def delete_analysis(analysis_id):
         return jsonify({'error': 'Failed to delete analysis'}), 500
 
 # Error handlers
-@app.errorhandler(404)
+@bp.app_errorhandler(404)
 def not_found_error(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
-@app.errorhandler(500)
+@bp.app_errorhandler(500)
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
-@app.errorhandler(413)
+@bp.app_errorhandler(413)
 def too_large(error):
     return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
 
@@ -546,8 +1340,16 @@ if __name__ == '__main__':
     os.makedirs('uploads', exist_ok=True)
     os.makedirs('data/trained_models', exist_ok=True)
     
-    # Clean up old files on startup
-    cleanup_old_files()
+    app = create_app()
+    
+    with app.app_context():
+        # Clean up old files on startup
+        if app.config['PERSIST_UPLOADS']:
+            cleanup_old_files()
+        
+        # Resume jobs left over from a previous run
+        if has_pending_jobs():
+            start_job_workers()
     
     print("🚀 Starting Smart Resume Analyzer...")
     print("📊 Dashboard: http://localhost:5000")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Batch classification benchmark for Smart Resume Analyzer
+Classifies the same synthetic resumes one at a time with classify_resume
+and in one call with classify_resumes (prediction cache off), then one at a
+time again with a warm prediction cache, checks all give identical results
+and reports the time per resume
+
+Usage: python benchmarks/bench_classifier_batch.py [--resumes N] [--repeats N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.classifier import ResumeClassifier
+
+WORDS = ('python java react sql docker aws kubernetes developer engineer manager recruiter finance '
+         'accounting marketing sales bachelor master mba ph.d diploma degree university experience '
+         'led built designed team project 2012 2015 2018 2020 2023').split()
+SKILL_CATEGORIES = {
+    'Programming': ['python', 'java', 'javascript', 'go'],
+    'Web Development': ['react', 'django', 'html', 'css'],
+    'Database': ['sql', 'mongodb', 'redis'],
+    'AI/ML': ['machine learning', 'tensorflow'],
+    'Soft Skills': ['leadership', 'communication', 'teamwork']
+}
+
+
+def synthetic_resumes(count):
+    """Random resume texts and skill dictionaries (seeded, so runs are comparable)"""
+    rng = random.Random(42)
+    texts, skills_list = [], []
+    for _ in range(count):
+        texts.append(' '.join(rng.choice(WORDS) for _ in range(rng.randrange(80, 300))))
+        skills_list.append({
+            category: rng.sample(skills, rng.randrange(1, len(skills) + 1))
+            for category, skills in SKILL_CATEGORIES.items() if rng.random() < 0.6
+        })
+    return texts, skills_list
+
+
+def best_of(repeats, function):
+    """Median wall time of function over repeats calls, and its last result"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--resumes', type=int, default=2000, help='Resumes per batch')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs of each mode')
+    args = parser.parse_args()
+
+    texts, skills_list = synthetic_resumes(args.resumes)
+    with tempfile.TemporaryDirectory() as model_dir:
+        classifier = ResumeClassifier(model_dir=model_dir, background=False)
+        prediction_cache, classifier.prediction_cache = classifier.prediction_cache, None
+
+        loop_seconds, loop_results = best_of(args.repeats, lambda: [
+            classifier.classify_resume(text, skills) for text, skills in zip(texts, skills_list)
+        ])
+        batch_seconds, batch_results = best_of(args.repeats, lambda: classifier.classify_resumes(texts, skills_list))
+
+        # Every run after the first answers from the cache
+        classifier.prediction_cache = prediction_cache
+        cached_seconds, cached_results = best_of(args.repeats + 1, lambda: [
+            classifier.classify_resume(text, skills) for text, skills in zip(texts, skills_list)
+        ])
+
+    print("=" * 52)
+    print(f"{'Mode':<22} {'Total s':>10} {'Per resume ms':>16}")
+    print("-" * 52)
+    for mode, seconds in (('classify_resume loop', loop_seconds), ('classify_resumes', batch_seconds),
+                          ('cached loop', cached_seconds)):
+        print(f"{mode:<22} {seconds:>10.3f} {seconds / args.resumes * 1000:>16.3f}")
+    print("=" * 52)
+
+    if not loop_results == batch_results == cached_results:
+        print("❌ Batch or cached results differ from one-at-a-time results")
+        sys.exit(1)
+    print(f"✅ Identical results for {args.resumes} resumes, batch {loop_seconds / batch_seconds:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
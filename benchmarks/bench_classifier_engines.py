@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Classifier engine benchmark for Smart Resume Analyzer
+Trains every department model in ENGINES on the same synthetic resumes
+(built from the classifier's training vocabulary) and reports fit time,
+p50/p99 single-resume latency, batch throughput, saved model size and
+accuracy on a held-out set
+
+Usage: python benchmarks/bench_classifier_engines.py [--train N] [--test N] [--single N] [--signal S] [--engines a,b]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models.artifacts import save_artifact, load_artifact
+from models.classifier import ENGINES, TRAINING_DATA, build_engine, build_vectorizer, serving_model
+
+FILLER_WORDS = ('team project responsible worked company years experience led managed delivered '
+                'improved results skills summary objective references available request contact '
+                'university degree bachelor master certified professional strong excellent').split()
+
+
+def synthetic_resumes(count, rng, signal, confusion=0.05):
+    """
+    Resumes drawn from each department's training vocabulary, diluted with filler words
+
+    Args:
+        signal: Share of words taken from the resume's own department
+        confusion: Share of words taken from another department
+    """
+    vocabulary = {}
+    for text, label in zip(TRAINING_DATA['texts'], TRAINING_DATA['labels']):
+        vocabulary.setdefault(label, set()).update(text.lower().split())
+    vocabulary = {label: sorted(words) for label, words in vocabulary.items()}
+    labels = sorted(vocabulary)
+
+    texts, targets = [], []
+    for _ in range(count):
+        label = rng.choice(labels)
+        words = []
+        for _ in range(rng.randrange(40, 160)):
+            draw = rng.random()
+            if draw < signal:
+                words.append(rng.choice(vocabulary[label]))
+            elif draw < signal + confusion:
+                words.append(rng.choice(vocabulary[rng.choice(labels)]))
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        texts.append(' '.join(words))
+        targets.append(label)
+    return texts, np.array(targets)
+
+
+def measure_engine(engine, train, test, single, workdir):
+    """Fit one engine on train and measure it on test; returns a result row"""
+    train_texts, train_labels = train
+    test_texts, test_labels = test
+
+    start = time.perf_counter()
+    vectorizer = build_vectorizer(engine)
+    classifier = build_engine(engine).fit(vectorizer.fit_transform(train_texts), train_labels)
+    fit_seconds = time.perf_counter() - start
+
+    # Measure the model the way it is served: saved, then loaded memory-mapped
+    path = os.path.join(workdir, f'{engine}.pkl')
+    save_artifact(serving_model(classifier), path)
+    size_kb = os.path.getsize(path) / 1024
+    classifier = load_artifact(path)
+
+    latencies = []
+    for text in test_texts[:single]:
+        start = time.perf_counter()
+        classifier.predict(vectorizer.transform([text]))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    batch_timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        predictions = classifier.predict(vectorizer.transform(test_texts))
+        batch_timings.append(time.perf_counter() - start)
+
+    return {
+        'engine': engine,
+        'fit_s': fit_seconds,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'batch_per_s': len(test_texts) / statistics.median(batch_timings),
+        'size_kb': size_kb,
+        'accuracy': float(np.mean(predictions == test_labels))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--train', type=int, default=2000, help='Synthetic training resumes')
+    parser.add_argument('--test', type=int, default=1000, help='Held-out resumes')
+    parser.add_argument('--single', type=int, default=300, help='Resumes timed one at a time')
+    parser.add_argument('--signal', type=float, default=0.04,
+                        help="Share of each resume's words that come from its own department")
+    parser.add_argument('--engines', default=','.join(ENGINES), help='Comma-separated ENGINES names')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    train = synthetic_resumes(args.train, rng, args.signal)
+    test = synthetic_resumes(args.test, rng, args.signal)
+
+    print("=" * 86)
+    print(f"{'Engine':<20} {'Fit s':>7} {'p50 ms':>8} {'p99 ms':>8} {'Batch/s':>10} {'Size KB':>9} {'Accuracy':>9}")
+    print("-" * 86)
+    with tempfile.TemporaryDirectory() as workdir:
+        for engine in args.engines.split(','):
+            row = measure_engine(engine, train, test, args.single, workdir)
+            print(f"{row['engine']:<20} {row['fit_s']:>7.2f} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f} "
+                  f"{row['batch_per_s']:>10.0f} {row['size_kb']:>9.1f} {row['accuracy']:>9.3f}")
+    print("=" * 86)
+    print(f"Trained on {args.train} and tested on {args.test} synthetic resumes; latency includes TF-IDF transform")
+
+
+if __name__ == "__main__":
+    main()
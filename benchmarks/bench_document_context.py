@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Shared document context benchmark for Smart Resume Analyzer
+Runs the parser, classifier and fraud checks on the same resume with plain
+text (every stage builds its own context and rescans) and with one shared
+ResumeDocument, counting regex passes and contexts built and timing both
+
+Usage: python benchmarks/bench_document_context.py [resume text file]
+"""
+
+import os
+import re
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parser import ResumeParser
+from utils.document import ResumeDocument
+from models.classifier import ResumeClassifier
+
+REPEATS = 20
+REGEX_FUNCTIONS = ('search', 'match', 'findall', 'finditer', 'split', 'sub')
+
+SAMPLE_RESUME = """
+JOHN DOE
+Senior Software Engineer
+Email: john.doe@email.com | Phone: (555) 123-4567 | San Francisco, CA
+
+EXPERIENCE
+Senior Python Developer at Tech Solutions Inc. (2020-2023)
+- Built REST APIs with Django, PostgreSQL and Redis on AWS
+- Led a team of 5 developers using Agile and Scrum
+Python Developer - Startup Co. (2018-2020)
+- Deployed microservices with Docker, Kubernetes and Jenkins CI/CD
+
+EDUCATION
+Bachelor of Science in Computer Science - State University (2014-2018)
+
+SKILLS
+Python, Java, JavaScript, React, Node.js, SQL, MongoDB, Git, Machine Learning, Pandas
+"""
+
+
+class RegexPassCounter:
+    """Count calls to the re module functions and ResumeDocument contexts built"""
+
+    def __init__(self):
+        self.count = 0
+        self.documents = 0
+        self.originals = {}
+
+    def __enter__(self):
+        original_init = ResumeDocument.__init__
+
+        def counted_init(document, *args, **kwargs):
+            self.documents += 1
+            original_init(document, *args, **kwargs)
+
+        self.original_init = original_init
+        ResumeDocument.__init__ = counted_init
+
+        for name in REGEX_FUNCTIONS:
+            original = getattr(re, name)
+            self.originals[name] = original
+
+            def counted(*args, _original=original, **kwargs):
+                self.count += 1
+                return _original(*args, **kwargs)
+
+            setattr(re, name, counted)
+        return self
+
+    def __exit__(self, *exc_info):
+        ResumeDocument.__init__ = self.original_init
+        for name, original in self.originals.items():
+            setattr(re, name, original)
+
+
+def run_stages(parser, classifier, text, shared):
+    """Run every text-scanning stage of the pipeline once"""
+    source = parser.document(text) if shared else text
+    parser.parse_personal_info(source)
+    skills = parser.extract_skills(source)
+    experience = parser.extract_experience(source)
+    parser.extract_education(source)
+    classifier.classify_resume(source, skills)
+    classifier.detect_fraud(source, skills, experience)
+
+
+def measure(parser, classifier, text, shared):
+    # Warm up so one-off work (regex compilation, lazy imports) is not counted
+    run_stages(parser, classifier, text, shared)
+    with RegexPassCounter() as counter:
+        run_stages(parser, classifier, text, shared)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run_stages(parser, classifier, text, shared)
+        timings.append(time.perf_counter() - start)
+    return counter.count, counter.documents, statistics.median(timings)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding='utf-8') as f:
+            resume_text = f.read()
+    else:
+        resume_text = SAMPLE_RESUME * 5
+
+    parser = ResumeParser()
+    classifier = ResumeClassifier()
+
+    print(f"📄 Analyzing {len(resume_text)} characters of resume text...")
+    print("=" * 60)
+    print(f"{'Mode':<22} {'Regex passes':>13} {'Contexts':>9} {'Median ms':>11}")
+    print("-" * 60)
+    for label, shared in (('Plain text per stage', False), ('Shared ResumeDocument', True)):
+        passes, documents, seconds = measure(parser, classifier, resume_text, shared)
+        print(f"{label:<22} {passes:>13} {documents:>9} {seconds * 1000:>11.2f}")
+    print("=" * 60)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+DOCX extraction benchmark for Smart Resume Analyzer
+Compares the python-docx paragraph walk with the streaming XML extractor
+on generated documents of increasing size (or on the given DOCX files)
+
+Usage: python benchmarks/bench_docx_extraction.py [docx file or directory ...]
+"""
+
+import io
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from utils.docx_extractor import DOCXExtractor
+
+SIZES = [100, 1000, 10000]  # Paragraphs per generated document
+REPEATS = 5
+
+
+def python_docx_extract(data):
+    """The original extraction path: body paragraphs only"""
+    doc = Document(io.BytesIO(data))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text)
+
+
+def streaming_extract(data):
+    return DOCXExtractor().extract(io.BytesIO(data))
+
+
+def generate_docx(paragraphs):
+    """Build a resume-like document with a header, body paragraphs and a skills table"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "JOHN DOE | john.doe@email.com | (555) 123-4567"
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Senior Python Developer - Tech Solutions Inc. ({2000 + i % 24}) built REST APIs with Django and AWS")
+    table = doc.add_table(rows=max(1, paragraphs // 20), cols=2)
+    for row in table.rows:
+        row.cells[0].text = "Skills"
+        row.cells[1].text = "Python, Docker, Kubernetes, SQL"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def time_extractor(extract, data):
+    timings = []
+    text = ''
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        text = extract(data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(text)
+
+
+def run_benchmark(documents):
+    print("=" * 84)
+    print(f"{'Document':<28} {'KB':>7} {'python-docx ms':>15} {'stream ms':>10} {'Speedup':>8} {'Chars (old/new)':>11}")
+    print("-" * 84)
+    for name, data in documents:
+        old_seconds, old_chars = time_extractor(python_docx_extract, data)
+        new_seconds, new_chars = time_extractor(streaming_extract, data)
+        speedup = old_seconds / new_seconds if new_seconds else float('inf')
+        print(f"{name[:28]:<28} {len(data) / 1024:>7.0f} {old_seconds * 1000:>15.2f} "
+              f"{new_seconds * 1000:>10.2f} {speedup:>7.1f}x {old_chars:>7}/{new_chars}")
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        documents = []
+        for path in sys.argv[1:]:
+            paths = [os.path.join(path, name) for name in sorted(os.listdir(path))] if os.path.isdir(path) else [path]
+            for docx_path in paths:
+                if docx_path.lower().endswith('.docx'):
+                    with open(docx_path, 'rb') as f:
+                        documents.append((os.path.basename(docx_path), f.read()))
+    else:
+        print("📄 Generating benchmark documents...")
+        documents = [(f"generated_{size}_paragraphs", generate_docx(size)) for size in SIZES]
+
+    run_benchmark(documents)
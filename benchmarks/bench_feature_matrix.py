@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Feature matrix benchmark for Smart Resume Analyzer
+Builds the text and skill feature matrix for 10k and 100k synthetic resumes
+with FeatureExtractor.feature_matrix and with one extract_*_features dict
+per resume, and times the keyword densities alone (one text_lower.count
+pass per keyword)
+
+Usage: python benchmarks/bench_feature_matrix.py [--sizes 10000,100000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.feature_extractor import (
+    FeatureExtractor,
+    TEXT_FEATURE_COLUMNS,
+    SKILL_FEATURE_COLUMNS,
+    TECHNICAL_KEYWORDS,
+    BUSINESS_KEYWORDS
+)
+
+WORDS = ('python java javascript sql aws docker machine learning management leadership strategy business '
+         'marketing developer engineer team project delivered built designed led improved customers data '
+         'platform services reporting analysis the and with for of in to at on').split()
+HEADINGS = ['EXPERIENCE', 'EDUCATION', 'SKILLS', 'PROJECTS', 'CERTIFICATIONS']
+SKILL_CATEGORIES = ['Programming', 'Web Development', 'Database', 'Soft Skills', 'Languages']
+
+
+def synthetic_resumes(count):
+    """Random resumes with headings, contacts and numbers, plus skill dictionaries (seeded)"""
+    rng = random.Random(42)
+    texts, skills_list = [], []
+    for index in range(count):
+        lines = [f"Candidate {index}", f"candidate{index}@example.com | (555) 123-{index % 10000:04d}"]
+        for heading in rng.sample(HEADINGS, 3):
+            lines.append(heading)
+            lines.extend(
+                ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(8, 20))) + f" {rng.randrange(2000, 2024)}."
+                for _ in range(rng.randrange(2, 5))
+            )
+        texts.append('\n'.join(lines))
+        skills_list.append({category: ['skill'] * rng.randrange(1, 5) for category in rng.sample(SKILL_CATEGORIES, 2)})
+    return texts, skills_list
+
+
+def dict_rows(extractor, texts, skills_list):
+    """The per-resume API, turned into the same matrix"""
+    rows = []
+    for text, skills in zip(texts, skills_list):
+        features = extractor.extract_text_features(text)
+        features.update(extractor.extract_skill_features(skills))
+        rows.append([float(features.get(name, 0)) for name in TEXT_FEATURE_COLUMNS + SKILL_FEATURE_COLUMNS])
+    return np.array(rows)
+
+
+def count_pass_densities(texts):
+    """Keyword densities with one substring count per keyword"""
+    densities = []
+    for text in texts:
+        text_lower = text.lower()
+        words = max(1, len(text.split()))
+        densities.append((sum(text_lower.count(keyword) for keyword in TECHNICAL_KEYWORDS) / words,
+                          sum(text_lower.count(keyword) for keyword in BUSINESS_KEYWORDS) / words))
+    return densities
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='10000,100000', help='Comma-separated resume counts')
+    args = parser.parse_args()
+
+    extractor = FeatureExtractor()
+    print("=" * 74)
+    print(f"{'Resumes':>8} {'Mode':<34} {'Seconds':>9} {'Resumes/s':>11} {'MB':>8}")
+    print("-" * 74)
+    for size in (int(size) for size in args.sizes.split(',')):
+        texts, skills_list = synthetic_resumes(size)
+
+        matrix_seconds, (matrix, columns) = timed(extractor.feature_matrix, texts, skills_list)
+        dict_seconds, rows = timed(dict_rows, extractor, texts, skills_list)
+        if not np.allclose(matrix, rows):
+            print("❌ feature_matrix differs from the per-resume features")
+            sys.exit(1)
+        count_seconds, _ = timed(count_pass_densities, texts)
+
+        for mode, seconds, megabytes in (
+            ('extract_*_features per resume', dict_seconds, None),
+            (f'feature_matrix ({len(columns)} columns)', matrix_seconds, matrix.nbytes / 2 ** 20),
+            ('densities: count pass per keyword', count_seconds, None)
+        ):
+            memory = f"{megabytes:>8.1f}" if megabytes is not None else f"{'':>8}"
+            print(f"{size:>8} {mode:<34} {seconds:>9.2f} {size / seconds:>11.0f} {memory}")
+        print("-" * 74)
+
+
+if __name__ == "__main__":
+    main()
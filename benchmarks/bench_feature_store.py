@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Feature store benchmark for Smart Resume Analyzer
+Scans the skill, experience and education features of a synthetic history
+by decoding the JSON columns row by row (as analytics did before the store)
+and by loading the feature store, sharded as appended and after compaction,
+and checks the scans agree
+
+Usage: python benchmarks/bench_feature_store.py [--analyses N] [--shard-size N]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.feature_store import FeatureStore, PROFILE_FEATURE_COLUMNS, skill_columns
+
+DEGREES = ['PhD', 'Masters', 'Bachelors', 'Diploma', 'Unknown']
+TITLES = ['Senior Developer', 'Junior Analyst', 'Lead Engineer', 'Intern', 'Manager', 'Consultant']
+
+
+def synthetic_history(count):
+    """JSON column values (skills, work_experience, education) of random analyses (seeded)"""
+    rng = random.Random(42)
+    skills = list(skill_columns())
+    rows = []
+    for _ in range(count):
+        found = rng.sample(skills, rng.randrange(3, 15))
+        rows.append((
+            json.dumps({'Programming': found[:len(found) // 2], 'Soft Skills': found[len(found) // 2:]}),
+            json.dumps({'total_years': rng.randrange(0, 25), 'positions': rng.sample(TITLES, rng.randrange(1, 4)),
+                        'companies': ['Company'] * rng.randrange(1, 4)}),
+            json.dumps({'highest_degree': rng.choice(DEGREES), 'degrees': ['Degree'], 'institutions': ['University']})
+        ))
+    return rows
+
+
+def json_scan(store, rows):
+    """Decode and featurize every row: mean profile features and skill frequencies"""
+    profiles, skills = [], []
+    for skills_json, experience_json, education_json in rows:
+        experience = store.extractor.extract_experience_features(json.loads(experience_json))
+        experience.update(store.extractor.extract_education_features(json.loads(education_json)))
+        profiles.append([float(experience.get(name, 0)) for name in PROFILE_FEATURE_COLUMNS])
+        skills.append([skill for category in json.loads(skills_json).values() for skill in category])
+    columns = {skill: index for index, skill in enumerate(skill_columns())}
+    frequencies = np.zeros(len(columns))
+    for found in skills:
+        for skill in found:
+            frequencies[columns[skill]] += 1
+    return np.mean(profiles, axis=0), frequencies
+
+
+def store_scan(store):
+    """The same aggregates from the store"""
+    table = store.load()
+    first = table.feature_columns.index(PROFILE_FEATURE_COLUMNS[0])
+    return table.features[:, first:first + len(PROFILE_FEATURE_COLUMNS)].mean(axis=0), table.skills.sum(axis=0)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def directory_mb(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names) / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--analyses', type=int, default=100000, help='Analyses in the history')
+    parser.add_argument('--shard-size', type=int, default=1000, help='Analyses appended per shard')
+    args = parser.parse_args()
+
+    rows = synthetic_history(args.analyses)
+    with tempfile.TemporaryDirectory() as directory:
+        store = FeatureStore(directory, max_shards=0)
+        build_seconds = time.perf_counter()
+        for start in range(0, len(rows), args.shard_size):
+            chunk = rows[start:start + args.shard_size]
+            store.append(
+                list(range(start + 1, start + len(chunk) + 1)),
+                [''] * len(chunk),
+                [json.loads(skills) for skills, _, _ in chunk],
+                [json.loads(experience) for _, experience, _ in chunk],
+                [json.loads(education) for _, _, education in chunk]
+            )
+        build_seconds = time.perf_counter() - build_seconds
+        shards = len(store.shards())
+
+        json_seconds, expected = timed(json_scan, store, rows)
+        sharded_seconds, sharded = timed(store_scan, store)
+        compact_seconds, _ = timed(store.compact)
+        compacted_seconds, compacted = timed(store_scan, store)
+        size = directory_mb(directory)
+
+    for profiles, frequencies in (sharded, compacted):
+        if not (np.allclose(profiles, expected[0]) and np.array_equal(frequencies, expected[1])):
+            print("❌ Feature store scan differs from the JSON scan")
+            sys.exit(1)
+
+    print("=" * 60)
+    print(f"{'Scan of ' + str(args.analyses) + ' analyses':<34} {'Seconds':>10} {'Analyses/s':>13}")
+    print("-" * 60)
+    for mode, seconds in (('JSON columns, row by row', json_seconds),
+                          (f'Feature store, {shards} shards', sharded_seconds),
+                          ('Feature store, compacted (mmap)', compacted_seconds)):
+        print(f"{mode:<34} {seconds:>10.3f} {args.analyses / seconds:>13.0f}")
+    print("=" * 60)
+    print(f"Appending took {build_seconds:.1f}s, compaction {compact_seconds:.2f}s, store size {size:.1f}MB")
+    print(f"✅ Identical aggregates, compacted store scan {json_seconds / compacted_seconds:.0f}x faster than JSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Model artifact benchmark for Smart Resume Analyzer
+Loads the same forest in several concurrent worker processes, once from a
+plain scikit-learn pickle and once from the flattened, memory-mapped
+layout, and reports cold load time and per-worker memory (RSS, private
+and proportional set size) after the load
+
+Usage: python benchmarks/bench_model_artifacts.py [--workers N] [--trees N] [--documents N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = [f"term{i}" for i in range(3000)]
+
+
+def memory_mb():
+    """Rss, Pss and private memory of this process in MB (Linux only, None elsewhere)"""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = {line.split(':')[0]: int(line.split()[1]) for line in f if line.split()[-1] == 'kB'}
+    except OSError:
+        return None
+    private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return {'rss': fields['Rss'] / 1024, 'pss': fields['Pss'] / 1024, 'private': private / 1024}
+
+
+def build_model(workdir, trees, documents):
+    """Train a synthetic model and save it in both layouts; returns {layout: (vectorizer, classifier)} paths"""
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.ensemble import RandomForestClassifier
+    from models.artifacts import FlatForest, save_artifact
+
+    rng = random.Random(42)
+    texts = [' '.join(rng.choice(WORDS) for _ in range(120)) for _ in range(documents)]
+    labels = [rng.randrange(7) for _ in range(documents)]
+    vectorizer = TfidfVectorizer(max_features=1000)
+    forest = RandomForestClassifier(n_estimators=trees, random_state=42).fit(vectorizer.fit_transform(texts), labels)
+
+    paths = {}
+    for layout in ('pickle', 'mmap'):
+        vectorizer_path = os.path.join(workdir, f'{layout}_vectorizer.pkl')
+        classifier_path = os.path.join(workdir, f'{layout}_classifier.pkl')
+        if layout == 'pickle':
+            joblib.dump(vectorizer, vectorizer_path)
+            joblib.dump(forest, classifier_path)
+        else:
+            save_artifact(vectorizer, vectorizer_path)
+            save_artifact(FlatForest.from_estimator(forest), classifier_path)
+        paths[layout] = (vectorizer_path, classifier_path)
+    return paths, texts[:50]
+
+
+def worker(layout, paths, sample, barrier, results):
+    """Load one layout, wait until every worker has loaded it, then measure"""
+    import joblib
+    from models.artifacts import load_artifact
+    import sklearn.ensemble  # Imports are not part of the load being measured
+
+    before = memory_mb()
+    start = time.perf_counter()
+    if layout == 'pickle':
+        vectorizer, classifier = (joblib.load(path) for path in paths)
+    else:
+        vectorizer, classifier = (load_artifact(path) for path in paths)
+    # Predict once so every mapped page the model needs is touched
+    classifier.predict(vectorizer.transform(sample))
+    seconds = time.perf_counter() - start
+
+    barrier.wait()
+    after = memory_mb()
+    results.put((seconds, before, after))
+    barrier.wait()
+
+
+def run_layout(layout, paths, sample, workers):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(layout, paths, sample, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    measured = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent worker processes')
+    parser.add_argument('--trees', type=int, default=100, help='Trees in the forest')
+    parser.add_argument('--documents', type=int, default=3000, help='Synthetic training documents')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"🏋️ Training {args.trees} trees on {args.documents} documents...")
+        paths, sample = build_model(workdir, args.trees, args.documents)
+        sizes = {layout: sum(os.path.getsize(path) for path in layout_paths) / 2 ** 20
+                 for layout, layout_paths in paths.items()}
+
+        print("=" * 78)
+        print(f"{'Layout':<8} {'File MB':>8} {'Load s':>8} {'RSS +MB':>9} {'Private +MB':>12} {'PSS +MB':>9} {'Sum PSS MB':>11}")
+        print("-" * 78)
+        for layout in ('pickle', 'mmap'):
+            measured = run_layout(layout, paths[layout], sample, args.workers)
+            load_seconds = statistics.median(seconds for seconds, _, _ in measured)
+            if measured[0][1] is None:
+                print(f"{layout:<8} {sizes[layout]:>8.1f} {load_seconds:>8.3f} {'n/a':>9} {'n/a':>12} {'n/a':>9} {'n/a':>11}")
+                continue
+            delta = {
+                key: statistics.mean(after[key] - before[key] for _, before, after in measured)
+                for key in ('rss', 'private', 'pss')
+            }
+            total_pss = sum(after['pss'] - before['pss'] for _, before, after in measured)
+            print(f"{layout:<8} {sizes[layout]:>8.1f} {load_seconds:>8.3f} {delta['rss']:>9.1f} "
+                  f"{delta['private']:>12.1f} {delta['pss']:>9.1f} {total_pss:>11.1f}")
+        print("=" * 78)
+        print(f"Per-worker deltas over {args.workers} concurrent workers; PSS splits shared pages between them")
+
+
+if __name__ == "__main__":
+    main()
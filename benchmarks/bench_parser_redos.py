@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Regex denial-of-service harness for Smart Resume Analyzer
+Feeds adversarial 1-16MB texts to every regex in utils/parser.py (and the
+document patterns it relies on) and to each parser extraction method,
+each call in a child process that is killed once it exceeds its time budget
+
+Exits with status 1 if any call exceeds the budget.
+
+Usage: python benchmarks/bench_parser_redos.py [--sizes 1,4,16] [--budget-per-mb 2.0] [--quick]
+"""
+
+import os
+import re
+import sys
+import ast
+import time
+import random
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARSER_SOURCE = os.path.join(PROJECT_ROOT, 'utils', 'parser.py')
+
+MB = 1024 * 1024
+METHODS = ('parse_personal_info', 'extract_skills', 'extract_experience', 'extract_education')
+
+
+def _repeat(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _random_text(size, alphabet, seed=42):
+    rng = random.Random(seed)
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+
+def _numbered_lines(size):
+    """Distinct "Role N at Company N" lines, the worst case for list-based dedupe"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = f"Role {i} at Company {i}\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return ''.join(lines)[:size]
+
+
+# Inputs that trigger backtracking in naive patterns; none of them contain newlines
+# except where line handling itself is under test
+ADVERSARIAL_CASES = {
+    'letters': lambda size: 'a' * size,
+    'dotted-words': lambda size: _repeat('a.', size),
+    'email-domain': lambda size: 'a@' + _repeat('a.', size - 2),
+    'spaced-words': lambda size: _repeat('x ', size),
+    'dashes': lambda size: _repeat('- ', size),
+    'separators': lambda size: _repeat('at | ', size),
+    'digits': lambda size: _repeat('1 ', size),
+    'parentheses': lambda size: _repeat('(123) ', size),
+    'years': lambda size: _repeat('1999 ', size),
+    'titles': lambda size: _repeat('senior python developer ', size),
+    'distinct-lines': _numbered_lines,
+    'headings': lambda size: _repeat('EXPERIENCE\nRole at Company\nSKILLS: Python\n', size),
+    'random-symbols': lambda size: _random_text(size, 'a1 .-@|()+\n'),
+}
+
+
+def _is_re_call(node):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name) and node.func.value.id == 're' and node.args)
+
+
+def _string(node):
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+def collect_parser_patterns():
+    """
+    Every regex in utils/parser.py: string literals passed as the first
+    argument of re.* calls, *_PATTERN(S) constants passed there by name, and
+    the entries of *_patterns lists a loop passes there (for lists of
+    (pattern, label) tuples, only the element bound to the passed name)
+    """
+    with open(PARSER_SOURCE, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    assignments = {}  # *_pattern(s) name -> assigned value
+    passed_names = set()  # Names passed as the regex of a re.* call
+    patterns = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id.lower().endswith(('_pattern', '_patterns')):
+                    assignments[target.id] = node.value
+        elif _is_re_call(node):
+            argument = node.args[0]
+            if _string(argument) is not None:
+                patterns.append(argument.value)
+            elif isinstance(argument, ast.Name):
+                passed_names.add(argument.id)
+
+    for name in passed_names:
+        if name in assignments and _string(assignments[name]) is not None:
+            patterns.append(assignments[name].value)
+
+    # Loops over pattern lists: "for pattern in x_patterns" or "for pattern, label in x_patterns"
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.For, ast.comprehension)) or not isinstance(node.iter, ast.Name):
+            continue
+        entries = assignments.get(node.iter.id)
+        if not isinstance(entries, (ast.List, ast.Tuple)):
+            continue
+        if isinstance(node.target, ast.Name):
+            if node.target.id in passed_names:
+                patterns.extend(_string(entry) for entry in entries.elts)
+        elif isinstance(node.target, ast.Tuple):
+            for position, element in enumerate(node.target.elts):
+                if isinstance(element, ast.Name) and element.id in passed_names:
+                    patterns.extend(
+                        _string(entry.elts[position]) for entry in entries.elts
+                        if isinstance(entry, ast.Tuple) and len(entry.elts) > position
+                    )
+
+    return [pattern for pattern in dict.fromkeys(patterns) if pattern is not None]
+
+
+def collect_targets():
+    """(name, kind, key) for every regex and parser method under test"""
+    from utils import document
+    from utils.skill_matcher import get_skill_matcher
+
+    targets = [(f"regex {pattern[:40]!r}", 'regex', pattern) for pattern in collect_parser_patterns()]
+    for name in ('YEAR_PATTERN', 'EMAIL_PATTERN', 'PHONE_PATTERN'):
+        targets.append((f"document.{name}", 'regex', getattr(document, name)))
+    targets.append(('skill matcher', 'regex', get_skill_matcher().pattern.pattern))
+    targets.extend((f"ResumeParser.{method}", 'method', method) for method in METHODS)
+    return targets
+
+
+def _run_target(kind, key, case, size, queue):
+    """Child process: build the text, run one target and report its duration"""
+    text = ADVERSARIAL_CASES[case](size)
+    if kind == 'regex':
+        flags = re.IGNORECASE if key.startswith('(?<!') else 0
+        pattern = re.compile(key, flags)
+        start = time.perf_counter()
+        for _ in pattern.finditer(text):
+            pass
+    else:
+        from utils.parser import ResumeParser
+        from utils.document import ResumeDocument
+        parser = ResumeParser()
+        start = time.perf_counter()
+        getattr(parser, key)(ResumeDocument(text, parser.skill_matcher))
+    queue.put(time.perf_counter() - start)
+
+
+def run_call(kind, key, case, size, budget):
+    """Run one target in a child process; returns seconds, or None if it was killed"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_target, args=(kind, key, case, size, queue))
+    process.start()
+    process.join(budget)
+    if process.is_alive():
+        process.kill()
+        process.join()
+        return None
+    return queue.get() if not queue.empty() else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='1,4,16', help='Comma-separated text sizes in MB')
+    parser.add_argument('--budget-per-mb', type=float, default=2.0, help='Seconds allowed per MB of input')
+    parser.add_argument('--quick', action='store_true', help='Only the smallest size (for CI)')
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes.split(',')]
+    if args.quick:
+        sizes = sizes[:1]
+
+    targets = collect_targets()
+    print(f"🧪 {len(targets)} targets x {len(ADVERSARIAL_CASES)} inputs x {len(sizes)} sizes")
+
+    failures = []
+    print("=" * 96)
+    print(f"{'Target':<52} {'Input':<16} {'MB':>5} {'Seconds':>9} {'Budget':>8}")
+    print("-" * 96)
+    for size_mb in sizes:
+        size = int(size_mb * MB)
+        budget = args.budget_per_mb * size_mb
+        for name, kind, key in targets:
+            worst = (0.0, None)
+            for case in ADVERSARIAL_CASES:
+                seconds = run_call(kind, key, case, size, budget)
+                if seconds is None or seconds > budget:
+                    failures.append((name, case, size_mb))
+                    print(f"{name[:52]:<52} {case:<16} {size_mb:>5g} {'TIMEOUT' if seconds is None else f'{seconds:.2f}':>9} {budget:>8.1f} ❌")
+                elif seconds > worst[0]:
+                    worst = (seconds, case)
+            if worst[1]:
+                print(f"{name[:52]:<52} {worst[1]:<16} {size_mb:>5g} {worst[0]:>9.3f} {budget:>8.1f}")
+    print("=" * 96)
+
+    if failures:
+        print(f"❌ {len(failures)} calls exceeded the time budget")
+        sys.exit(1)
+    print("✅ Every call finished within the time budget (slowest input per target shown)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+PDF backend benchmark for Smart Resume Analyzer
+Extracts every page of each PDF with both backends and reports per-page timings
+
+Usage: python benchmarks/bench_pdf_backends.py <pdf file or directory> [...]
+"""
+
+import os
+import sys
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_extractor import PDFExtractor, BACKENDS
+
+
+def collect_pdfs(paths):
+    """Expand directories into the PDF files they contain"""
+    pdfs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                pdfs.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith('.pdf'))
+        elif path.lower().endswith('.pdf'):
+            pdfs.append(path)
+    return pdfs
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_benchmark(pdfs):
+    """Time both backends on every page of every document"""
+    timings = {backend: [] for backend in BACKENDS}
+    chars = {backend: 0 for backend in BACKENDS}
+    failures = {backend: 0 for backend in BACKENDS}
+
+    for path in pdfs:
+        with open(path, 'rb') as f:
+            data = f.read()
+        for backend in BACKENDS:
+            extractor = PDFExtractor(backend=backend, max_pages=None, max_chars=None, parallel_min_pages=None)
+            try:
+                result = extractor.extract(data)
+            except Exception as e:
+                failures[backend] += 1
+                print(f"⚠️ {backend} failed on {path}: {e}")
+                continue
+            timings[backend].extend(page['seconds'] for page in result['pages'])
+            chars[backend] += sum(page['chars'] for page in result['pages'])
+
+    print("=" * 72)
+    print(f"{'Backend':<10} {'Pages':>7} {'Mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'Chars':>10} {'Failed':>7}")
+    print("-" * 72)
+    for backend in BACKENDS:
+        page_times = timings[backend]
+        if page_times:
+            print(f"{backend:<10} {len(page_times):>7} "
+                  f"{statistics.mean(page_times) * 1000:>9.2f} "
+                  f"{percentile(page_times, 50) * 1000:>9.2f} "
+                  f"{percentile(page_times, 95) * 1000:>9.2f} "
+                  f"{chars[backend]:>10} {failures[backend]:>7}")
+        else:
+            print(f"{backend:<10} {0:>7} {'-':>9} {'-':>9} {'-':>9} {0:>10} {failures[backend]:>7}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    pdf_files = collect_pdfs(sys.argv[1:])
+    if not pdf_files:
+        print("❌ No PDF files found")
+        sys.exit(1)
+
+    print(f"📄 Benchmarking {len(pdf_files)} PDF files...")
+    run_benchmark(pdf_files)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Skill matching benchmark for Smart Resume Analyzer
+Compares one regex search per skill with the single-pass SkillMatcher on
+taxonomies of increasing size (the bundled taxonomy padded with synthetic skills)
+
+Usage: python benchmarks/bench_skill_matcher.py [resume text file]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.skill_matcher import SkillMatcher, SKILLS_TAXONOMY
+
+SIZES = [100, 1000, 10000]  # Skills per taxonomy
+REPEATS = 5
+
+SAMPLE_RESUME = """
+JOHN DOE
+Senior Software Engineer | john.doe@email.com | (555) 123-4567
+
+Experienced developer with 6 years building web applications in Python, JavaScript and Go.
+Worked with Django, Flask, React, Node.js, PostgreSQL, MongoDB and Redis on AWS and GCP.
+Set up CI/CD with Jenkins, Docker and Kubernetes (k8s); infrastructure as code with Terraform.
+Applied machine learning with scikit-learn, TensorFlow and pandas; dashboards in Power BI and Excel.
+Strong communication, leadership and project management skills; Agile and Scrum with Jira.
+""" * 10
+
+
+def synthetic_skill(rng):
+    syllables = ['ka', 'lo', 'mi', 'ne', 'tr', 'ux', 'zo', 'qua', 'vex', 'dri', 'pha', 'sol']
+    words = [''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 2))]
+    return ' '.join(words)
+
+
+def build_taxonomy(size):
+    """Bundled taxonomy padded with synthetic skills up to the requested size"""
+    with open(SKILLS_TAXONOMY, encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    rng = random.Random(size)
+    existing = {entry if isinstance(entry, str) else entry['skill'] for entries in taxonomy.values() for entry in entries}
+    synthetic = set()
+    while len(existing) + len(synthetic) < size:
+        synthetic.add(synthetic_skill(rng))
+    taxonomy['Synthetic'] = sorted(synthetic - existing)
+    return taxonomy
+
+
+def per_skill_regex(taxonomy, text):
+    """The original approach: one word-boundary regex search per skill"""
+    text_lower = text.lower()
+    found = {}
+    for category, entries in taxonomy.items():
+        found[category] = []
+        for entry in entries:
+            skill = entry if isinstance(entry, str) else entry['skill']
+            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower, re.IGNORECASE):
+                found[category].append(skill)
+    return found
+
+
+def median_seconds(function, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_benchmark(text):
+    print("=" * 78)
+    print(f"{'Skills':>7} {'Forms':>7} {'Compile ms':>11} {'Per-skill ms':>13} {'Matcher ms':>11} {'Speedup':>8} {'Hits':>6}")
+    print("-" * 78)
+    for size in SIZES:
+        taxonomy = build_taxonomy(size)
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compile_seconds = time.perf_counter() - start
+
+        # Each size gets a fresh regex cache so the per-skill path pays its compiles
+        re.purge()
+        old_seconds = median_seconds(per_skill_regex, taxonomy, text)
+        new_seconds = median_seconds(matcher.find, text)
+        hits = matcher.find(text)
+        print(f"{size:>7} {len(matcher.forms):>7} {compile_seconds * 1000:>11.1f} {old_seconds * 1000:>13.2f} "
+              f"{new_seconds * 1000:>11.2f} {old_seconds / new_seconds:>7.1f}x {len(hits):>6}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], encoding='utf-8') as f:
+            resume_text = f.read()
+    else:
+        resume_text = SAMPLE_RESUME
+
+    print(f"📄 Matching against {len(resume_text)} characters of resume text...")
+    run_benchmark(resume_text)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for Smart Resume Analyzer
+Times `import app`, create_app() and warm_up() in fresh interpreters and
+checks that no heavy dependency is imported before warm-up; exits with
+status 1 when start-up regresses past the budget
+
+Usage: python benchmarks/bench_startup.py [--repeats N] [--max-startup-seconds S]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported only by components that are built on first use or by warm_up()
+HEAVY_MODULES = ['sklearn', 'pandas', 'numpy', 'scipy', 'pdfminer', 'PyPDF2', 'docx', 'nltk']
+
+CHILD_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app({'SQLALCHEMY_DATABASE_URI': sys.argv[1]})
+created = time.perf_counter()
+heavy = json.loads(sys.argv[2])
+loaded = [name for name in heavy if name in sys.modules]
+app.warm_up()
+warmed = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'create_app': created - imported,
+    'warm_up': warmed - created,
+    'heavy_before_warm_up': loaded
+}))
+"""
+
+
+def measure_once(database_uri):
+    """Run one cold start in a fresh interpreter and return its timings"""
+    env = dict(os.environ, EXTRACTION_SANDBOX='False', WARM_UP='False')
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, database_uri, json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    # Components may print while loading; the timings are the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeats', type=int, default=5, help='Cold starts to measure')
+    parser.add_argument('--max-startup-seconds', type=float, default=1.0,
+                        help='Budget for import plus create_app() (median)')
+    args = parser.parse_args()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        database_uri = 'sqlite:///' + os.path.join(workdir, 'startup.db')
+        for _ in range(args.repeats):
+            runs.append(measure_once(database_uri))
+
+    print("=" * 48)
+    print(f"{'Stage':<14} {'Median s':>10} {'Min s':>10} {'Max s':>10}")
+    print("-" * 48)
+    for stage in ('import', 'create_app', 'warm_up'):
+        timings = [run[stage] for run in runs]
+        print(f"{stage:<14} {statistics.median(timings):>10.3f} {min(timings):>10.3f} {max(timings):>10.3f}")
+    print("=" * 48)
+
+    startup = statistics.median(run['import'] + run['create_app'] for run in runs)
+    heavy = sorted({name for run in runs for name in run['heavy_before_warm_up']})
+    failed = False
+    if heavy:
+        print(f"❌ Imported before warm-up: {', '.join(heavy)}")
+        failed = True
+    if startup > args.max_startup_seconds:
+        print(f"❌ Start-up took {startup:.3f}s (budget {args.max_startup_seconds:.3f}s)")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print(f"✅ Start-up {startup:.3f}s within {args.max_startup_seconds:.3f}s, heavy modules deferred")
+
+
+if __name__ == "__main__":
+    main()
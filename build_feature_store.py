@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Backfill and compact the feature store from analysis history
+New analyses are appended to the feature store as they are saved; this
+script adds the analyses saved before it existed (or when it was disabled),
+reading the history in chunks, then merges all shards into one and drops
+the rows of deleted analyses. With --corpus the same is done for the
+corpus TF-IDF matrix
+
+Usage: python build_feature_store.py [--corpus] [--database-uri URI] [--store DIR] [--chunk-size N] [--compact-only]
+"""
+
+import json
+import time
+import zlib
+import argparse
+
+from app import create_app, db, ResumeAnalysis, ExtractedText
+from utils.corpus_matrix import CorpusMatrix
+from utils.feature_store import FeatureStore
+
+
+def iter_analysis_chunks(chunk_size, skip_ids):
+    """Yield lists of up to chunk_size (id, text, skills, work_experience, education) rows in id order"""
+    result = db.session.execute(
+        db.select(
+            ResumeAnalysis.id,
+            ExtractedText.compressed_text,
+            ResumeAnalysis.skills,
+            ResumeAnalysis.work_experience,
+            ResumeAnalysis.education
+        )
+        .outerjoin(ExtractedText, ExtractedText.content_hash == ResumeAnalysis.content_hash)
+        .order_by(ResumeAnalysis.id),
+        execution_options={'yield_per': chunk_size}
+    )
+    for rows in result.partitions():
+        yield [
+            (analysis_id, zlib.decompress(compressed_text).decode('utf-8') if compressed_text else '',
+             skills, work_experience, education)
+            for analysis_id, compressed_text, skills, work_experience, education in rows
+            if analysis_id not in skip_ids
+        ]
+
+
+def _json(value):
+    return json.loads(value) if value else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--corpus', action='store_true', help='Build the corpus matrix instead of the feature store')
+    parser.add_argument('--database-uri', help="Database to read (defaults to the app's)")
+    parser.add_argument('--store', help="Directory to build (defaults to FEATURE_STORE_DIR, or CORPUS_MATRIX_DIR with --corpus)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Analyses featurized per shard')
+    parser.add_argument('--compact-only', action='store_true', help='Only merge shards and drop deleted analyses')
+    args = parser.parse_args()
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_uri} if args.database_uri else None)
+    setting = 'CORPUS_MATRIX_DIR' if args.corpus else 'FEATURE_STORE_DIR'
+    directory = args.store or app.config[setting]
+    if not directory:
+        print(f"❌ {setting} is empty; pass --store")
+        return
+    # Compacted only here, where the ids of deleted analyses are known
+    store = CorpusMatrix(directory, max_segments=0) if args.corpus else FeatureStore(directory, max_shards=0)
+
+    with app.app_context():
+        start = time.perf_counter()
+        added = 0
+        if not args.compact_only:
+            stored = set((store.counts() if args.corpus else store.load()).ids.tolist())
+            print(f"📦 {len(stored)} analyses already in {directory}")
+            for chunk in iter_analysis_chunks(args.chunk_size, stored):
+                if not chunk:
+                    continue
+                if args.corpus:
+                    store.append([row[0] for row in chunk], [row[1] for row in chunk])
+                else:
+                    store.append(*zip(*[
+                        (analysis_id, text, _json(skills), _json(work_experience), _json(education))
+                        for analysis_id, text, skills, work_experience, education in chunk
+                    ]))
+                added += len(chunk)
+                print(f"➕ {added} analyses {'vectorized' if args.corpus else 'featurized'}")
+
+        live_ids = db.session.scalars(db.select(ResumeAnalysis.id)).all()
+
+    merged = store.compact(keep_ids=live_ids)
+    if args.corpus:
+        table = store.counts()
+        print(f"✅ Added {added} analyses, merged {merged} segments: {len(table.ids)} analyses in "
+              f"{len(store.shards())} segments, {table.matrix.nnz} stored terms "
+              f"({time.perf_counter() - start:.1f}s)")
+    else:
+        table = store.load()
+        print(f"✅ Added {added} analyses, merged {merged} shards: {len(table.ids)} analyses, "
+              f"{len(table.feature_columns)} features, {len(table.skill_columns)} skills "
+              f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Department Matrix
+Vectorized eligibility scoring of one candidate against every department,
+kept apart from the department configuration so numpy is only imported
+when all-department scoring is used
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+class DepartmentMatrix:
+    """Requirements of all departments laid out as arrays, so a candidate is scored against every department at once"""
+    
+    def __init__(self, departments):
+        self.names = list(departments)
+        configs = [departments[name] for name in self.names]
+        
+        self.skill_vocab = sorted({skill.lower().strip() for config in configs for skill in config['required_skills']})
+        skill_index = {skill: i for i, skill in enumerate(self.skill_vocab)}
+        self.skill_incidence = np.zeros((len(configs), len(self.skill_vocab)))
+        for row, config in enumerate(configs):
+            for skill in config['required_skills']:
+                self.skill_incidence[row, skill_index[skill.lower().strip()]] = 1
+        self.required_skill_counts = np.array([len(config['required_skills']) for config in configs], dtype=float)
+        
+        self.education_terms = sorted({edu.lower() for config in configs for edu in config['required_education']})
+        education_index = {edu: i for i, edu in enumerate(self.education_terms)}
+        self.education_incidence = np.zeros((len(configs), len(self.education_terms)))
+        for row, config in enumerate(configs):
+            for edu in config['required_education']:
+                self.education_incidence[row, education_index[edu.lower()]] = 1
+        
+        self.min_experience = np.array([config['min_experience'] for config in configs], dtype=float)
+        self.min_scores = [config['min_score'] for config in configs]
+        self.weights = {
+            key: np.array([config['weights'][key] for config in configs], dtype=float)
+            for key in ('skill_match', 'experience', 'education', 'projects_certs')
+        }
+        
+        # Candidate skills come from a fixed taxonomy, so their match rows are memoized
+        self._skill_rows = lru_cache(maxsize=4096)(self._build_skill_rows)
+    
+    def _build_skill_rows(self, skill):
+        """Exact and partial (substring) match of one candidate skill against the skill vocabulary"""
+        exact = np.array([skill == r_skill for r_skill in self.skill_vocab], dtype=float)
+        partial = np.array([
+            (skill in r_skill or r_skill in skill) and len(skill) > 2 and len(r_skill) > 2
+            for r_skill in self.skill_vocab
+        ], dtype=float)
+        return exact, partial
+    
+    def skill_match(self, candidate_skills):
+        """Skill match percentage per department, same rules as calculate_skill_match"""
+        if not candidate_skills:
+            return np.zeros(len(self.names))
+        
+        counts = {}
+        for skill in candidate_skills:
+            skill = skill.lower().strip()
+            counts[skill] = counts.get(skill, 0) + 1
+        
+        rows = [self._skill_rows(skill) for skill in counts]
+        exact_hits = np.array([exact for exact, _ in rows]) @ self.skill_incidence.T > 0
+        partial_hits = np.array([partial for _, partial in rows]) @ self.skill_incidence.T > 0
+        
+        # An exact match counts 1; otherwise the first partial match counts 0.5
+        per_skill = np.where(exact_hits, 1.0, np.where(partial_hits, 0.5, 0.0))
+        total_matches = np.array(list(counts.values()), dtype=float) @ per_skill
+        return np.minimum(100.0, (total_matches / self.required_skill_counts) * 100)
+    
+    def education_match(self, candidate_education):
+        """Boolean per department, same rules as check_education_match"""
+        if not candidate_education:
+            return np.zeros(len(self.names), dtype=bool)
+        education_lower = candidate_education.lower()
+        hits = np.array([term in education_lower for term in self.education_terms], dtype=float)
+        return self.education_incidence @ hits > 0
+    
+    def score(self, candidate_data):
+        """
+        Score a candidate against every department
+        
+        Returns:
+            Dictionary mapping department name to the calculate_eligibility_score result
+        """
+        weights = self.weights
+        
+        skill_match_pct = self.skill_match(candidate_data.get('skills', []))
+        skill_scores = (skill_match_pct / 100) * weights['skill_match']
+        
+        candidate_exp = candidate_data.get('experience_years', 0)
+        exp_scores = np.select(
+            [candidate_exp >= self.min_experience * 1.5,
+             candidate_exp >= self.min_experience,
+             candidate_exp >= self.min_experience * 0.5],
+            [weights['experience'],
+             weights['experience'] * 0.8,
+             weights['experience'] * 0.5],
+            default=weights['experience'] * 0.2
+        )
+        
+        edu_scores = np.where(self.education_match(candidate_data.get('education', '')), weights['education'], 0)
+        
+        has_projects = candidate_data.get('work_experience', '') and len(candidate_data.get('work_experience', '')) > 100
+        projects_scores = weights['projects_certs'] * 0.7 if has_projects else weights['projects_certs'] * 0.3
+        
+        total_scores = skill_scores + exp_scores + edu_scores + projects_scores
+        eligible = total_scores >= np.array(self.min_scores, dtype=float)
+        
+        results = {}
+        for i, name in enumerate(self.names):
+            min_score = self.min_scores[i]
+            results[name] = {
+                'total_score': round(float(total_scores[i]), 2),
+                'skill_match_percentage': round(float(skill_match_pct[i]), 2),
+                'breakdown': {
+                    'skill_score': round(float(skill_scores[i]), 2),
+                    'experience_score': round(float(exp_scores[i]), 2),
+                    'education_score': round(float(edu_scores[i]), 2),
+                    'projects_score': round(float(projects_scores[i]), 2)
+                },
+                'eligible': bool(eligible[i]),
+                'min_score_required': min_score,
+                'message': 'Eligible for shortlisting' if eligible[i] else f'Score below minimum ({min_score})'
+            }
+        return results
@@ -270,6 +270,29 @@ def calculate_eligibility_score(candidate_data, department_name):
         'message': 'Eligible for shortlisting' if eligible else f'Score below minimum ({dept_config["min_score"]})'
     }
 
+_department_matrix = None
+
+def calculate_all_eligibility_scores(candidate_data):
+    """
+    Calculate eligibility scores for every department in one pass
+    
+    Args:
+        candidate_data: Dictionary containing candidate information
+    
+    Returns:
+        Dictionary mapping department name to the calculate_eligibility_score result
+    """
+    global _department_matrix
+    if _department_matrix is None:
+        # numpy is only needed here, so it is imported on first use
+        from config.department_matrix import DepartmentMatrix
+        _department_matrix = DepartmentMatrix(DEPARTMENTS)
+    return _department_matrix.score(candidate_data)
+
+def get_best_department(department_scores):
+    """Get the department with the highest total score from calculate_all_eligibility_scores results"""
+    return max(department_scores, key=lambda name: department_scores[name]['total_score'])
+
 def get_ai_authenticity_status(ai_score):
     """
     Get AI authenticity status based on AI generated score
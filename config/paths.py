@@ -0,0 +1,8 @@
+"""
+Storage Paths
+Locations shared by the models and utils packages, kept free of imports so
+either side can use them without loading the other
+"""
+
+# Seed model, published model versions and the fitted feature vectorizers
+MODEL_DIR = 'data/trained_models'
@@ -0,0 +1,141 @@
+"""
+Model Artifacts
+Saves trained models so they can be loaded with joblib's mmap_mode='r':
+numpy arrays are written uncompressed and mapped read-only on load, so
+every worker process shares one copy through the page cache
+"""
+
+import os
+import tempfile
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+# Rows densified at once by FlatForest.predict_proba
+PREDICT_BLOCK_ROWS = 2048
+
+
+def _read_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import; os.umask can only be read by setting it
+UMASK = _read_umask()
+
+
+def publish_permissions(path):
+    """
+    Give a tempfile-created file or directory the permissions open() or
+    mkdir() would have (0644/0755 under the usual umask) instead of 0600/0700,
+    so workers running as another user can read what retraining publishes
+    """
+    os.chmod(path, (0o777 if os.path.isdir(path) else 0o666) & ~UMASK)
+
+
+def save_artifact(obj, path):
+    """Dump obj uncompressed to a temporary file and rename it over path, so readers never see a partial pickle"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.', suffix='.tmp')
+    os.close(fd)
+    try:
+        # Dumping by file name (not file object) aligns the arrays for memory mapping
+        joblib.dump(obj, tmp_path)
+        publish_permissions(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_artifact(path):
+    """Load an artifact with its numpy arrays memory-mapped read-only"""
+    return joblib.load(path, mmap_mode='r')
+
+
+class FlatForest:
+    """
+    A fitted RandomForestClassifier flattened into plain numpy arrays
+
+    scikit-learn copies every tree's nodes into private memory when a forest
+    is unpickled, so the trees cannot stay memory-mapped. Here all trees share
+    one set of node arrays and prediction walks every tree at once; the
+    results match RandomForestClassifier.predict_proba.
+    """
+
+    def __init__(self, classes, roots, feature, threshold, left, right, value, n_features_in):
+        self.classes_ = classes
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.n_features_in_ = n_features_in
+
+    @classmethod
+    def from_estimator(cls, forest):
+        """Flatten a fitted RandomForestClassifier (single output)"""
+        roots, feature, threshold, left, right, value = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            children_left = tree.children_left.astype(np.int32)
+            children_right = tree.children_right.astype(np.int32)
+            is_leaf = children_left == -1
+            roots.append(offset)
+            feature.append(tree.feature.astype(np.int32))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, -1, children_left + offset))
+            right.append(np.where(is_leaf, -1, children_right + offset))
+            # Per-tree class probabilities, normalized the way DecisionTreeClassifier does
+            leaf_value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = leaf_value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(leaf_value / normalizer)
+            offset += tree.node_count
+
+        return cls(
+            classes=np.asarray(forest.classes_),
+            roots=np.array(roots, dtype=np.int32),
+            feature=np.concatenate(feature),
+            threshold=np.concatenate(threshold),
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            value=np.concatenate(value),
+            n_features_in=forest.n_features_in_
+        )
+
+    def predict_proba(self, X):
+        """Average class probabilities of all trees for each row of X (sparse or dense)"""
+        # Densify a block of rows at a time so large batches stay bounded in memory
+        return np.vstack([
+            self._predict_proba_block(X[start:start + PREDICT_BLOCK_ROWS])
+            for start in range(0, X.shape[0], PREDICT_BLOCK_ROWS)
+        ] or [np.zeros((0, self.value.shape[1]))])
+
+    def _predict_proba_block(self, X):
+        X = X.toarray() if sparse.issparse(X) else np.asarray(X)
+        # Trees split on float32 features, like scikit-learn
+        X = X.astype(np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+
+        nodes = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        while True:
+            left = self.left[nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = X[rows, np.where(internal, self.feature[nodes], 0)] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.right[nodes]), nodes)
+
+        # Summed tree by tree in order, as RandomForestClassifier does
+        proba = np.zeros((X.shape[0], self.value.shape[1]))
+        for tree in range(nodes.shape[1]):
+            proba += self.value[nodes[:, tree]]
+        return proba / nodes.shape[1]
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
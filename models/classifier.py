@@ -1,188 +1,605 @@
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.ensemble import RandomForestClassifier
-import joblib
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.neighbors import NearestCentroid
+import numpy as np
 import os
 import re
+import json
+import hashlib
+import time
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process lock, artifacts are still replaced atomically
+    fcntl = None
+
+from config.paths import MODEL_DIR
+from utils.document import ResumeDocument
+from models.artifacts import FlatForest, save_artifact, load_artifact, publish_permissions
+from models.prediction_cache import PredictionCache, PREDICTION_CACHE_SIZE
+
+
+# Seconds between checks for a newly published model version (0 checks before every classification)
+MODEL_CHECK_INTERVAL = float(os.environ.get('MODEL_CHECK_INTERVAL', 30))
+
+# Version of the model trained on TRAINING_DATA, saved at the top of the model directory
+SEED_MODEL_VERSION = 'seed'
+
+# What a classification runs against; replaced as a whole so a swap is atomic for readers.
+# cache_key names the exact model in the prediction cache
+LoadedModel = namedtuple('LoadedModel', ['vectorizer', 'classifier', 'version', 'cache_key'])
+
+# Department model used by ResumeClassifier (one of ENGINES)
+CLASSIFIER_ENGINE = os.environ.get('CLASSIFIER_ENGINE', 'random_forest')
+
+# Unfitted department models by engine name, all trained on the same TF-IDF features
+ENGINES = {
+    'random_forest': lambda: RandomForestClassifier(n_estimators=100, random_state=42),
+    'logistic_regression': lambda: LogisticRegression(max_iter=1000),
+    'sgd': lambda: SGDClassifier(loss='log_loss', random_state=42),
+    'naive_bayes': lambda: MultinomialNB(),
+    'nearest_centroid': lambda: NearestCentroid(),
+    # Updated in place with partial_fit on hashed features (see models/online.py)
+    'online': lambda: SGDClassifier(loss='log_loss', random_state=42)
+}
+
+# Engines trained on stateless hashed features instead of a fitted TF-IDF vocabulary
+HASHED_ENGINES = {'online'}
+
+
+def artifact_digest(*paths):
+    """Content hash of model artifact files, for models whose version name does not identify them"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def build_vectorizer(engine=None):
+    """Create the vectorizer an engine is trained on (TF-IDF, or feature hashing for HASHED_ENGINES)"""
+    if engine in HASHED_ENGINES:
+        # Nothing to fit: memory stays fixed however much history the model learns from
+        return HashingVectorizer(n_features=2 ** 16, alternate_sign=False, stop_words='english')
+    return TfidfVectorizer(max_features=1000, stop_words='english')
+
+
+def build_engine(engine):
+    """Create an unfitted department model for an ENGINES name"""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown classifier engine: {engine}")
+    return ENGINES[engine]()
+
+
+def serving_model(classifier):
+    """The form a fitted model is saved and served in (forests are flattened so they can be memory-mapped)"""
+    if isinstance(classifier, RandomForestClassifier):
+        return FlatForest.from_estimator(classifier)
+    return classifier
+
+
+def fit_model(examples, engine=CLASSIFIER_ENGINE, n_jobs=None):
+    """
+    Fit a vectorizer and department model on (text, label) pairs
+    
+    Args:
+        examples: Iterable of (text, label), consumed once as a stream so only
+            the sparse feature matrix is held in memory
+        engine: One of ENGINES
+        n_jobs: Cores used by engines that train in parallel (-1 for all)
+    
+    Returns:
+        Tuple of (vectorizer, classifier), both fitted
+    """
+    labels = []
+    
+    def texts():
+        for text, label in examples:
+            labels.append(label)
+            yield text
+    
+    vectorizer = build_vectorizer(engine)
+    X = vectorizer.fit_transform(texts())
+    classifier = build_engine(engine)
+    if n_jobs and 'n_jobs' in classifier.get_params():
+        classifier.set_params(n_jobs=n_jobs)
+    classifier.fit(X, labels)
+    return vectorizer, classifier
+
+
+def _engine_suffix(engine):
+    return '' if engine == 'random_forest' else f'_{engine}'
+
+
+def published_version(model_dir=MODEL_DIR, engine=CLASSIFIER_ENGINE):
+    """Name of the model version currently published for an engine, or None"""
+    try:
+        with open(os.path.join(model_dir, f'CURRENT{_engine_suffix(engine)}')) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def save_model_version(vectorizer, classifier, model_dir=MODEL_DIR, engine=CLASSIFIER_ENGINE, info=None):
+    """
+    Save a fitted model as data/trained_models/<version>/ and publish it
+    
+    The version directory is written under a temporary name and renamed into
+    place, then the engine's CURRENT pointer is replaced, so a worker never
+    sees a partial version
+    
+    Args:
+        info: Optional JSON-serializable details stored in model.json
+    
+    Returns:
+        The new version name
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=model_dir, prefix='.', suffix='.tmp')
+    try:
+        save_artifact(vectorizer, os.path.join(staging, 'vectorizer.pkl'))
+        save_artifact(serving_model(classifier), os.path.join(staging, 'classifier.pkl'))
+        
+        version = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+        with open(os.path.join(staging, 'model.json'), 'w') as f:
+            json.dump(dict(info or {}, version=version, engine=engine), f, indent=2)
+        
+        # Versions are named by time; add a counter if one was published this second
+        name, attempt = version, 1
+        while os.path.exists(os.path.join(model_dir, name)):
+            attempt += 1
+            name = f'{version}-{attempt:03d}'
+        publish_permissions(os.path.join(staging, 'model.json'))
+        publish_permissions(staging)
+        os.rename(staging, os.path.join(model_dir, name))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    fd, pointer_tmp = tempfile.mkstemp(dir=model_dir, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(name)
+    publish_permissions(pointer_tmp)
+    os.replace(pointer_tmp, os.path.join(model_dir, f'CURRENT{_engine_suffix(engine)}'))
+    return name
+
+
+def prune_model_versions(model_dir=MODEL_DIR, keep=3):
+    """Delete all but the newest keep version directories, never one that is published; returns the deleted names"""
+    published = {published_version(model_dir, engine) for engine in ENGINES}
+    versions = sorted(
+        name for name in os.listdir(model_dir)
+        if os.path.isfile(os.path.join(model_dir, name, 'model.json'))
+    )
+    # Workers still serving a deleted version keep their mapping until they switch
+    removed = [name for name in versions[:max(0, len(versions) - keep)] if name not in published]
+    for name in removed:
+        shutil.rmtree(os.path.join(model_dir, name), ignore_errors=True)
+    return removed
+
+
+# Enhanced training data with more examples (labels index ResumeClassifier.departments)
+TRAINING_DATA = {
+    'texts': [
+        # IT examples
+        "python java programming software development web database sql cloud aws docker kubernetes backend frontend",
+        "javascript react node.js web development full stack mobile app programming api rest",
+        "data science machine learning python sql analysis visualization pandas numpy",
+        "devops aws azure cloud infrastructure docker kubernetes ci cd jenkins",
+        
+        # HR examples
+        "recruitment hiring talent acquisition HR management interviewing onboarding employee relations",
+        "human resources payroll benefits compensation training development performance management",
+        "recruiter sourcing screening candidates HR policies compliance diversity inclusion",
+        
+        # Finance examples
+        "accounting finance budgeting financial analysis audit tax investment banking",
+        "financial planning analysis fpa forecasting budgeting reporting excel",
+        "accountant bookkeeping gaap financial statements audit tax preparation",
+        
+        # Marketing examples
+        "marketing sales digital social media SEO content strategy advertising branding",
+        "digital marketing google analytics seo sem social media content creation",
+        "brand management product marketing market research campaign management",
+        
+        # Engineering examples
+        "engineering mechanical electrical civil design construction manufacturing",
+        "mechanical engineer design cad solidworks manufacturing production",
+        "civil engineer construction project management structural design",
+        
+        # Operations examples
+        "operations supply chain logistics management production quality control",
+        "supply chain logistics inventory management procurement operations",
+        "project management operations process improvement lean manufacturing",
+        
+        # Sales examples
+        "sales business development client relationship negotiation deal closing",
+        "account executive sales representative business development b2b sales",
+        "sales manager team leadership revenue growth customer acquisition"
+    ],
+    'labels': [0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6, 6]
+}
+
 
 class ResumeClassifier:
-    def __init__(self):
+    def __init__(self, model_dir=MODEL_DIR, background=True, engine=CLASSIFIER_ENGINE):
+        """
+        Args:
+            model_dir: Directory holding vectorizer.pkl and classifier.pkl (the
+                seed model) and the versions published by retrain.py
+            background: Train a missing or unreadable model in a background
+                thread (classify_resume falls back to rules until it is ready)
+            engine: Department model, one of ENGINES; engines other than
+                random_forest keep their own vectorizer_<engine>.pkl,
+                classifier_<engine>.pkl and CURRENT_<engine> pointer
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown classifier engine: {engine}")
         self.departments = ['IT', 'HR', 'Finance', 'Marketing', 'Engineering', 'Operations', 'Sales']
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        self.classifier = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.engine = engine
+        self.model_dir = model_dir
+        suffix = _engine_suffix(engine)
+        self.vectorizer_path = os.path.join(model_dir, f'vectorizer{suffix}.pkl')
+        self.classifier_path = os.path.join(model_dir, f'classifier{suffix}.pkl')
+        self.model = None  # LoadedModel being served
+        # Departments already predicted, keyed by model and input text (None when disabled)
+        self.prediction_cache = PredictionCache() if PREDICTION_CACHE_SIZE > 0 else None
         self.is_trained = False
-        self.load_or_train_model()
+        self._unpublished_seed = False  # Serving a seed converted in memory (see _publish_seed)
+        self._last_check = time.monotonic()
+        self._swap_lock = threading.Lock()
+        self.status = 'loading'  # loading, training, ready, failed
+        self.ready = threading.Event()  # Set once loading or training has finished
+        self.load_or_train_model(background)
+    
+    def load_or_train_model(self, background=True):
+        """Load the saved model, or train one (in a background thread unless background=False)"""
+        # A process training right now holds the exclusive lock; don't wait for it here
+        with self._model_lock(exclusive=False, blocking=False) as locked:
+            loaded = locked and self.load_model()
+        if loaded:
+            if self._unpublished_seed:
+                self._publish_seed()
+            self.ready.set()
+            return
+        
+        self.status = 'training'
+        if background:
+            threading.Thread(target=self._bootstrap, name='model-bootstrap', daemon=True).start()
+        else:
+            self._bootstrap()
+    
+    @property
+    def vectorizer(self):
+        return self.model.vectorizer if self.model else None
+    
+    @property
+    def classifier(self):
+        return self.model.classifier if self.model else None
     
-    def load_or_train_model(self):
-        """Load existing model or train new one"""
+    @property
+    def model_version(self):
+        return self.model.version if self.model else None
+    
+    def load_model(self):
+        """
+        Load the published model version, else the seed model; returns False if neither is readable
+        
+        Arrays are memory-mapped read-only, so worker processes share them
+        through the page cache instead of each holding a copy
+        """
+        version = published_version(self.model_dir, self.engine)
+        if version and not self._stale_seed_version(version) and self._load(
+                os.path.join(self.model_dir, version, 'vectorizer.pkl'),
+                os.path.join(self.model_dir, version, 'classifier.pkl'), version):
+            return True
+        return self._load(self.vectorizer_path, self.classifier_path, SEED_MODEL_VERSION)
+    
+    def _stale_seed_version(self, version):
+        """Whether a version published by _publish_seed() was converted from seed files that have since been replaced"""
         try:
-            if os.path.exists('data/trained_models/vectorizer.pkl') and os.path.exists('data/trained_models/classifier.pkl'):
-                self.vectorizer = joblib.load('data/trained_models/vectorizer.pkl')
-                self.classifier = joblib.load('data/trained_models/classifier.pkl')
-                self.is_trained = True
-                print("✅ Pre-trained models loaded successfully!")
-            else:
-                self.train_model()
+            with open(os.path.join(self.model_dir, version, 'model.json')) as f:
+                seed_digest = json.load(f).get('seed_digest')
+            return seed_digest is not None and seed_digest != artifact_digest(self.vectorizer_path, self.classifier_path)
+        except (OSError, ValueError):
+            return False
+    
+    def _publish_seed(self):
+        """
+        Publish a seed model saved before forests were flattened as a version
+        in the memory-mappable layout, once, so workers map it instead of each
+        converting the seed into a private copy
+        """
+        with self._model_lock(exclusive=True, blocking=True):
+            # Another process may have published it while we waited for the lock
+            if self.load_model() and not self._unpublished_seed:
+                return
+            try:
+                seed_digest = artifact_digest(self.vectorizer_path, self.classifier_path)
+                save_model_version(self.vectorizer, self.classifier, self.model_dir, self.engine,
+                                   info={'source': SEED_MODEL_VERSION, 'seed_digest': seed_digest})
+            except OSError as e:
+                # Read-only model directory: keep serving the converted copy
+                print(f"⚠️ Could not publish the converted seed model: {e}")
+                return
+            self.load_model()
+    
+    def _load(self, vectorizer_path, classifier_path, version):
+        if not (os.path.exists(vectorizer_path) and os.path.exists(classifier_path)):
+            return False
+        try:
+            # Published versions are never rewritten; the seed model is, in place, so it is keyed by content
+            cache_key = f'{self.engine}:{version}'
+            if version == SEED_MODEL_VERSION:
+                cache_key += '-' + artifact_digest(vectorizer_path, classifier_path)
+            vectorizer = load_artifact(vectorizer_path)
+            saved = load_artifact(classifier_path)
+            # A forest saved before forests were flattened works, but every process keeps its own copy
+            classifier = serving_model(saved)
         except Exception as e:
-            print(f"⚠️ Error loading models: {e}. Training new models...")
-            self.train_model()
+            print(f"⚠️ Error loading models ({version}): {e}")
+            return False
+        self._activate(LoadedModel(vectorizer, classifier, version, cache_key))
+        self._unpublished_seed = version == SEED_MODEL_VERSION and classifier is not saved
+        print(f"✅ Pre-trained models loaded successfully! (version {version})")
+        return True
+    
+    def refresh(self, force=False):
+        """
+        Switch to a newly published model version without a restart
+        
+        Checks the CURRENT pointer at most every MODEL_CHECK_INTERVAL seconds
+        (always with force); returns True if the model was swapped
+        """
+        if not force and time.monotonic() - self._last_check < MODEL_CHECK_INTERVAL:
+            return False
+        # Still bootstrapping, or another thread is already switching
+        if not self.is_trained or not self._swap_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_check = time.monotonic()
+            version = published_version(self.model_dir, self.engine)
+            if version is None or version == self.model_version:
+                return False
+            return self._load(os.path.join(self.model_dir, version, 'vectorizer.pkl'),
+                              os.path.join(self.model_dir, version, 'classifier.pkl'), version)
+        finally:
+            self._swap_lock.release()
+    
+    def current_model(self):
+        """The LoadedModel to classify with (after a due refresh), or None while not ready"""
+        self.refresh()
+        return self.model
+    
+    def wait_until_ready(self, timeout=None):
+        """Block until the model is loaded or trained; returns False on timeout"""
+        return self.ready.wait(timeout)
+    
+    def _bootstrap(self):
+        """Train and save the model while holding the exclusive model lock"""
+        try:
+            with self._model_lock(exclusive=True, blocking=True):
+                # Another process may have trained the model while we waited for the lock
+                if not self.load_model():
+                    print(f"🏋️ Training new models ({self.engine})...")
+                    self.train_model()
+            if self._unpublished_seed:
+                self._publish_seed()
+        finally:
+            if not self.is_trained:
+                self.status = 'failed'
+            self.ready.set()
+    
+    def _activate(self, model):
+        """Start serving a LoadedModel (callers set ready once the model lock is released)"""
+        self.model = model
+        self.is_trained = True
+        self.status = 'ready'
+    
+    @contextmanager
+    def _model_lock(self, exclusive, blocking):
+        """Inter-process lock on the model directory; yields whether it was acquired"""
+        if fcntl is None:
+            yield True
+            return
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            lock_file = open(os.path.join(self.model_dir, '.lock'), 'a')
+        except OSError:
+            # Read-only model directory: nothing can be written, so nothing to guard
+            yield True
+            return
+        with lock_file:
+            flags = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | (0 if blocking else fcntl.LOCK_NB)
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
     
     def train_model(self):
         """Train the classification model with enhanced training data"""
         try:
-            # Enhanced training data with more examples
-            training_data = {
-                'texts': [
-                    # IT examples
-                    "python java programming software development web database sql cloud aws docker kubernetes backend frontend",
-                    "javascript react node.js web development full stack mobile app programming api rest",
-                    "data science machine learning python sql analysis visualization pandas numpy",
-                    "devops aws azure cloud infrastructure docker kubernetes ci cd jenkins",
-                    
-                    # HR examples
-                    "recruitment hiring talent acquisition HR management interviewing onboarding employee relations",
-                    "human resources payroll benefits compensation training development performance management",
-                    "recruiter sourcing screening candidates HR policies compliance diversity inclusion",
-                    
-                    # Finance examples
-                    "accounting finance budgeting financial analysis audit tax investment banking",
-                    "financial planning analysis fpa forecasting budgeting reporting excel",
-                    "accountant bookkeeping gaap financial statements audit tax preparation",
-                    
-                    # Marketing examples
-                    "marketing sales digital social media SEO content strategy advertising branding",
-                    "digital marketing google analytics seo sem social media content creation",
-                    "brand management product marketing market research campaign management",
-                    
-                    # Engineering examples
-                    "engineering mechanical electrical civil design construction manufacturing",
-                    "mechanical engineer design cad solidworks manufacturing production",
-                    "civil engineer construction project management structural design",
-                    
-                    # Operations examples
-                    "operations supply chain logistics management production quality control",
-                    "supply chain logistics inventory management procurement operations",
-                    "project management operations process improvement lean manufacturing",
-                    
-                    # Sales examples
-                    "sales business development client relationship negotiation deal closing",
-                    "account executive sales representative business development b2b sales",
-                    "sales manager team leadership revenue growth customer acquisition"
-                ],
-                'labels': [0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6, 6]
-            }
-            
-            X = self.vectorizer.fit_transform(training_data['texts'])
-            self.classifier.fit(X, training_data['labels'])
-            self.is_trained = True
+            # Fit fresh estimators so requests never see a half-trained model
+            vectorizer, classifier = fit_model(zip(TRAINING_DATA['texts'], TRAINING_DATA['labels']), self.engine)
             
+        except Exception as e:
+            print(f"❌ Error training model: {e}")
+            return
+        
+        # Unsaved models exist only in this process, so their predictions are never shared
+        cache_key = f'{self.engine}:{SEED_MODEL_VERSION}-{uuid.uuid4().hex[:16]}'
+        try:
             # Ensure directory exists
-            os.makedirs('data/trained_models', exist_ok=True)
+            os.makedirs(self.model_dir, exist_ok=True)
             
-            # Save models
-            joblib.dump(self.vectorizer, 'data/trained_models/vectorizer.pkl')
-            joblib.dump(self.classifier, 'data/trained_models/classifier.pkl')
+            # Save models (write-then-rename) in the form they are served in
+            classifier = serving_model(classifier)
+            save_artifact(vectorizer, self.vectorizer_path)
+            save_artifact(classifier, self.classifier_path)
+            cache_key = f'{self.engine}:{SEED_MODEL_VERSION}-{artifact_digest(self.vectorizer_path, self.classifier_path)}'
             
             print("✅ Model trained and saved successfully!")
             
         except Exception as e:
-            print(f"❌ Error training model: {e}")
-            self.is_trained = False
+            print(f"⚠️ Model trained but could not be saved: {e}")
+        
+        self._activate(LoadedModel(vectorizer, classifier, SEED_MODEL_VERSION, cache_key))
+    
+    def classify_resume(self, text, skills, model=None):
+        """Classify resume into department and status with enhanced logic (text may be a ResumeDocument)"""
+        return self.classify_resumes([text], [skills], model)[0]
     
-    def classify_resume(self, text, skills):
-        """Classify resume into department and status with enhanced logic"""
+    def classify_resumes(self, texts, skills_list, model=None):
+        """
+        Classify a batch of resumes with one vectorizer pass and one predict
+        
+        Args:
+            texts: Resume texts (or ResumeDocuments)
+            skills_list: Skills dictionary of each resume, in the same order
+            model: LoadedModel from current_model() to classify with, so the
+                caller knows which version answered (defaults to the current one)
+        Returns:
+            List of (status, department, ranking_score) tuples in input order
+        """
+        documents = [ResumeDocument.wrap(text) for text in texts]
+        if not documents:
+            return []
         try:
-            if not self.is_trained:
-                print("⚠️ Model not trained, using fallback classification")
-                return self.fallback_classification(skills, text)
+            model = model or self.current_model()
+            if model is None:
+                print(f"⚠️ Model not ready ({self.status}), using fallback classification")
+                return [self.fallback_classification(skills, document) for skills, document in zip(skills_list, documents)]
             
             # Create feature text from skills and resume content
-            skill_text = " ".join([skill for category in skills.values() for skill in category])
-            combined_text = text + " " + skill_text
+            combined_texts = [
+                document.text + " " + " ".join([skill for category in skills.values() for skill in category])
+                for skills, document in zip(skills_list, documents)
+            ]
             
-            # Transform and predict
-            X = self.vectorizer.transform([combined_text])
-            dept_idx = self.classifier.predict(X)[0]
-            department = self.departments[dept_idx] if dept_idx < len(self.departments) else 'General'
+            # Transform and predict the whole batch at once, skipping cached inputs
+            departments = self._predict_departments(model, combined_texts)
             
-            # Enhanced acceptance logic
-            status = self.determine_acceptance_status(skills, text)
+            # Enhanced acceptance logic and comprehensive ranking score
+            signals = self._batch_signals(skills_list, documents)
+            statuses = self._acceptance_statuses(signals)
+            ranking_scores = self._ranking_scores(signals)
             
-            # Calculate comprehensive ranking score
-            ranking_score = self.calculate_ranking_score(skills, text)
-            
-            return status, department, ranking_score
+            return list(zip(statuses, departments, ranking_scores))
             
         except Exception as e:
             print(f"❌ Classification error: {e}")
-            return self.fallback_classification(skills, text)
+            return [self.fallback_classification(skills, document) for skills, document in zip(skills_list, documents)]
     
-    def determine_acceptance_status(self, skills, text):
-        """Enhanced acceptance criteria"""
-        tech_skills = len(skills.get('Programming', [])) + len(skills.get('AI/ML', [])) + len(skills.get('Web Development', []))
-        total_skills = sum(len(skills[cat]) for cat in skills)
+    def _predict_departments(self, model, combined_texts):
+        """Department of each model input; only inputs missing from the prediction cache are predicted"""
+        if self.prediction_cache is None:
+            X = model.vectorizer.transform(combined_texts)
+            return [self._department_name(label) for label in model.classifier.predict(X)]
         
-        # Check for experience indicators
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = [int(year) for year in re.findall(year_pattern, text)]
-        has_experience = len(years) >= 2
-        
-        # Check for education indicators
-        has_education = any(degree in text.lower() for degree in ['bachelor', 'master', 'mba', 'ph.d', 'doctorate', 'degree'])
-        
-        # Enhanced acceptance rules
-        if total_skills >= 4:  # Reduced threshold for better acceptance
-            return "Accepted"
-        elif tech_skills >= 2 and has_experience:
-            return "Accepted"
-        elif has_education and total_skills >= 2:
-            return "Accepted"
-        elif total_skills >= 3:  # More lenient for diverse skills
-            return "Accepted"
-        else:
-            return "Rejected"
+        model_key = model.cache_key
+        text_hashes = [hashlib.sha256(text.encode('utf-8')).hexdigest() for text in combined_texts]
+        departments = self.prediction_cache.get_many(model_key, text_hashes)
+        missing = {text_hash: text for text_hash, text in zip(text_hashes, combined_texts) if text_hash not in departments}
+        if missing:
+            X = model.vectorizer.transform(list(missing.values()))
+            predicted = {
+                text_hash: self._department_name(label)
+                for text_hash, label in zip(missing, model.classifier.predict(X))
+            }
+            self.prediction_cache.put_many(model_key, predicted)
+            departments.update(predicted)
+        return [departments[text_hash] for text_hash in text_hashes]
     
-    def calculate_ranking_score(self, skills, text):
-        """Calculate comprehensive ranking score (0-100)"""
-        score = 0
+    def _department_name(self, label):
+        """Versions trained from history predict department names; the seed model indexes self.departments"""
+        if isinstance(label, str):
+            return str(label)
+        return self.departments[label] if label < len(self.departments) else 'General'
+    
+    def _batch_signals(self, skills_list, documents):
+        """Per-resume counts and flags the acceptance and ranking rules use, as numpy arrays"""
+        tech_categories = ('Programming', 'AI/ML', 'Web Development')
+        spans = [max(document.years) - min(document.years) if document.years else 0 for document in documents]
+        lowers = [document.lower for document in documents]
         
-        # Skills component (40 points max)
-        total_skills = sum(len(skills[cat]) for cat in skills)
-        score += min(total_skills * 4, 40)  # 4 points per skill, max 40
+        def contains(*keywords):
+            return np.array([any(keyword in lower for keyword in keywords) for lower in lowers], dtype=bool)
         
-        # Technical skills bonus (20 points max)
-        tech_skills = len(skills.get('Programming', [])) + len(skills.get('AI/ML', [])) + len(skills.get('Web Development', []))
-        score += min(tech_skills * 5, 20)  # 5 points per tech skill, max 20
+        return {
+            'total_skills': np.array([sum(len(skills[cat]) for cat in skills) for skills in skills_list], dtype=np.int64),
+            'tech_skills': np.array([sum(len(skills.get(cat, [])) for cat in tech_categories) for skills in skills_list], dtype=np.int64),
+            'year_count': np.array([len(document.years) for document in documents], dtype=np.int64),
+            'year_span': np.array(spans, dtype=np.int64),
+            'degree': contains('bachelor', 'master', 'mba', 'ph.d', 'doctorate', 'degree'),
+            'phd': contains('ph.d', 'doctorate'),
+            'masters': contains('master', 'mba'),
+            'bachelors': contains('bachelor', 'b.s.', 'b.a.'),
+            'diploma': contains('diploma', 'associate')
+        }
+    
+    def _acceptance_statuses(self, signals):
+        """Enhanced acceptance criteria, evaluated for the whole batch"""
+        total_skills = signals['total_skills']
+        has_experience = signals['year_count'] >= 2
         
-        # Experience component (20 points max)
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = [int(year) for year in re.findall(year_pattern, text)]
-        if years:
-            exp_years = max(years) - min(years)
-            score += min(exp_years * 4, 20)  # 4 points per year, max 20
+        accepted = (
+            (total_skills >= 4)  # Reduced threshold for better acceptance
+            | ((signals['tech_skills'] >= 2) & has_experience)
+            | (signals['degree'] & (total_skills >= 2))
+            | (total_skills >= 3)  # More lenient for diverse skills
+        )
+        return np.where(accepted, "Accepted", "Rejected").tolist()
+    
+    def _ranking_scores(self, signals):
+        """Comprehensive ranking scores (0-100), computed for the whole batch"""
+        # Skills component (40 points max): 4 points per skill
+        score = np.minimum(signals['total_skills'] * 4, 40)
         
-        # Education component (20 points max)
-        education_bonus = 0
-        text_lower = text.lower()
+        # Technical skills bonus (20 points max): 5 points per tech skill
+        score += np.minimum(signals['tech_skills'] * 5, 20)
         
-        if 'ph.d' in text_lower or 'doctorate' in text_lower:
-            education_bonus = 20
-        elif 'master' in text_lower or 'mba' in text_lower:
-            education_bonus = 15
-        elif 'bachelor' in text_lower or 'b.s.' in text_lower or 'b.a.' in text_lower:
-            education_bonus = 10
-        elif 'diploma' in text_lower or 'associate' in text_lower:
-            education_bonus = 5
+        # Experience component (20 points max): 4 points per year
+        score += np.minimum(signals['year_span'] * 4, 20)
         
-        score += education_bonus
+        # Education component (20 points max), highest degree mentioned wins
+        score += np.select(
+            [signals['phd'], signals['masters'], signals['bachelors'], signals['diploma']],
+            [20, 15, 10, 5],
+            default=0
+        )
         
-        return min(score, 100)
+        return np.minimum(score, 100).tolist()
+    
+    def determine_acceptance_status(self, skills, text):
+        """Enhanced acceptance criteria"""
+        signals = self._batch_signals([skills], [ResumeDocument.wrap(text)])
+        return self._acceptance_statuses(signals)[0]
+    
+    def calculate_ranking_score(self, skills, text):
+        """Calculate comprehensive ranking score (0-100)"""
+        signals = self._batch_signals([skills], [ResumeDocument.wrap(text)])
+        return self._ranking_scores(signals)[0]
     
     def detect_fraud(self, text, skills, experience):
         """Enhanced fraud detection with multiple checks"""
         findings = []
         score = 0
+        document = ResumeDocument.wrap(text)
         
         # AI-generated content detection (25 points)
         ai_patterns = [
@@ -193,7 +610,7 @@ class ResumeClassifier:
             r"\b(I am designed to|I am programmed to)\b"
         ]
         
-        text_lower = text.lower()
+        text_lower = document.lower
         for pattern in ai_patterns:
             if re.search(pattern, text_lower, re.IGNORECASE):
                 score += 25
@@ -216,8 +633,7 @@ class ResumeClassifier:
             findings.append("⚖️ Skills-to-experience ratio suspicious")
         
         # Date consistency check (30 points)
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = [int(year) for year in re.findall(year_pattern, text)]
+        years = document.years
         if len(years) >= 2:
             sorted_years = sorted(years)
             if years != sorted_years:
@@ -241,19 +657,13 @@ class ResumeClassifier:
             score += 15
             findings.append("🎓 Multiple education levels claimed")
         
-        # Contact information check (10 points)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-        emails = re.findall(email_pattern, text)
-        phones = re.findall(phone_pattern, text)
-        
-        if len(emails) == 0 and len(phones) == 0:
+        # Contact information check (10 points), reusing the parser's matches
+        if len(document.emails) == 0 and len(document.phones) == 0:
             score += 10
             findings.append("📞 Missing contact information")
         
         # Text quality check (10 points)
-        if len(text.strip()) < 100:
+        if len(document.text.strip()) < 100:
             score += 10
             findings.append("📝 Very short resume content")
         
@@ -263,15 +673,16 @@ class ResumeClassifier:
         """Fallback classification when ML model fails"""
         tech_skills = len(skills.get('Programming', [])) + len(skills.get('AI/ML', [])) + len(skills.get('Web Development', []))
         total_skills = sum(len(skills[cat]) for cat in skills)
+        text_lower = ResumeDocument.wrap(text).lower
         
         # Simple rule-based department assignment
         if tech_skills >= 2:
             department = "IT"
         elif len(skills.get('Soft Skills', [])) >= 3:
             department = "HR"
-        elif any(finance in text.lower() for finance in ['finance', 'accounting', 'banking']):
+        elif any(finance in text_lower for finance in ['finance', 'accounting', 'banking']):
             department = "Finance"
-        elif any(marketing in text.lower() for marketing in ['marketing', 'sales', 'advertising']):
+        elif any(marketing in text_lower for marketing in ['marketing', 'sales', 'advertising']):
             department = "Marketing"
         else:
             department = "General"
@@ -289,6 +700,7 @@ if __name__ == "__main__":
     print("🧪 Testing Resume Classifier...")
     
     classifier = ResumeClassifier()
+    classifier.wait_until_ready()
     
     # Test with sample data
     test_text = "Python developer with 5 years experience in web development and machine learning. Bachelor's degree in Computer Science."
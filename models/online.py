@@ -0,0 +1,97 @@
+"""
+Online Learning
+Keeps the 'online' department model up to date with partial_fit: hashed
+features need no fitted vocabulary, so each batch of newly confirmed
+analyses costs time and memory proportional to the batch, not to the
+history. Checkpoints are published as model versions, so running workers
+switch to them like to any retrained model
+"""
+
+import os
+import json
+
+import joblib
+
+from models.classifier import (
+    MODEL_DIR,
+    build_engine,
+    build_vectorizer,
+    prune_model_versions,
+    published_version,
+    save_model_version
+)
+
+ONLINE_ENGINE = 'online'
+
+# Publish a checkpoint after this many learned examples
+ONLINE_CHECKPOINT_EVERY = int(os.environ.get('ONLINE_CHECKPOINT_EVERY', 1000))
+
+
+class OnlineLearner:
+    def __init__(self, model_dir=MODEL_DIR, classes=None, checkpoint_every=ONLINE_CHECKPOINT_EVERY, keep=3):
+        """
+        Resume from the latest published online checkpoint, or start a new model
+
+        Args:
+            model_dir: Directory versions are published in
+            classes: Every label the model may learn; fixed by the first
+                partial_fit of a new model, later labels outside it are skipped
+            checkpoint_every: Examples learned between checkpoints
+            keep: Model versions kept on disk after each checkpoint
+        """
+        self.model_dir = model_dir
+        self.classes = sorted(set(classes)) if classes else None
+        self.checkpoint_every = checkpoint_every
+        self.keep = keep
+        self.vectorizer = build_vectorizer(ONLINE_ENGINE)
+        self.classifier = build_engine(ONLINE_ENGINE)
+        self.state = {'examples_seen': 0, 'last_analysis_id': 0}
+        self.since_checkpoint = 0
+
+        self.version = published_version(model_dir, ONLINE_ENGINE)
+        if self.version:
+            version_dir = os.path.join(model_dir, self.version)
+            # Loaded into memory, not memory-mapped: partial_fit updates the weights in place
+            self.classifier = joblib.load(os.path.join(version_dir, 'classifier.pkl'))
+            with open(os.path.join(version_dir, 'model.json')) as f:
+                info = json.load(f)
+            self.state.update({key: info[key] for key in self.state if key in info})
+
+    def partial_fit(self, texts, labels, last_analysis_id=None):
+        """
+        Update the model with one batch of (text, label) examples
+
+        Args:
+            last_analysis_id: Newest analysis in the batch, recorded so the
+                next run resumes after it
+
+        Returns:
+            Number of examples learned (labels the model does not know are skipped)
+        """
+        if hasattr(self.classifier, 'classes_'):
+            known = set(self.classifier.classes_)
+            examples = [(text, label) for text, label in zip(texts, labels) if label in known]
+            classes = None
+        else:
+            classes = self.classes or sorted(set(labels))
+            examples = [(text, label) for text, label in zip(texts, labels) if label in classes]
+
+        if examples:
+            X = self.vectorizer.transform([text for text, _ in examples])
+            self.classifier.partial_fit(X, [label for _, label in examples], classes=classes)
+
+        self.state['examples_seen'] += len(examples)
+        if last_analysis_id is not None:
+            self.state['last_analysis_id'] = max(self.state['last_analysis_id'], last_analysis_id)
+        self.since_checkpoint += len(examples)
+        if self.since_checkpoint and self.since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        return len(examples)
+
+    def checkpoint(self):
+        """Publish the model as a new online version; returns the version name"""
+        self.version = save_model_version(self.vectorizer, self.classifier, self.model_dir, ONLINE_ENGINE, info=self.state)
+        self.since_checkpoint = 0
+        prune_model_versions(self.model_dir, self.keep)
+        print(f"💾 Online checkpoint {self.version} ({self.state['examples_seen']} examples learned)")
+        return self.version
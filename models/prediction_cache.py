@@ -0,0 +1,153 @@
+"""
+Prediction Cache
+Remembers the department predicted for a classifier input, keyed by the
+model (engine and version) and the SHA-256 of the combined resume text, so
+re-analyses, department switches and repeated batch documents skip the
+vectorizer and the model. A bounded in-process LRU answers first; an
+optional SQLite table shares predictions between worker processes
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Entries kept per process (0 disables the cache)
+PREDICTION_CACHE_SIZE = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+# SQLite file shared by worker processes (empty for the in-process cache only)
+PREDICTION_CACHE_DB = os.environ.get('PREDICTION_CACHE_DB', '')
+# Rows kept in the shared table
+PREDICTION_CACHE_DB_SIZE = int(os.environ.get('PREDICTION_CACHE_DB_SIZE', 100000))
+
+# Keys per SQL statement, below SQLite's bound parameter limit
+SQL_BATCH = 500
+
+
+class PredictionCache:
+    def __init__(self, max_size=PREDICTION_CACHE_SIZE, db_path=PREDICTION_CACHE_DB, db_max_size=PREDICTION_CACHE_DB_SIZE):
+        """
+        Args:
+            max_size: Entries kept in this process's LRU
+            db_path: Optional SQLite file shared between processes
+            db_max_size: Rows kept in the shared table (least recently used are evicted)
+        """
+        self.max_size = max_size
+        self.db_path = db_path
+        self.db_max_size = db_max_size
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0, 'shared_evictions': 0}
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+        self._inserts_since_eviction = 0
+
+    def get_many(self, model_key, text_hashes):
+        """Cached departments for the given text hashes, as {text_hash: department}"""
+        found = {}
+        with self._lock:
+            for text_hash in text_hashes:
+                key = (model_key, text_hash)
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[text_hash] = self.entries[key]
+            self.stats['hits'] += len(found)
+
+        missing = [text_hash for text_hash in dict.fromkeys(text_hashes) if text_hash not in found]
+        if missing and self.db_path:
+            shared = self._shared_get(model_key, missing)
+            self._remember(model_key, shared)
+            found.update(shared)
+            with self._lock:
+                self.stats['shared_hits'] += len(shared)
+
+        with self._lock:
+            self.stats['misses'] += len(set(text_hashes) - set(found))
+        return found
+
+    def put_many(self, model_key, predictions):
+        """Store {text_hash: department} predictions of one model"""
+        self._remember(model_key, predictions)
+        if predictions and self.db_path:
+            self._shared_put(model_key, predictions)
+
+    def summary(self):
+        """Counters for /api/cache/stats"""
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['shared_hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                size=len(self.entries),
+                max_size=self.max_size,
+                shared=bool(self.db_path),
+                hit_ratio=round((self.stats['hits'] + self.stats['shared_hits']) / lookups, 4) if lookups else 0.0
+            )
+
+    def _remember(self, model_key, predictions):
+        with self._lock:
+            for text_hash, department in predictions.items():
+                self.entries[(model_key, text_hash)] = department
+                self.entries.move_to_end((model_key, text_hash))
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _db(self):
+        """This process's connection to the shared table (reopened after a fork)"""
+        if self._connection is None or self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS prediction_cache ('
+                'model_key TEXT NOT NULL, text_hash TEXT NOT NULL, department TEXT NOT NULL, '
+                'used_at REAL NOT NULL, PRIMARY KEY (model_key, text_hash))'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_prediction_cache_used_at ON prediction_cache (used_at)')
+            self._connection, self._connection_pid = connection, os.getpid()
+        return self._connection
+
+    def _shared_get(self, model_key, text_hashes):
+        found = {}
+        try:
+            with self._lock:
+                connection = self._db()
+                now = time.time()
+                for start in range(0, len(text_hashes), SQL_BATCH):
+                    batch = text_hashes[start:start + SQL_BATCH]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = connection.execute(
+                        f'SELECT text_hash, department FROM prediction_cache WHERE model_key = ? AND text_hash IN ({placeholders})',
+                        [model_key, *batch]
+                    ).fetchall()
+                    if rows:
+                        connection.execute(
+                            f'UPDATE prediction_cache SET used_at = ? WHERE model_key = ? AND text_hash IN ({placeholders})',
+                            [now, model_key, *batch]
+                        )
+                    found.update(rows)
+        except sqlite3.Error as e:
+            # The shared table is an optimization; fall back to predicting
+            print(f"⚠️ Prediction cache read failed: {e}")
+        return found
+
+    def _shared_put(self, model_key, predictions):
+        try:
+            with self._lock:
+                connection = self._db()
+                now = time.time()
+                connection.executemany(
+                    'INSERT OR REPLACE INTO prediction_cache (model_key, text_hash, department, used_at) VALUES (?, ?, ?, ?)',
+                    [(model_key, text_hash, department, now) for text_hash, department in predictions.items()]
+                )
+                # Trim now and then rather than on every write
+                self._inserts_since_eviction += len(predictions)
+                if self._inserts_since_eviction >= max(1, self.db_max_size // 100):
+                    self._inserts_since_eviction = 0
+                    evicted = connection.execute(
+                        'DELETE FROM prediction_cache WHERE rowid IN ('
+                        'SELECT rowid FROM prediction_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)',
+                        (self.db_max_size,)
+                    ).rowcount
+                    self.stats['shared_evictions'] += max(0, evicted)
+        except sqlite3.Error as e:
+            print(f"⚠️ Prediction cache write failed: {e}")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Retrain the department classifier from analysis history
+Streams shortlisted analyses and their cached extracted text out of the
+database in chunks, fits the configured engine on every core and publishes
+the result as data/trained_models/<version>/. Running workers switch to the
+new version at their next model check, without a restart
+
+With --online only the analyses added since the last online checkpoint are
+learned, one chunk at a time with partial_fit (run it nightly, or as often
+as new analyses should be picked up)
+
+With --features the FeatureExtractor TF-IDF and count vectorizers are
+refitted on the same history and saved next to the model versions; with
+--online as well, only their IDF weights are updated with the new analyses
+
+Usage: python retrain.py [--engine NAME | --online] [--features] [--database-uri URI] [--chunk-size N] [--jobs N] [--min-examples N] [--keep N]
+"""
+
+import sys
+import time
+import zlib
+import argparse
+
+from app import create_app, db, ResumeAnalysis, ExtractedText
+from config.departments import get_all_departments
+from models.classifier import (
+    CLASSIFIER_ENGINE,
+    ENGINES,
+    MODEL_DIR,
+    fit_model,
+    prune_model_versions,
+    save_model_version
+)
+from models.online import OnlineLearner, ONLINE_CHECKPOINT_EVERY
+from utils.feature_extractor import FeatureExtractor
+
+
+def labeled_documents(decision, after_id=0):
+    """
+    Distinct (content_hash, department) pairs of analyses with the given final
+    decision, with the id of the first such analysis (first_id)
+
+    With after_id only pairs first seen after that analysis are returned; the
+    older rows are looked up through the dedupe index, so the query reads the
+    new rows only
+    """
+    earlier = db.aliased(ResumeAnalysis)
+    return (
+        db.select(
+            db.func.min(ResumeAnalysis.id).label('first_id'),
+            ResumeAnalysis.content_hash,
+            ResumeAnalysis.department
+        )
+        .where(
+            ResumeAnalysis.id > after_id,
+            ResumeAnalysis.final_decision == decision,
+            ResumeAnalysis.content_hash.isnot(None),
+            ResumeAnalysis.department.isnot(None),
+            ResumeAnalysis.department != '',
+            ~db.select(earlier.id).where(
+                earlier.content_hash == ResumeAnalysis.content_hash,
+                earlier.department == ResumeAnalysis.department,
+                earlier.final_decision == decision,
+                earlier.id <= after_id
+            ).exists()
+        )
+        .group_by(ResumeAnalysis.content_hash, ResumeAnalysis.department)
+        .subquery()
+    )
+
+
+def count_examples(decision):
+    """Training examples per department (only documents whose extracted text is cached)"""
+    labeled = labeled_documents(decision)
+    rows = db.session.execute(
+        db.select(labeled.c.department, db.func.count())
+        .join(ExtractedText, ExtractedText.content_hash == labeled.c.content_hash)
+        .group_by(labeled.c.department)
+    )
+    return dict(rows.all())
+
+
+def iter_history_chunks(decision, chunk_size, after_id=0):
+    """Yield lists of up to chunk_size (first_id, text, department) examples in analysis order"""
+    labeled = labeled_documents(decision, after_id)
+    result = db.session.execute(
+        db.select(labeled.c.first_id, ExtractedText.compressed_text, labeled.c.department)
+        .join(labeled, labeled.c.content_hash == ExtractedText.content_hash)
+        .order_by(labeled.c.first_id),
+        execution_options={'yield_per': chunk_size}
+    )
+    for rows in result.partitions():
+        yield [
+            (first_id, zlib.decompress(compressed_text).decode('utf-8'), department)
+            for first_id, compressed_text, department in rows
+        ]
+
+
+def iter_history(decision, chunk_size):
+    """Yield (text, department) examples, fetching chunk_size rows from the database at a time"""
+    for chunk in iter_history_chunks(decision, chunk_size):
+        for _, text, department in chunk:
+            yield text, department
+
+
+def learn_online(args):
+    """Update the online model with the analyses added since its last checkpoint"""
+    learner = OnlineLearner(args.model_dir, classes=get_all_departments(),
+                            checkpoint_every=args.checkpoint_every, keep=args.keep)
+    after_id = learner.state['last_analysis_id']
+    print(f"📈 Online model {learner.version or '(new)'}: learning analyses after #{after_id}")
+
+    extractor = FeatureExtractor(args.model_dir) if args.features else None
+    if extractor:
+        # The vectorizers may have been refitted separately; read from the older of the two
+        print(f"📈 Feature vectorizers: updating IDF with analyses after #{extractor.last_analysis_id}")
+        after_id = min(after_id, extractor.last_analysis_id)
+
+    start = time.perf_counter()
+    learned = 0
+    for chunk in iter_history_chunks(args.decision, args.chunk_size, after_id):
+        new = [(text, department) for first_id, text, department in chunk if first_id > learner.state['last_analysis_id']]
+        learned += learner.partial_fit(
+            [text for text, _ in new], [department for _, department in new], last_analysis_id=chunk[-1][0]
+        )
+        if extractor:
+            extractor.update_idf(
+                [text for first_id, text, _ in chunk if first_id > extractor.last_analysis_id], last_analysis_id=chunk[-1][0]
+            )
+    if learner.since_checkpoint:
+        learner.checkpoint()
+    if extractor and extractor.is_fitted:
+        extractor.save()
+        print(f"💾 Feature vectorizers updated ({extractor.document_count} documents)")
+    print(f"✅ Learned {learned} examples in {time.perf_counter() - start:.1f}s (model version {learner.version or 'none'})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--engine', default=CLASSIFIER_ENGINE, choices=sorted(ENGINES), help='Department model to train')
+    parser.add_argument('--online', action='store_true', help='Update the online model with new analyses only')
+    parser.add_argument('--checkpoint-every', type=int, default=ONLINE_CHECKPOINT_EVERY,
+                        help='Examples learned between online checkpoints')
+    parser.add_argument('--features', action='store_true', help='Also refit (or with --online, update) the feature vectorizers')
+    parser.add_argument('--database-uri', help="Database to read (defaults to the app's)")
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Where versions are published')
+    parser.add_argument('--decision', default='Shortlisted', help='Final decision of the analyses to learn from')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Rows fetched from the database at a time')
+    parser.add_argument('--jobs', type=int, default=-1, help='Cores used for training (-1 for all)')
+    parser.add_argument('--min-examples', type=int, default=50, help='Refuse to train on fewer examples')
+    parser.add_argument('--keep', type=int, default=3, help='Model versions kept on disk')
+    args = parser.parse_args()
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database_uri} if args.database_uri else None)
+    if args.online:
+        with app.app_context():
+            learn_online(args)
+        return
+
+    with app.app_context():
+        counts = count_examples(args.decision)
+        total = sum(counts.values())
+        print(f"📚 {total} examples across {len(counts)} departments: " +
+              ', '.join(f"{department} {count}" for department, count in sorted(counts.items())))
+        if total < args.min_examples or len(counts) < 2:
+            print(f"❌ Need at least {args.min_examples} examples from 2 or more departments")
+            sys.exit(1)
+
+        print(f"🏋️ Training {args.engine}...")
+        # Recorded so `--online` runs continue after the analyses learned here
+        last_analysis_id = db.session.scalar(db.select(db.func.max(ResumeAnalysis.id)))
+        start = time.perf_counter()
+        vectorizer, classifier = fit_model(iter_history(args.decision, args.chunk_size), args.engine, args.jobs)
+        seconds = time.perf_counter() - start
+
+        if args.features:
+            extractor = FeatureExtractor(None).fit(
+                (text for text, _ in iter_history(args.decision, args.chunk_size)), last_analysis_id
+            )
+            extractor.save(args.model_dir)
+            print(f"💾 Feature vectorizers fitted on {extractor.document_count} documents")
+
+    version = save_model_version(vectorizer, classifier, args.model_dir, args.engine, info={
+        'trained_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'training_seconds': round(seconds, 3),
+        'decision': args.decision,
+        'examples': counts,
+        'examples_seen': total,
+        'last_analysis_id': last_analysis_id
+    })
+    print(f"✅ Published model version {version} ({seconds:.1f}s)")
+
+    removed = prune_model_versions(args.model_dir, args.keep)
+    if removed:
+        print(f"🧹 Removed old versions: {', '.join(removed)}")
+
+
+if __name__ == "__main__":
+    main()
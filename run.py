@@ -6,7 +6,7 @@ Use this for deployment instead of app.py
 
 import os
 import sys
-from app import app
+from app import create_app, has_pending_jobs, start_job_workers, warm_up
 
 if __name__ == '__main__':
     # Production configuration
@@ -20,6 +20,16 @@ if __name__ == '__main__':
     print(f"🐛 Debug: {debug_mode}")
     print("=" * 50)
     
+    app = create_app()
+    
+    # Load the parser, classifier and ranker before the first request
+    warm_up()
+    
+    # Resume analysis jobs left over from a previous run
+    with app.app_context():
+        if has_pending_jobs():
+            start_job_workers()
+    
     app.run(
         host=host,
         port=port,
@@ -9,6 +9,8 @@ import os
 import sqlite3
 import tempfile
 import shutil
+import subprocess
+from contextlib import contextmanager
 from datetime import datetime
 
 # Add current directory to Python path
@@ -25,6 +27,36 @@ def print_status(message, status="INFO"):
     }
     print(f"{colors.get(status, '')}[{status}] {message}{colors['END']}")
 
+@contextmanager
+def temp_app(**config):
+    """Build the app on a temporary database, upload folder and stores, all removed afterwards"""
+    from app import create_app, db
+    
+    workdir = tempfile.mkdtemp()
+    settings = {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'app.db'),
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'FEATURE_STORE_DIR': os.path.join(workdir, 'feature_store'),
+        'CORPUS_MATRIX_DIR': os.path.join(workdir, 'corpus_matrix'),
+        'TESTING': True
+    }
+    settings.update(config)
+    os.makedirs(settings['UPLOAD_FOLDER'], exist_ok=True)
+    app = create_app(settings)
+    try:
+        yield app
+    finally:
+        # Let queued background writes land before their directories are removed
+        import app as app_module
+        app_module._upload_writer.submit(lambda: None).result()
+        app_module._analysis_writer.submit(lambda: None).result()
+        for compaction in list(app_module._compactions.values()):
+            compaction.result()
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        shutil.rmtree(workdir, ignore_errors=True)
+
 def test_imports():
     """Test if all required modules can be imported"""
     print_status("Testing module imports...", "INFO")
@@ -82,14 +114,40 @@ def test_custom_modules():
     
     return all_custom_ok
 
+def test_lazy_startup():
+    """Test that importing the app and creating it defers the heavy dependencies"""
+    print_status("Testing lazy start-up...", "INFO")
+    
+    try:
+        heavy_modules = ['sklearn', 'pandas', 'numpy', 'pdfminer', 'PyPDF2', 'docx']
+        script = (
+            "import sys, app\n"
+            "flask_app = app.create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})\n"
+            "health = flask_app.test_client().get('/health').get_json()\n"
+            "assert health['model_status'] == 'not_loaded' and app._pipeline is None, health\n"
+            f"print(','.join(name for name in {heavy_modules!r} if name in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+        loaded = result.stdout.strip()
+        if loaded:
+            print_status(f"❌ Imported at start-up: {loaded}", "ERROR")
+            return False
+        
+        print_status("✅ Heavy dependencies load on first use; /health does not load them", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Lazy start-up test failed: {e}", "ERROR")
+        return False
+
 def test_database():
     """Test database connection and operations"""
     print_status("Testing database...", "INFO")
     
     try:
-        from app import app, db, ResumeAnalysis
+        from app import db, ResumeAnalysis
         
-        with app.app_context():
+        with temp_app() as app, app.app_context():
             # Create all tables
             db.create_all()
             print_status("✅ Database tables created", "SUCCESS")
@@ -215,6 +273,12 @@ def test_classifier():
         status, department, score = classifier.classify_resume(test_text, test_skills)
         fraud_score, findings = classifier.detect_fraud(test_text, test_skills, test_experience)
         
+        # One vectorizer pass for the batch gives the same answers as one resume at a time
+        batch = classifier.classify_resumes([test_text, "HR recruiter"], [test_skills, {'Soft Skills': ['communication']}])
+        if batch != [(status, department, score), classifier.classify_resume("HR recruiter", {'Soft Skills': ['communication']})]:
+            print_status(f"❌ Batch classification differs: {batch}", "ERROR")
+            return False
+        
         print_status(f"✅ Classification: {status} | {department} | Score: {score}", "SUCCESS")
         print_status(f"✅ Fraud detection: {fraud_score}%", "SUCCESS")
         
@@ -227,6 +291,500 @@ def test_classifier():
         print_status(f"❌ Classifier test failed: {e}", "ERROR")
         return False
 
+def test_model_bootstrap():
+    """Test that a missing model is trained in the background and saved atomically"""
+    print_status("Testing model bootstrap...", "INFO")
+    
+    try:
+        from models.classifier import ResumeClassifier
+        
+        model_dir = tempfile.mkdtemp()
+        classifier = ResumeClassifier(model_dir=model_dir)
+        
+        # Rule-based answers are served until training finishes
+        status, department, score = classifier.classify_resume("Python developer", {'Programming': ['python']})
+        if not classifier.wait_until_ready(timeout=60) or not classifier.is_trained:
+            print_status(f"❌ Model not ready: {classifier.status}", "ERROR")
+            return False
+        
+        # A second process-like load maps the saved arrays instead of copying them
+        import numpy as np
+        reloaded = ResumeClassifier(model_dir=model_dir)
+        if not reloaded.is_trained or not isinstance(reloaded.classifier.threshold, np.memmap):
+            print_status("❌ Saved model was not memory-mapped on load", "ERROR")
+            return False
+        
+        saved = sorted(os.listdir(model_dir))
+        shutil.rmtree(model_dir, ignore_errors=True)
+        if [name for name in saved if not name.startswith('.')] != ['classifier.pkl', 'vectorizer.pkl'] or any(name.endswith('.tmp') for name in saved):
+            print_status(f"❌ Unexpected model artifacts: {saved}", "ERROR")
+            return False
+        
+        # A seed saved as a plain forest is converted once and published in the mappable layout
+        import joblib
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from models.classifier import TRAINING_DATA, published_version
+        model_dir = tempfile.mkdtemp()
+        vectorizer = TfidfVectorizer().fit(TRAINING_DATA['texts'])
+        forest = RandomForestClassifier(n_estimators=5, random_state=0)
+        forest.fit(vectorizer.transform(TRAINING_DATA['texts']), TRAINING_DATA['labels'])
+        joblib.dump(vectorizer, os.path.join(model_dir, 'vectorizer.pkl'))
+        joblib.dump(forest, os.path.join(model_dir, 'classifier.pkl'))
+        first = ResumeClassifier(model_dir=model_dir)
+        second = ResumeClassifier(model_dir=model_dir)
+        version = published_version(model_dir)
+        shutil.rmtree(model_dir, ignore_errors=True)
+        if version is None or (first.model_version, second.model_version) != (version, version) \
+                or not isinstance(second.classifier.threshold, np.memmap):
+            print_status(f"❌ Legacy seed served as {second.model_version}, published {version}", "ERROR")
+            return False
+        
+        print_status("✅ Model trained in the background and saved", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Model bootstrap test failed: {e}", "ERROR")
+        return False
+
+def test_classifier_engines():
+    """Test that every configurable classifier engine trains, saves and reloads"""
+    print_status("Testing classifier engines...", "INFO")
+    
+    try:
+        from models.classifier import ResumeClassifier, ENGINES
+        
+        model_dir = tempfile.mkdtemp()
+        for engine in ENGINES:
+            ResumeClassifier(model_dir=model_dir, background=False, engine=engine)
+            reloaded = ResumeClassifier(model_dir=model_dir, background=False, engine=engine)
+            status, department, score = reloaded.classify_resume("recruiter hiring onboarding payroll", {})
+            if department != 'HR':
+                print_status(f"❌ {engine} predicted {department}", "ERROR")
+                shutil.rmtree(model_dir, ignore_errors=True)
+                return False
+        shutil.rmtree(model_dir, ignore_errors=True)
+        
+        print_status(f"✅ Engines: {', '.join(ENGINES)}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Classifier engine test failed: {e}", "ERROR")
+        return False
+
+def test_model_versions():
+    """Test that a published model version is picked up without a restart"""
+    print_status("Testing model versions...", "INFO")
+    
+    try:
+        import stat
+        from models.artifacts import UMASK
+        from models.classifier import ResumeClassifier, fit_model, save_model_version, prune_model_versions
+        
+        model_dir = tempfile.mkdtemp()
+        classifier = ResumeClassifier(model_dir=model_dir, background=False)
+        examples = [("python java docker kubernetes", "Software Engineering"), ("recruitment payroll onboarding", "Human Resources")] * 5
+        
+        # Versions published one after another; only the newest survives pruning
+        first = save_model_version(*fit_model(iter(examples)), model_dir=model_dir)
+        latest = save_model_version(*fit_model(iter(examples)), model_dir=model_dir)
+        removed = prune_model_versions(model_dir, keep=1)
+        
+        # Published with the usual umask permissions, readable by workers running as another user
+        published = [os.path.join(model_dir, latest), os.path.join(model_dir, latest, 'classifier.pkl'),
+                     os.path.join(model_dir, 'CURRENT')]
+        modes = [stat.S_IMODE(os.stat(path).st_mode) for path in published]
+        expected_modes = [mode & ~UMASK for mode in (0o777, 0o666, 0o666)]
+        
+        swapped = classifier.refresh(force=True)
+        _, department, _ = classifier.classify_resume("payroll onboarding recruitment", {})
+        shutil.rmtree(model_dir, ignore_errors=True)
+        if modes != expected_modes:
+            print_status(f"❌ Published with modes {[oct(mode) for mode in modes]}", "ERROR")
+            return False
+        if not swapped or classifier.model_version != latest or removed != [first] or department != 'Human Resources':
+            print_status(f"❌ Serving {classifier.model_version} ({department}), removed {removed}", "ERROR")
+            return False
+        
+        print_status(f"✅ Switched from the seed model to version {latest}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Model version test failed: {e}", "ERROR")
+        return False
+
+def test_online_learning():
+    """Test that the online model learns batch by batch and resumes from its checkpoint"""
+    print_status("Testing online learning...", "INFO")
+    
+    try:
+        from models.online import OnlineLearner
+        from models.classifier import ResumeClassifier
+        
+        model_dir = tempfile.mkdtemp()
+        classes = ['Software Engineering', 'Human Resources']
+        learner = OnlineLearner(model_dir, classes=classes, checkpoint_every=4)
+        learner.partial_fit(["python docker kubernetes", "payroll recruitment onboarding"], classes, last_analysis_id=2)
+        learner.partial_fit(["java aws backend", "hiring interviewing benefits"], classes, last_analysis_id=4)
+        
+        resumed = OnlineLearner(model_dir)
+        classifier = ResumeClassifier(model_dir=model_dir, background=False, engine='online')
+        _, department, _ = classifier.classify_resume("recruitment payroll hiring", {})
+        shutil.rmtree(model_dir, ignore_errors=True)
+        if resumed.state != {'examples_seen': 4, 'last_analysis_id': 4} or classifier.model_version != learner.version or department != 'Human Resources':
+            print_status(f"❌ Resumed {resumed.state}, served {classifier.model_version} ({department})", "ERROR")
+            return False
+        
+        print_status("✅ Online model checkpointed and served", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Online learning test failed: {e}", "ERROR")
+        return False
+
+def test_prediction_cache():
+    """Test the bounded prediction LRU and its shared SQLite table"""
+    print_status("Testing prediction cache...", "INFO")
+    
+    try:
+        from models.artifacts import save_artifact
+        from models.classifier import ResumeClassifier, fit_model, serving_model
+        from models.prediction_cache import PredictionCache
+        
+        workdir = tempfile.mkdtemp()
+        db_path = os.path.join(workdir, 'predictions.db')
+        first = PredictionCache(max_size=2, db_path=db_path, db_max_size=2)
+        first.put_many('seed', {'a': 'IT', 'b': 'HR', 'c': 'Finance'})
+        
+        # Another process sees the shared rows; the oldest was evicted everywhere
+        second = PredictionCache(max_size=2, db_path=db_path)
+        found = second.get_many('seed', ['b', 'c', 'a'])
+        summary = first.summary()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if found != {'b': 'HR', 'c': 'Finance'} or summary['evictions'] != 1 or summary['shared_evictions'] != 1:
+            print_status(f"❌ Found {found}, stats {summary}", "ERROR")
+            return False
+        
+        # Seed models are all version 'seed'; the cache key follows their content
+        model_dir = tempfile.mkdtemp()
+        trained = ResumeClassifier(model_dir=model_dir, background=False)
+        loaded = ResumeClassifier(model_dir=model_dir, background=False)
+        vectorizer, classifier = fit_model(iter([("payroll onboarding", "Human Resources"), ("python docker", "IT")] * 3))
+        save_artifact(vectorizer, loaded.vectorizer_path)
+        save_artifact(serving_model(classifier), loaded.classifier_path)
+        replaced = ResumeClassifier(model_dir=model_dir, background=False)
+        keys = [model.model.cache_key for model in (trained, loaded, replaced)]
+        shutil.rmtree(model_dir, ignore_errors=True)
+        if keys[0] != keys[1] or keys[1] == keys[2]:
+            print_status(f"❌ Seed model cache keys {keys}", "ERROR")
+            return False
+        
+        print_status(f"✅ Shared hit ratio {second.summary()['hit_ratio']}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Prediction cache test failed: {e}", "ERROR")
+        return False
+
+def test_feature_matrix():
+    """Test the batch feature matrix against the per-resume features"""
+    print_status("Testing feature matrix...", "INFO")
+    
+    try:
+        from utils.feature_extractor import FeatureExtractor, TEXT_FEATURE_COLUMNS, SKILL_FEATURE_COLUMNS
+        
+        extractor = FeatureExtractor()
+        texts = ["SKILLS\nPython, Java and machine learning. JavaScript 2020.", "", "Led business strategy"]
+        skills_list = [{'Programming': ['python', 'java']}, {}, {'Soft Skills': ['leadership']}]
+        matrix, columns = extractor.feature_matrix(texts, skills_list)
+        if matrix.shape != (3, len(TEXT_FEATURE_COLUMNS + SKILL_FEATURE_COLUMNS)) or columns != TEXT_FEATURE_COLUMNS + SKILL_FEATURE_COLUMNS:
+            print_status(f"❌ Unexpected matrix shape {matrix.shape}", "ERROR")
+            return False
+        
+        for row, (text, skills) in enumerate(zip(texts, skills_list)):
+            features = extractor.extract_text_features(text)
+            features.update(extractor.extract_skill_features(skills))
+            if [float(features.get(name, 0)) for name in columns] != matrix[row].tolist():
+                print_status(f"❌ Row {row} differs from extract_*_features", "ERROR")
+                return False
+        
+        # Substring counts as before the matrix: 'javascript' also counts as 'java'
+        density = matrix[0][columns.index('technical_keyword_density')]
+        if abs(density - 5 / len(texts[0].split())) > 1e-9:
+            print_status(f"❌ Technical keyword density {density}", "ERROR")
+            return False
+        
+        print_status(f"✅ {len(columns)} feature columns match the per-resume features", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Feature matrix test failed: {e}", "ERROR")
+        return False
+
+def test_feature_vectorizers():
+    """Test fitted feature vectorizers, incremental IDF and their persistence"""
+    print_status("Testing feature vectorizers...", "INFO")
+    
+    try:
+        import numpy as np
+        from utils.feature_extractor import FeatureExtractor
+        
+        workdir = tempfile.mkdtemp()
+        corpus = ["python developer docker aws", "hr recruiter payroll onboarding", "sales marketing strategy"] * 3
+        extractor = FeatureExtractor(workdir).fit(corpus)
+        first = extractor.get_tfidf_features(["python recruiter"]).toarray()
+        if not np.array_equal(first, extractor.get_tfidf_features(["python recruiter"]).toarray()):
+            print_status("❌ Transform is not stable between calls", "ERROR")
+            return False
+        
+        # Folding documents into the IDF matches a refit when the vocabulary is unchanged
+        extractor.update_idf(["python", "marketing"], last_analysis_id=7)
+        refit = FeatureExtractor(None).fit(corpus + ["python", "marketing"])
+        if not np.allclose(extractor.tfidf_vectorizer.idf_, refit.tfidf_vectorizer.idf_):
+            print_status("❌ Incremental IDF differs from a refit", "ERROR")
+            return False
+        
+        extractor.save()
+        reloaded = FeatureExtractor(workdir)
+        same = np.allclose(reloaded.get_tfidf_features(corpus).toarray(), extractor.get_tfidf_features(corpus).toarray())
+        shutil.rmtree(workdir, ignore_errors=True)
+        if not same or reloaded.document_count != 11 or reloaded.last_analysis_id != 7:
+            print_status("❌ Saved vectorizers did not reload", "ERROR")
+            return False
+        
+        print_status("✅ Vectorizers fitted once, IDF updated incrementally and reloaded", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Feature vectorizer test failed: {e}", "ERROR")
+        return False
+
+def test_feature_store():
+    """Test appending, loading and compacting the columnar feature store"""
+    print_status("Testing feature store...", "INFO")
+    
+    try:
+        import stat
+        from models.artifacts import UMASK
+        from utils.feature_store import FeatureStore, FEATURE_COLUMNS
+        
+        workdir = tempfile.mkdtemp()
+        store = FeatureStore(workdir, max_shards=0)
+        skills = {'Programming': ['python'], 'Soft Skills': ['leadership']}
+        experience = {'total_years': 6, 'positions': ['Senior Developer'], 'companies': ['Tech Co']}
+        education = {'highest_degree': 'Masters', 'degrees': ['Masters'], 'institutions': ['University']}
+        store.append([1, 2], ["SKILLS\nPython developer", ""], [skills, {}], [experience, {}], [education, {}])
+        store.append([3, 2], ["Re-analyzed", "Second analysis of 2"], [{}, skills], [{}, experience], [{}, education])
+        shard_mode = stat.S_IMODE(os.stat(os.path.join(workdir, store.shards()[0])).st_mode)
+        
+        # The newest row of an id wins, and compaction drops deleted analyses
+        table = store.load()
+        row = dict(zip(table.feature_columns, table.features[list(table.ids).index(2)]))
+        merged = store.compact(keep_ids=[1, 2])
+        compacted = store.load()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if list(table.ids) != [1, 3, 2] or row['experience_years'] != 6 or row['education_score'] != 3:
+            print_status(f"❌ Unexpected rows {list(table.ids)}: {row}", "ERROR")
+            return False
+        if shard_mode != 0o777 & ~UMASK:
+            print_status(f"❌ Shard directory created with mode {oct(shard_mode)}", "ERROR")
+            return False
+        if merged != 2 or list(compacted.ids) != [1, 2] or compacted.features.shape != (2, len(FEATURE_COLUMNS)):
+            print_status(f"❌ Compaction kept {list(compacted.ids)}", "ERROR")
+            return False
+        if compacted.skills[:, list(compacted.skill_columns).index('python')].tolist() != [1, 1]:
+            print_status("❌ Skill vectors were not stored", "ERROR")
+            return False
+        
+        # Tiered merging rewrites only the small newest shards; a tombstone keeps hiding the large one
+        workdir = tempfile.mkdtemp()
+        store = FeatureStore(workdir, max_shards=3)
+        store.append(list(range(1, 11)), [""] * 10, [{}] * 10, [{}] * 10, [{}] * 10)
+        large = store.shards()[0]
+        store.delete([5])
+        for analysis_id in (11, 12, 13):
+            store.append([analysis_id], [""], [{}], [{}], [{}])
+        due = store.compaction_due()
+        merged = store.compact(tiered=True)
+        shards = store.shards()
+        ids = list(store.load().ids)
+        shutil.rmtree(workdir, ignore_errors=True)
+        if not due or merged != 3 or len(shards) != 2 or shards[0] != large or ids != [1, 2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13]:
+            print_status(f"❌ Tiered merge of {merged} shards left {shards}: {ids}", "ERROR")
+            return False
+        
+        print_status(f"✅ {len(FEATURE_COLUMNS)} features and {len(compacted.skill_columns)} skills per analysis", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Feature store test failed: {e}", "ERROR")
+        return False
+
+def test_corpus_matrix():
+    """Test the persistent TF-IDF corpus matrix against a fresh TfidfTransformer"""
+    print_status("Testing corpus matrix...", "INFO")
+    
+    try:
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfTransformer
+        from utils.corpus_matrix import CorpusMatrix
+        
+        workdir = tempfile.mkdtemp()
+        corpus = CorpusMatrix(workdir, max_segments=0)
+        corpus.append([1, 2], ["Python developer with Django and SQL", "Registered nurse in patient care"])
+        corpus.append([3, 2], ["Data scientist using Python and pandas", "Accountant preparing tax returns"])
+        
+        # The newest row of an id wins, and IDF matches a transformer fitted on the same counts
+        table = corpus.load()
+        counts = corpus.vectorizer.transform(["Python developer with Django and SQL", "Data scientist using Python and pandas",
+                                              "Accountant preparing tax returns"])
+        expected = TfidfTransformer().fit_transform(counts)
+        similar = corpus.most_similar("Senior Python developer", top=2, table=table)
+        merged = corpus.compact(keep_ids=[1, 2])
+        compacted = corpus.counts()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if list(table.ids) != [1, 3, 2] or abs(table.matrix - expected).max() > 1e-6:
+            print_status(f"❌ Unexpected rows {list(table.ids)}", "ERROR")
+            return False
+        if [analysis_id for analysis_id, _ in similar] != [1, 3]:
+            print_status(f"❌ Unexpected similar analyses {similar}", "ERROR")
+            return False
+        if merged != 2 or list(compacted.ids) != [1, 2] or not isinstance(compacted.ids, np.memmap):
+            print_status(f"❌ Compaction kept {list(compacted.ids)}", "ERROR")
+            return False
+        
+        # Tiered merging rewrites only the small newest segments; a tombstone keeps hiding the large one
+        workdir = tempfile.mkdtemp()
+        corpus = CorpusMatrix(workdir, max_segments=3)
+        corpus.append(list(range(1, 11)), ["Python developer"] * 10)
+        large = corpus.shards()[0]
+        corpus.delete([5])
+        for analysis_id in (11, 12, 13):
+            corpus.append([analysis_id], ["Registered nurse"])
+        due = corpus.compaction_due()
+        merged = corpus.compact(tiered=True)
+        segments = corpus.shards()
+        ids = list(corpus.counts().ids)
+        shutil.rmtree(workdir, ignore_errors=True)
+        if not due or merged != 3 or len(segments) != 2 or segments[0] != large or ids != [1, 2, 3, 4, 6, 7, 8, 9, 10, 11, 12, 13]:
+            print_status(f"❌ Tiered merge of {merged} segments left {segments}: {ids}", "ERROR")
+            return False
+        
+        print_status(f"✅ {table.matrix.nnz} TF-IDF weights stored, compacted into {len(compacted.ids)} analyses", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Corpus matrix test failed: {e}", "ERROR")
+        return False
+
+def test_docx_text_boxes():
+    """Test that DOCX text boxes are read once, without dropping the text around them"""
+    print_status("Testing DOCX text boxes...", "INFO")
+    
+    try:
+        import io
+        import zipfile
+        from utils.docx_extractor import DOCXExtractor
+        
+        text_box = '<w:p><w:r><w:t>{}</w:t></w:r></w:p>'
+        document_xml = (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+            'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+            'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+            'xmlns:v="urn:schemas-microsoft-com:vml"><w:body>'
+            '<w:p><w:r><w:t xml:space="preserve">Before box </w:t></w:r><w:r><mc:AlternateContent>'
+            '<mc:Choice Requires="wps"><wps:txbx><w:txbxContent>' + text_box.format('Box text') +
+            '</w:txbxContent></wps:txbx></mc:Choice>'
+            '<mc:Fallback><v:textbox><w:txbxContent>' + text_box.format('Fallback copy') +
+            '</w:txbxContent></v:textbox></mc:Fallback>'
+            '</mc:AlternateContent></w:r><w:r><w:t xml:space="preserve"> after box</w:t></w:r></w:p>'
+            + text_box.format('Next paragraph') +
+            '</w:body></w:document>'
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', document_xml)
+        
+        lines = DOCXExtractor().extract(io.BytesIO(buffer.getvalue())).splitlines()
+        # The text box is a nested paragraph, so it comes out before the paragraph anchoring it
+        if lines != ['Box text', 'Before box  after box', 'Next paragraph']:
+            print_status(f"❌ Unexpected lines {lines}", "ERROR")
+            return False
+        
+        print_status("✅ Text box read once, anchoring paragraph kept", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ DOCX text box test failed: {e}", "ERROR")
+        return False
+
+def test_section_segmentation():
+    """Test that extractors only scan their own resume sections"""
+    print_status("Testing section segmentation...", "INFO")
+    
+    try:
+        from utils.parser import ResumeParser
+        
+        parser = ResumeParser()
+        sample_text = """
+        JANE SMITH
+        Data Analyst
+        
+        SUMMARY:
+        Analyst who graduated from State University
+        
+        EXPERIENCE:
+        Data Analyst - Retail Corp (2019-2023)
+        
+        EDUCATION:
+        Master of Science in Statistics - Tech Institute
+        """
+        
+        document = parser.document(sample_text)
+        expected = ['Contact', 'Summary', 'Experience', 'Education']
+        if list(document.sections) != expected:
+            print_status(f"❌ Sections found: {list(document.sections)}", "ERROR")
+            return False
+        
+        education = parser.extract_education(document)
+        if education['institutions'] != ['Master of Science in Statistics - Tech Institute']:
+            print_status(f"❌ Institutions scanned outside Education: {education['institutions']}", "ERROR")
+            return False
+        
+        print_status(f"✅ Segmented into {len(document.sections)} sections", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Section segmentation test failed: {e}", "ERROR")
+        return False
+
+def test_department_scoring():
+    """Test that scoring all departments at once matches per-department scoring"""
+    print_status("Testing all-department scoring...", "INFO")
+    
+    try:
+        from config.departments import DEPARTMENTS, calculate_eligibility_score, calculate_all_eligibility_scores
+        
+        candidate_data = {
+            'skills': ['python', 'django', 'sql', 'aws', 'machine learning', 'excel', 'communication', 'sql'],
+            'experience_years': 3.5,
+            'education': '{"degrees": ["B.Tech Computer Science"]}',
+            'work_experience': 'Senior Python Developer at Tech Solutions Inc. ' * 5
+        }
+        
+        all_scores = calculate_all_eligibility_scores(candidate_data)
+        for department in DEPARTMENTS:
+            if all_scores[department] != calculate_eligibility_score(candidate_data, department):
+                print_status(f"❌ Score mismatch for {department}", "ERROR")
+                return False
+        
+        print_status(f"✅ Scored {len(all_scores)} departments in one pass", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Department scoring test failed: {e}", "ERROR")
+        return False
+
 def test_file_operations():
     """Test file upload and processing operations"""
     print_status("Testing file operations...", "INFO")
@@ -264,6 +822,657 @@ def test_file_operations():
         print_status(f"❌ File operations test failed: {e}", "ERROR")
         return False
 
+def make_test_docx(path):
+    """Write a small DOCX resume for end-to-end tests"""
+    from docx import Document
+    
+    doc = Document()
+    for line in [
+        "JOHN DOE",
+        "Senior Software Engineer",
+        "Email: john.doe@email.com | Phone: (555) 123-4567",
+        "Senior Python Developer - Tech Solutions Inc. (2018-2023)",
+        "Bachelor of Science in Computer Science - State University",
+        "Skills: Python, Java, SQL, Docker, AWS, Git, React, Django"
+    ]:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+def test_job_queue():
+    """Test that queued analysis jobs are claimed and processed"""
+    print_status("Testing analysis job queue...", "INFO")
+    
+    try:
+        from app import db, AnalysisJob, claim_next_job, process_job, get_feature_store, get_corpus_matrix
+        
+        with temp_app() as app, app.app_context():
+            file_path = os.path.join(app.config['UPLOAD_FOLDER'], "queued_resume.docx")
+            make_test_docx(file_path)
+            job = AnalysisJob(
+                filename="queued_resume.docx",
+                original_filename="queued_resume.docx",
+                file_path=file_path,
+                department="Software Engineering"
+            )
+            db.session.add(job)
+            db.session.commit()
+            job_id = job.id
+            
+            claimed = claim_next_job()
+            if claimed is None or claimed.id != job_id:
+                print_status("❌ Queued job was not claimed", "ERROR")
+                return False
+            
+            process_job(claimed)
+            job = db.session.get(AnalysisJob, job_id)
+            if job.status != 'done' or not job.analysis_id:
+                print_status(f"❌ Job finished as {job.status}: {job.error}", "ERROR")
+                return False
+            print_status("✅ Job claimed and processed", "SUCCESS")
+            
+            # Job workers record analyses before the job is marked done
+            stored = (list(get_feature_store().load().ids), list(get_corpus_matrix().counts().ids))
+            if stored != ([job.analysis_id], [job.analysis_id]):
+                print_status(f"❌ Job analysis not recorded: {stored}", "ERROR")
+                return False
+            
+            # A run whose lease was taken over by another worker discards its result
+            from app import ResumeAnalysis
+            stale = AnalysisJob(filename="stale.docx", original_filename="stale.docx",
+                                file_path=file_path, department="Software Engineering")
+            db.session.add(stale)
+            db.session.commit()
+            claimed = claim_next_job()
+            claimed_id = claimed.id
+            with db.engine.begin() as connection:
+                connection.execute(db.update(AnalysisJob).where(AnalysisJob.id == claimed_id).values(attempts=AnalysisJob.attempts + 1))
+            analyses = ResumeAnalysis.query.count()
+            process_job(claimed)
+            stale = db.session.get(AnalysisJob, claimed_id)
+            if stale.status != 'running' or stale.analysis_id or ResumeAnalysis.query.count() != analyses:
+                print_status(f"❌ Reclaimed job was overwritten: {stale.status}", "ERROR")
+                return False
+            print_status("✅ Result of a reclaimed job discarded", "SUCCESS")
+        
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Job queue test failed: {e}", "ERROR")
+        return False
+
+def test_batch_pool_recovery():
+    """Test that a crashed or hung batch worker does not break later batches"""
+    print_status("Testing batch pool recovery...", "INFO")
+    
+    try:
+        import time
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from app import get_batch_executor, reset_batch_executor, submit_batch_task
+        
+        with temp_app(BATCH_WORKERS=1) as app, app.app_context():
+            # A worker killed mid-task breaks the pool; the next submission replaces it
+            crashed = get_batch_executor()
+            try:
+                crashed.submit(os._exit, 1).result(timeout=30)
+            except Exception:
+                pass
+            if submit_batch_task(pow, 2, 5).result(timeout=30) != 32 or get_batch_executor() is crashed:
+                print_status("❌ Broken pool was not replaced", "ERROR")
+                return False
+            
+            # A hung task is abandoned and its worker terminated
+            hung = get_batch_executor()
+            future = hung.submit(time.sleep, 60)
+            try:
+                future.result(timeout=1)
+                print_status("❌ Hung task did not time out", "ERROR")
+                return False
+            except FutureTimeoutError:
+                processes = list(hung._processes.values())
+                reset_batch_executor(hung)
+            for process in processes:
+                process.join(timeout=5)
+            if any(process.is_alive() for process in processes) or submit_batch_task(pow, 3, 2).result(timeout=30) != 9:
+                print_status("❌ Hung worker was not stopped", "ERROR")
+                return False
+            reset_batch_executor(get_batch_executor())
+        
+        print_status("✅ Crashed and hung workers replaced", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Batch pool recovery test failed: {e}", "ERROR")
+        return False
+
+def make_docx_bytes(lines):
+    """DOCX document bytes with one paragraph per line"""
+    import io
+    from docx import Document
+    
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def make_test_pdf(page_texts):
+    """Minimal PDF bytes with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    pdf += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    return pdf
+
+def make_zip(members):
+    """ZIP archive bytes of {name: data} members"""
+    import io
+    import zipfile
+    
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+SAMPLE_RESUME_LINES = [
+    "JOHN DOE",
+    "Senior Software Engineer",
+    "Email: john.doe@email.com | Phone: (555) 123-4567",
+    "Senior Python Developer - Tech Solutions Inc. (2018-2023)",
+    "Bachelor of Science in Computer Science - State University",
+    "Skills: Python, Java, SQL, Docker, AWS, Git, React, Django"
+]
+
+def upload_resume(client, data, filename, department='Software Engineering'):
+    """POST a document to /analyze and return the JSON response"""
+    import io
+    
+    return client.post('/analyze', data={
+        'department': department,
+        'file': (io.BytesIO(data), filename)
+    }, content_type='multipart/form-data').get_json()
+
+def test_batch_upload_limits():
+    """Test that batch ZIP limits are enforced up front and failures are reported per file"""
+    print_status("Testing batch upload limits...", "INFO")
+    
+    try:
+        from app import get_batch_executor, reset_batch_executor
+        
+        with temp_app(BATCH_WORKERS=1, BATCH_MAX_FILES=2, BATCH_MAX_BYTES=1024 * 1024) as app:
+            client = app.test_client()
+            
+            def post(members):
+                return client.post('/analyze/batch', data={
+                    'department': 'Software Engineering',
+                    'file': (make_zip(members), 'resumes.zip')
+                }, content_type='multipart/form-data')
+            
+            # Rejected from the archive directory: three documents, or 2MB that compresses to a few KB
+            too_many = post({f'resume{i}.pdf': b'%PDF' for i in range(3)})
+            too_large = post({'bomb.pdf': b'\0' * (2 * 1024 * 1024)})
+            if too_many.status_code != 400 or 'Too many files' not in too_many.get_json()['error']:
+                print_status(f"❌ File count not limited: {too_many.get_json()}", "ERROR")
+                return False
+            if too_large.status_code != 400 or 'too large' not in too_large.get_json()['error']:
+                print_status(f"❌ Uncompressed size not limited: {too_large.get_json()}", "ERROR")
+                return False
+            
+            # Unsupported files and documents without enough text fail on their own
+            short_docx = make_docx_bytes(["Hi"])
+            response = post({'notes.txt': b'not a resume', 'short.docx': short_docx})
+            results = {result['filename']: result for result in response.get_json()['results']}
+            with app.app_context():
+                reset_batch_executor(get_batch_executor())
+            if response.status_code != 200 or set(results) != {'notes.txt', 'short.docx'} \
+                    or any(result['success'] for result in results.values()):
+                print_status(f"❌ Unexpected batch results: {response.get_json()}", "ERROR")
+                return False
+        
+        print_status("✅ Limits checked before inflating, errors reported per file", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Batch upload limit test failed: {e}", "ERROR")
+        return False
+
+def test_analysis_deletion():
+    """Test that deleted analyses leave the feature store and corpus matrix"""
+    print_status("Testing analysis deletion...", "INFO")
+    
+    try:
+        import io
+        import app as app_module
+        
+        resumes = {
+            'python.docx': ["JOHN DOE", "Senior Python Developer - Tech Solutions Inc. (2018-2023)",
+                            "Skills: Python, Django, SQL, Docker, AWS, Git, React"],
+            'nurse.docx': ["JANE ROE", "Registered Nurse - City Hospital (2015-2023)",
+                           "Skills: patient care, triage, medication administration, communication"]
+        }
+        
+        with temp_app() as app:
+            client = app.test_client()
+            ids = {}
+            for name, lines in resumes.items():
+                response = client.post('/analyze', data={
+                    'department': 'Software Engineering',
+                    'file': (io.BytesIO(make_docx_bytes(lines)), name)
+                }, content_type='multipart/form-data')
+                ids[name] = response.get_json()['id']
+            client.delete(f"/delete/{ids['python.docx']}")
+            app_module._analysis_writer.submit(lambda: None).result()
+            
+            with app.app_context():
+                feature_store = app_module.get_feature_store()
+                corpus = app_module.get_corpus_matrix()
+                hidden = (list(feature_store.load().ids), list(corpus.counts().ids))
+                similar = corpus.most_similar("Python Django developer")
+                
+                # A reused id written after the deletion is visible again
+                corpus.append([ids['python.docx']], ["Python developer"])
+                feature_store.append([ids['python.docx']], ["Python developer"], [{}], [{}], [{}])
+                reused = list(corpus.counts().ids)
+                # Tombstones older than the newest merged shard are applied to every row, so they go
+                merged = (feature_store.compact(), corpus.compact())
+                leftover = [name for store in (feature_store, corpus) for name in os.listdir(store.directory)
+                            if name.startswith('tombstone-')]
+        
+        if hidden != ([ids['nurse.docx']], [ids['nurse.docx']]) or ids['python.docx'] in dict(similar):
+            print_status(f"❌ Deleted analysis still stored: {hidden}, similar {similar}", "ERROR")
+            return False
+        if sorted(reused) != sorted(ids.values()) or merged != (3, 3) or leftover:
+            print_status(f"❌ Compaction kept {reused}, merged {merged}, tombstones {leftover}", "ERROR")
+            return False
+        
+        print_status("✅ Deleted analysis hidden, dropped and its tombstones removed by compaction", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Analysis deletion test failed: {e}", "ERROR")
+        return False
+
+def test_dedupe_cloning():
+    """Test that re-uploaded documents clone the stored analysis instead of re-analyzing"""
+    print_status("Testing dedupe cloning...", "INFO")
+    
+    try:
+        from app import get_pipeline
+        
+        # Fallback classifications are never reused, so wait for the model
+        get_pipeline().classifier.wait_until_ready(120)
+        with temp_app() as app:
+            client = app.test_client()
+            # The counters are per process, so earlier tests may have counted hits already
+            hits_before = client.get('/api/cache/stats').get_json()['dedupe']['hits']
+            data = make_docx_bytes(SAMPLE_RESUME_LINES)
+            first = upload_resume(client, data, "resume.docx")
+            repeat = upload_resume(client, data, "resume_copy.docx")
+            other_department = upload_resume(client, data, "resume.docx", department="Data Science")
+            edited = upload_resume(client, make_docx_bytes(SAMPLE_RESUME_LINES + ["Certified Scrum Master"]), "resume.docx")
+            stats = client.get('/api/cache/stats').get_json()['dedupe']
+        
+        if first['cached'] or not repeat['cached'] or repeat['cached_from'] != first['id'] or repeat['id'] == first['id']:
+            print_status(f"❌ Repeat upload not cloned: {repeat.get('cached')} from {repeat.get('cached_from')}", "ERROR")
+            return False
+        if repeat['original_filename'] != "resume_copy.docx" or repeat['eligibility_score'] != first['eligibility_score']:
+            print_status("❌ Clone does not carry the new filename and the stored scores", "ERROR")
+            return False
+        # Another department or a changed document is a different analysis
+        if other_department['cached'] or edited['cached'] or stats['hits'] - hits_before != 1:
+            print_status(f"❌ Unexpected cache hits: {stats}", "ERROR")
+            return False
+        
+        print_status(f"✅ Repeat upload cloned from analysis {first['id']}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Dedupe cloning test failed: {e}", "ERROR")
+        return False
+
+def test_in_memory_uploads():
+    """Test that uploads are analyzed from memory and only optionally (and later) written to disk"""
+    print_status("Testing in-memory uploads...", "INFO")
+    
+    try:
+        import io
+        import app as app_module
+        from utils.parser import ResumeParser
+        
+        data = make_docx_bytes(SAMPLE_RESUME_LINES)
+        parser = ResumeParser()
+        text = parser.extract_text(data, '.docx')
+        if text != parser.extract_text(io.BytesIO(data), '.docx') or "JOHN DOE" not in text:
+            print_status("❌ Bytes and stream extraction differ", "ERROR")
+            return False
+        
+        saved = {}
+        for persist in (False, True):
+            with temp_app(PERSIST_UPLOADS=persist) as app:
+                analysis = upload_resume(app.test_client(), data, "resume.docx")
+                # Deferred writes go through one background thread
+                app_module._upload_writer.submit(lambda: None).result()
+                folder = app.config['UPLOAD_FOLDER']
+                saved[persist] = {name: open(os.path.join(folder, name), 'rb').read() for name in os.listdir(folder)}
+        
+        if saved[False] or list(saved[True]) != [analysis['filename']] or saved[True][analysis['filename']] != data:
+            print_status(f"❌ Files written: {[list(files) for files in saved.values()]}", "ERROR")
+            return False
+        
+        print_status("✅ Analyzed from memory; original kept only with PERSIST_UPLOADS", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ In-memory upload test failed: {e}", "ERROR")
+        return False
+
+def test_pdf_early_stop():
+    """Test that PDF extraction stops at the page and character budgets"""
+    print_status("Testing PDF early stop...", "INFO")
+    
+    try:
+        from utils.pdf_extractor import PDFExtractor
+        
+        pdf = make_test_pdf([f"Page {number} Python developer with SQL experience " * 2 for number in range(1, 5)])
+        complete = PDFExtractor(max_pages=None, max_chars=None).extract(pdf)
+        page_limited = PDFExtractor(max_pages=2, max_chars=None).extract(pdf)
+        # Each page has about 100 characters: the budget is crossed on page 2
+        char_limited = PDFExtractor(max_pages=None, max_chars=150).extract(pdf)
+        
+        if complete['pages_extracted'] != 4 or complete['truncated'] or [page['page'] for page in complete['pages']] != [1, 2, 3, 4]:
+            print_status(f"❌ Full extraction read {complete['pages_extracted']} pages", "ERROR")
+            return False
+        if (page_limited['page_count'], page_limited['pages_extracted'], page_limited['truncated']) != (4, 2, True) \
+                or "Page 3" in page_limited['text']:
+            print_status(f"❌ Page budget read {page_limited['pages_extracted']} pages", "ERROR")
+            return False
+        # Pages past the budget are never parsed, not just dropped afterwards
+        if len(char_limited['pages']) != 2 or not char_limited['truncated']:
+            print_status(f"❌ Character budget parsed {len(char_limited['pages'])} pages", "ERROR")
+            return False
+        
+        # Past the page threshold the pages are split across processes, with the same result
+        long_pdf = make_test_pdf([f"Page {number} Data analyst with Excel reporting " * 2 for number in range(1, 8)])
+        sequential = PDFExtractor(max_pages=None, max_chars=None, parallel_min_pages=None).extract(long_pdf)
+        parallel = PDFExtractor(max_pages=None, max_chars=None, parallel_min_pages=4).extract(long_pdf)
+        if not parallel['parallel'] or sequential['parallel'] or parallel['text'] != sequential['text'] \
+                or [page['page'] for page in parallel['pages']] != list(range(1, 8)):
+            print_status(f"❌ Parallel extraction read pages {[page['page'] for page in parallel['pages']]}", "ERROR")
+            return False
+        
+        print_status(f"✅ Stopped after 2 of 4 pages with {complete['backend']}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ PDF early stop test failed: {e}", "ERROR")
+        return False
+
+def test_extraction_sandbox():
+    """Test the sandbox timeout, cheaper-backend fallback, memory cap and recycling"""
+    print_status("Testing extraction sandbox...", "INFO")
+    
+    try:
+        import time
+        from unittest import mock
+        from utils.parser import ResumeParser
+        from utils.extraction_sandbox import ExtractionSandbox, ExtractionFailed
+        
+        # The sandbox child is forked, so it runs these stand-ins for pathological documents
+        def slow_default_backend(parser, source, file_ext):
+            if parser.pdf_extractor.backend == 'auto':
+                time.sleep(30)
+            return f"{parser.pdf_extractor.backend} text", {'backend': parser.pdf_extractor.backend}
+        
+        def hold_memory(parser, source, file_ext):
+            ballast = b'x' * (256 * 1024 * 1024)
+            time.sleep(30)
+            return str(len(ballast)), {}
+        
+        def report_pid(parser, source, file_ext):
+            return str(os.getpid()), {'backend': 'test'}
+        
+        outcomes = {}
+        with mock.patch.object(ResumeParser, 'extract_text_with_stats', slow_default_backend):
+            sandbox = ExtractionSandbox(timeout=0.5, fallback_timeout=5)
+            start = time.perf_counter()
+            outcomes['fallback'] = sandbox.extract(b'%PDF', '.pdf')
+            sandbox.close()
+            # DOCX has no cheaper backend to retry with
+            sandbox = ExtractionSandbox(timeout=0.5)
+            try:
+                sandbox.extract(b'PK', '.docx')
+            except ExtractionFailed as e:
+                outcomes['timeout'] = str(e)
+            outcomes['seconds'] = time.perf_counter() - start
+            sandbox.close()
+        
+        with mock.patch.object(ResumeParser, 'extract_text_with_stats', hold_memory):
+            sandbox = ExtractionSandbox(timeout=20, max_rss_mb=64)
+            try:
+                sandbox.extract(b'PK', '.docx')
+            except ExtractionFailed as e:
+                outcomes['memory'] = str(e)
+            outcomes['memory_child_alive'] = sandbox.process is not None
+            sandbox.close()
+        
+        with mock.patch.object(ResumeParser, 'extract_text_with_stats', report_pid):
+            sandbox = ExtractionSandbox(max_docs=2)
+            outcomes['pids'] = [sandbox.extract(b'PK', '.docx')[0] for _ in range(3)]
+            sandbox.close()
+        
+        text, stats = outcomes['fallback']
+        if text != "pypdf2 text" or not stats.get('sandbox_fallback'):
+            print_status(f"❌ No fallback to the cheaper backend: {outcomes['fallback']}", "ERROR")
+            return False
+        if 'too complex' not in outcomes.get('timeout', '') or outcomes['seconds'] > 15:
+            print_status(f"❌ Timeout not enforced: {outcomes.get('timeout')} after {outcomes['seconds']:.1f}s", "ERROR")
+            return False
+        if 'exceeded 64MB' not in outcomes.get('memory', '') or outcomes['memory_child_alive']:
+            print_status(f"❌ Memory cap not enforced: {outcomes.get('memory')}", "ERROR")
+            return False
+        pids = outcomes['pids']
+        if pids[0] != pids[1] or pids[1] == pids[2]:
+            print_status(f"❌ Worker not recycled after 2 documents: {pids}", "ERROR")
+            return False
+        
+        print_status("✅ Slow and oversized extractions killed, worker recycled", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Extraction sandbox test failed: {e}", "ERROR")
+        return False
+
+def test_extracted_text_reuse():
+    """Test that other departments and re-analyses start from the cached text, with no extraction"""
+    print_status("Testing extracted text reuse...", "INFO")
+    
+    try:
+        from unittest import mock
+        from utils.pipeline import ResumePipeline
+        
+        with temp_app() as app:
+            client = app.test_client()
+            # The counters are per process, so earlier tests may have counted hits already
+            hits_before = client.get('/api/cache/stats').get_json()['dedupe']['hits']
+            data = make_docx_bytes(SAMPLE_RESUME_LINES)
+            first = upload_resume(client, data, "resume.docx")
+            
+            # The document is neither on disk nor extracted again
+            with mock.patch.object(ResumePipeline, 'extract_text', side_effect=AssertionError("extracted again")):
+                other = upload_resume(client, data, "resume.docx", department="Data Science")
+                reanalyzed = client.post(f"/analysis/{first['id']}/reanalyze", json={'department': 'DevOps'}).get_json()
+            stats = client.get('/api/cache/stats').get_json()['text_cache']
+        
+        if first['extraction'].get('backend') != 'docx-stream' or other.get('extraction', {}).get('backend') != 'text-cache':
+            print_status(f"❌ Extraction backends {first.get('extraction')} then {other.get('extraction', other)}", "ERROR")
+            return False
+        if reanalyzed.get('reanalyzed_from') != first['id'] or reanalyzed.get('department') != 'DevOps':
+            print_status(f"❌ Re-analysis failed: {reanalyzed}", "ERROR")
+            return False
+        if other['skills'] != first['skills'] or stats['hits'] < 2:
+            print_status(f"❌ Cached text gave different results or was not used: {stats}", "ERROR")
+            return False
+        
+        print_status(f"✅ {stats['hits']} analyses started from cached text", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Extracted text reuse test failed: {e}", "ERROR")
+        return False
+
+def test_skill_aliases():
+    """Test that taxonomy aliases find skills the per-skill name search missed"""
+    print_status("Testing skill aliases...", "INFO")
+    
+    try:
+        import re
+        from utils.parser import ResumeParser
+        
+        parser = ResumeParser()
+        text = "SKILLS\nBuilt golang services on k8s backed by postgres, plus a Django admin"
+        
+        # Baseline: one word-bounded search per canonical skill name, as before the taxonomy
+        baseline = {
+            skill for skill in parser.skill_matcher.skill_categories
+            if re.search(r'\b' + re.escape(skill) + r'\b', text.lower())
+        }
+        hits = parser.match_skills(text)
+        skills = parser.extract_skills(text)
+        
+        aliases = {'go': 'golang', 'kubernetes': 'k8s', 'postgresql': 'postgres'}
+        if baseline & set(aliases):
+            print_status(f"❌ Baseline already finds {baseline & set(aliases)}", "ERROR")
+            return False
+        for skill, alias in aliases.items():
+            if skill not in hits or [text[start:end] for start, end in hits[skill]['offsets']] != [alias]:
+                print_status(f"❌ {alias} not matched as {skill}: {hits.get(skill)}", "ERROR")
+                return False
+        if skills['Programming'] != ['go'] or skills['Cloud & DevOps'] != ['kubernetes'] or skills['Database'] != ['postgresql']:
+            print_status(f"❌ Unexpected categories {skills}", "ERROR")
+            return False
+        
+        # Dotted names are one mention of one skill, never a "js" hit or a shorter alias too
+        expected = {
+            "Built APIs with node.js and react.js": {'node.js': 1, 'react': 1},
+            "express.js only": {'express': 1},
+            "Google Cloud Platform and plain JS": {'gcp': 1, 'javascript': 1},
+        }
+        for sample, counts in expected.items():
+            found = {skill: hit['count'] for skill, hit in parser.match_skills(sample).items()}
+            if found != counts:
+                print_status(f"❌ '{sample}' matched {found}, expected {counts}", "ERROR")
+                return False
+        
+        print_status(f"✅ Aliases add {sorted(set(hits) - baseline)} to the baseline {sorted(baseline)}", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Skill alias test failed: {e}", "ERROR")
+        return False
+
+def test_shared_document_context():
+    """Test that one ResumeDocument serves every stage with the same results as raw text"""
+    print_status("Testing shared document context...", "INFO")
+    
+    try:
+        from unittest import mock
+        from app import get_pipeline
+        import utils.document
+        
+        pipeline = get_pipeline()
+        pipeline.classifier.wait_until_ready(120)
+        parser, classifier = pipeline.parser, pipeline.classifier
+        text = "\n".join(SAMPLE_RESUME_LINES[:3] + ["EXPERIENCE"] + SAMPLE_RESUME_LINES[3:4]
+                         + ["EDUCATION"] + SAMPLE_RESUME_LINES[4:5] + ["SKILLS"] + SAMPLE_RESUME_LINES[5:])
+        
+        # Every stage gets the same answers from the shared document as from the raw text
+        document = parser.document(text)
+        stages = [parser.parse_personal_info, parser.extract_skills, parser.extract_experience, parser.extract_education]
+        for stage in stages:
+            if stage(document) != stage(text):
+                print_status(f"❌ {stage.__name__} differs between document and text", "ERROR")
+                return False
+        skills = parser.extract_skills(text)
+        experience = parser.extract_experience(text)
+        if classifier.classify_resume(document, skills) != classifier.classify_resume(text, skills):
+            print_status("❌ Classification differs between document and text", "ERROR")
+            return False
+        if classifier.detect_fraud(document, skills, experience) != classifier.detect_fraud(text, skills, experience):
+            print_status("❌ Fraud checks differ between document and text", "ERROR")
+            return False
+        
+        # Views are memoized on the document, so a full analysis segments the text once
+        if document.years is not document.years or document.section('Experience') is not document.section('Experience'):
+            print_status("❌ Document views are not memoized", "ERROR")
+            return False
+        with mock.patch.object(utils.document, 'segment_sections', wraps=utils.document.segment_sections) as segment:
+            pipeline.analyze_text(text, 'Software Engineering')
+        if segment.call_count != 1:
+            print_status(f"❌ Analysis segmented the text {segment.call_count} times", "ERROR")
+            return False
+        
+        print_status("✅ Shared document matches raw text and is segmented once per analysis", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Shared document test failed: {e}", "ERROR")
+        return False
+
+def test_experience_redos():
+    """Test that experience extraction stays linear on adversarial 1MB inputs"""
+    print_status("Testing experience extraction on adversarial inputs...", "INFO")
+    
+    try:
+        from utils.parser import ResumeParser
+        from benchmarks.bench_parser_redos import ADVERSARIAL_CASES, MB, run_call
+        
+        # Duplicates collapse onto their first occurrence, in text order
+        experience = ResumeParser().extract_experience(
+            "EXPERIENCE\nEngineer at Acme Corp\nAnalyst - Beta Labs\nEngineer at Acme Corp\nSenior python developer"
+        )
+        if experience['positions'] != ['Engineer', 'Analyst', 'Senior'] or experience['companies'] != ['Acme Corp', 'Beta Labs', 'python']:
+            print_status(f"❌ Unexpected experience {experience}", "ERROR")
+            return False
+        # Title words are not paired across punctuation
+        experience = ResumeParser().extract_experience("EXPERIENCE\nJunior Inc. manager")
+        if experience['positions'] or experience['companies']:
+            print_status(f"❌ Paired words across a clause: {experience}", "ERROR")
+            return False
+        
+        # Same 2s/MB budget as the benchmark; each call runs in a child that is killed when over it
+        budget = 2.0
+        slowest = (0.0, None)
+        for case in ADVERSARIAL_CASES:
+            seconds = run_call('method', 'extract_experience', case, MB, budget)
+            if seconds is None or seconds > budget:
+                print_status(f"❌ {case} input exceeded {budget}s", "ERROR")
+                return False
+            slowest = max(slowest, (seconds, case))
+        
+        print_status(f"✅ {len(ADVERSARIAL_CASES)} adversarial inputs within budget (slowest: {slowest[1]} {slowest[0]:.2f}s)", "SUCCESS")
+        return True
+        
+    except Exception as e:
+        print_status(f"❌ Experience ReDoS test failed: {e}", "ERROR")
+        return False
+
 def run_comprehensive_test():
     """Run all tests and provide summary"""
     print("\n" + "="*60)
@@ -275,10 +1484,35 @@ def run_comprehensive_test():
     # Run all tests
     test_results.append(("Module Imports", test_imports()))
     test_results.append(("Custom Modules", test_custom_modules()))
+    test_results.append(("Lazy Start-up", test_lazy_startup()))
     test_results.append(("Database", test_database()))
     test_results.append(("Resume Parser", test_parser()))
     test_results.append(("ML Classifier", test_classifier()))
+    test_results.append(("Model Bootstrap", test_model_bootstrap()))
+    test_results.append(("Classifier Engines", test_classifier_engines()))
+    test_results.append(("Model Versions", test_model_versions()))
+    test_results.append(("Online Learning", test_online_learning()))
+    test_results.append(("Prediction Cache", test_prediction_cache()))
+    test_results.append(("Feature Matrix", test_feature_matrix()))
+    test_results.append(("Feature Vectorizers", test_feature_vectorizers()))
+    test_results.append(("Feature Store", test_feature_store()))
+    test_results.append(("Corpus Matrix", test_corpus_matrix()))
+    test_results.append(("DOCX Text Boxes", test_docx_text_boxes()))
+    test_results.append(("Section Segmentation", test_section_segmentation()))
+    test_results.append(("Department Scoring", test_department_scoring()))
     test_results.append(("File Operations", test_file_operations()))
+    test_results.append(("Job Queue", test_job_queue()))
+    test_results.append(("Batch Pool Recovery", test_batch_pool_recovery()))
+    test_results.append(("Batch Upload Limits", test_batch_upload_limits()))
+    test_results.append(("Analysis Deletion", test_analysis_deletion()))
+    test_results.append(("Dedupe Cloning", test_dedupe_cloning()))
+    test_results.append(("In-Memory Uploads", test_in_memory_uploads()))
+    test_results.append(("PDF Early Stop", test_pdf_early_stop()))
+    test_results.append(("Extraction Sandbox", test_extraction_sandbox()))
+    test_results.append(("Extracted Text Reuse", test_extracted_text_reuse()))
+    test_results.append(("Skill Aliases", test_skill_aliases()))
+    test_results.append(("Shared Document Context", test_shared_document_context()))
+    test_results.append(("Experience ReDoS", test_experience_redos()))
     
     # Print summary
     print("\n" + "="*60)
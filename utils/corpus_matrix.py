@@ -0,0 +1,197 @@
+"""
+Corpus Matrix
+Append-only sparse TF-IDF matrix of every analyzed resume, so similarity,
+search and clustering never re-vectorize the history. Term counts are
+hashed (no vocabulary to fit, so every segment shares one column space)
+and stored per segment as the CSR arrays of a scipy matrix plus the
+analysis id of each row; IDF weights come from the whole corpus when it is
+loaded, so they are always current. Segments are memory-mapped on load and
+merged into larger ones by compact(); deleted analyses are hidden by
+tombstones until compaction drops them
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from utils.shards import ShardedDirectory, row_times
+
+# Hashed term columns (2^18 keeps collisions rare for resume-sized vocabularies)
+CORPUS_FEATURES = 2 ** 18
+# Segments kept before the small ones are merged (see ShardedDirectory.tiered_run)
+CORPUS_MAX_SEGMENTS = int(os.environ.get('CORPUS_MAX_SEGMENTS', 64))
+# Rows per segment written by compact()
+CORPUS_SEGMENT_ROWS = int(os.environ.get('CORPUS_SEGMENT_ROWS', 100000))
+
+# matrix: CSR, one row per analysis in ids order; idf: the weights applied (None for raw counts)
+CorpusTable = namedtuple('CorpusTable', ['ids', 'matrix', 'idf'])
+
+CSR_ARRAYS = ('ids', 'data', 'indices', 'indptr')
+
+
+class CorpusMatrix(ShardedDirectory):
+    def __init__(self, directory, max_segments=CORPUS_MAX_SEGMENTS, segment_rows=CORPUS_SEGMENT_ROWS):
+        """
+        Args:
+            directory: Where segments are written (created on first append)
+            max_segments: Segments kept before compaction_due() (0 never)
+            segment_rows: Rows per segment written by compact()
+        """
+        super().__init__(directory)
+        self.max_segments = max_segments
+        self.segment_rows = segment_rows
+        self.vectorizer = HashingVectorizer(
+            n_features=CORPUS_FEATURES,
+            alternate_sign=False,
+            norm=None,
+            stop_words='english'
+        )
+
+    def append(self, ids, texts):
+        """Count the terms of analyzed resumes and write them as a new segment; returns the segment name"""
+        if not len(ids):
+            return None
+        return self.write_segment(ids, self.vectorizer.transform([text or '' for text in texts]))
+
+    def compaction_due(self):
+        """Whether there are more than max_segments segments, so compact(tiered=True) would merge some"""
+        return bool(self.max_segments) and len(self.shards()) > self.max_segments
+
+    def write_segment(self, ids, counts, name=None):
+        """Write term counts (CSR, one row per id) as one segment"""
+        counts = sparse.csr_matrix(counts, dtype=np.float32)
+        # One index dtype for both arrays, so loading does not convert them
+        index_dtype = np.int64 if counts.nnz >= np.iinfo(np.int32).max else np.int32
+        return self.write_shard(
+            {
+                'ids': np.asarray(ids, dtype=np.int64),
+                'data': counts.data,
+                'indices': counts.indices.astype(index_dtype, copy=False),
+                'indptr': counts.indptr.astype(index_dtype, copy=False)
+            },
+            {'shape': list(counts.shape)},
+            name
+        )
+
+    def counts(self, keep_ids=None, tombstones=None, names=None):
+        """
+        Term counts of the whole corpus, as a CorpusTable
+
+        A corpus compacted into one segment is returned memory-mapped
+        without copying. For an id written more than once the newest row wins;
+        deleted ids are left out.
+
+        Args:
+            keep_ids: Optional ids to keep (e.g. the analyses still in the database)
+            tombstones: A tombstones() result to apply (read from disk by default)
+            names: Only read these segments (all by default)
+        """
+        shards = list(self.iter_shards(CSR_ARRAYS, ('shape',), names))
+        segments = [
+            CorpusTable(shard['ids'], sparse.csr_matrix(
+                (shard['data'], shard['indices'], shard['indptr']), shape=tuple(shard['shape']), copy=False
+            ), None)
+            for shard in shards
+        ]
+        if not segments:
+            return CorpusTable(np.zeros(0, dtype=np.int64), sparse.csr_matrix((0, CORPUS_FEATURES), dtype=np.float32), None)
+        if len(segments) == 1:
+            table = segments[0]
+        else:
+            table = CorpusTable(np.concatenate([segment.ids for segment in segments]),
+                                sparse.vstack([segment.matrix for segment in segments], format='csr'), None)
+
+        rows = self.live_rows(table.ids, row_times(shards), keep_ids, tombstones)
+        if len(rows) == len(table.ids):
+            return table
+        return CorpusTable(table.ids[rows], table.matrix[rows], None)
+
+    def load(self, keep_ids=None):
+        """
+        The TF-IDF matrix of the whole corpus, as a CorpusTable
+
+        IDF weights use the document frequencies of the loaded corpus, with
+        the smoothed formula and L2 row normalization of TfidfTransformer.
+        Only the data array is computed; indices and indptr stay memory-mapped.
+        """
+        table = self.counts(keep_ids)
+        counts = table.matrix
+        if not counts.shape[0]:
+            return table._replace(idf=np.ones(counts.shape[1], dtype=np.float32))
+        document_count = counts.shape[0]
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = (np.log((1 + document_count) / (1 + document_frequency)) + 1).astype(np.float32)
+        tfidf = sparse.csr_matrix((counts.data * idf[counts.indices], counts.indices, counts.indptr),
+                                  shape=counts.shape, copy=False)
+        return CorpusTable(table.ids, normalize(tfidf, copy=False), idf)
+
+    def most_similar(self, text, top=10, table=None):
+        """
+        Stored analyses most similar to a text, by cosine similarity of TF-IDF rows
+
+        Args:
+            table: A CorpusTable from load(), to reuse between queries
+
+        Returns:
+            List of (analysis id, similarity) pairs, most similar first
+        """
+        table = table or self.load()
+        if not len(table.ids):
+            return []
+        # Weighted like the stored rows
+        query = self.vectorizer.transform([text]).multiply(table.idf).tocsr()
+        scores = (table.matrix @ normalize(query).T).toarray().ravel()
+        best = np.argsort(-scores, kind='stable')[:top]
+        return [(int(table.ids[row]), float(scores[row])) for row in best if scores[row] > 0]
+
+    def compact(self, keep_ids=None, tiered=False):
+        """
+        Merge every segment into segments of up to segment_rows rows, dropping
+        overwritten and deleted rows (and ids not in keep_ids)
+
+        Args:
+            keep_ids: Optional ids to keep
+            tiered: Only merge the small newest segments picked by tiered_run(),
+                and only once there are more than max_segments; keep_ids then
+                applies only if that run is every segment
+
+        Returns:
+            Number of segments merged, or 0 when there was nothing to merge or another process is compacting
+        """
+        with self.compaction_lock() as acquired:
+            if not acquired:
+                return 0
+            names = self.shards()
+            tombstones = self.tombstones()
+            if tiered:
+                run = self.tiered_run(self.max_segments)
+                if not run:
+                    return 0
+                if len(run) < len(names):
+                    # The tombstones stay: they may still hide rows of the segments left alone
+                    self._write_segments(self.counts(None, tombstones, run), self.merged_name(run))
+                    self.remove_shards(run)
+                    return len(run)
+            if not names or (len(names) < 2 and keep_ids is None and not tombstones[0]):
+                return 0
+            table = self.counts(keep_ids, tombstones)
+            stored_rows = sum(len(self.read_shard(name, ('ids',))['ids']) for name in names)
+            # Nothing to drop and already in as few segments as compaction would write
+            if len(table.ids) == stored_rows and len(names) <= -(-stored_rows // self.segment_rows):
+                self.remove_tombstones(tombstones[0], names[-1])
+                return 0
+            merged = self.merged_name(names)
+            self._write_segments(table, merged)
+            self.remove_shards(names)
+            self.remove_tombstones(tombstones[0], merged)
+            return len(names)
+
+    def _write_segments(self, table, merged):
+        """Write a CorpusTable as segments of up to segment_rows rows named after merged"""
+        for part, start in enumerate(range(0, max(1, len(table.ids)), self.segment_rows)):
+            stop = start + self.segment_rows
+            self.write_segment(table.ids[start:stop], table.matrix[start:stop], f'{merged}-{part:04d}')
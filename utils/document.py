@@ -0,0 +1,92 @@
+"""
+Resume Document Context
+Wraps extracted resume text once per upload and lazily memoizes the views
+(lowercase text, lines, tokens, years, contacts, skill hits, sections) that
+the parser, classifier and fraud checks would otherwise recompute
+"""
+
+import re
+from functools import cached_property
+
+from utils.skill_matcher import get_skill_matcher
+from utils.sections import segment_sections
+
+# Shared by every stage that used to run these patterns on its own
+YEAR_PATTERN = r'\b(19|20)\d{2}\b'
+# Bounded (RFC 5321 lengths) so runs like 'a.a.a...' cannot make the scan quadratic
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,253}\.[A-Za-z]{2,63}\b'
+PHONE_PATTERN = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+
+
+class ResumeDocument:
+    def __init__(self, text, skill_matcher=None):
+        self.text = text or ''
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+        self._section_documents = {}
+
+    @classmethod
+    def wrap(cls, text, skill_matcher=None):
+        """Return text as a ResumeDocument, reusing it if it already is one"""
+        if isinstance(text, cls):
+            return text
+        return cls(text, skill_matcher)
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return self.text
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def tokens(self):
+        return self.lower.split()
+
+    @cached_property
+    def years(self):
+        """Values of the year pattern's capture group, in text order"""
+        return [int(year) for year in re.findall(YEAR_PATTERN, self.text)]
+
+    @cached_property
+    def emails(self):
+        if '@' not in self.text:
+            return []
+        return re.findall(EMAIL_PATTERN, self.text)
+
+    @cached_property
+    def phones(self):
+        """re.findall results of the phone pattern (the optional country-code group)"""
+        return re.findall(PHONE_PATTERN, self.text)
+
+    @cached_property
+    def skill_hits(self):
+        """SkillMatcher.find result: canonical skill -> count, offsets and categories"""
+        return self.skill_matcher.find(self.text)
+
+    @cached_property
+    def sections(self):
+        """segment_sections result: section name -> list of (start, end) offsets"""
+        return segment_sections(self.text)
+
+    def section(self, *names):
+        """
+        Return the named sections as one memoized ResumeDocument
+
+        Falls back to the whole document when none of the sections were
+        found, so resumes without headings are still fully scanned
+        """
+        if names not in self._section_documents:
+            spans = sorted(span for name in names for span in self.sections.get(name, ()))
+            if spans:
+                document = ResumeDocument(''.join(self.text[start:end] for start, end in spans), self.skill_matcher)
+            else:
+                document = self
+            self._section_documents[names] = document
+        return self._section_documents[names]
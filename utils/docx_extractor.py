@@ -0,0 +1,90 @@
+"""
+Streaming DOCX Extractor
+Reads word/document.xml (plus headers and footers) straight from the ZIP
+container with an incremental XML parser, keeping text from tables and
+text boxes that the python-docx paragraph walk drops
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+MC_FALLBACK = MC_NS + 'Fallback'
+
+HEADER_PATTERN = re.compile(r'^word/header\d*\.xml$')
+FOOTER_PATTERN = re.compile(r'^word/footer\d*\.xml$')
+
+
+def _part_sort_key(name):
+    digits = re.findall(r'\d+', name)
+    return int(digits[-1]) if digits else 0
+
+
+class DOCXExtractor:
+    def __init__(self, include_headers=True, include_footers=True):
+        self.include_headers = include_headers
+        self.include_footers = include_footers
+
+    def _iter_part_paragraphs(self, archive, part_name):
+        """Yield the text of each paragraph in one XML part, in document order"""
+        stack = []  # Paragraph buffers; text boxes nest paragraphs inside paragraphs
+        fallback_depth = 0  # Text boxes are repeated under mc:Fallback for old readers
+
+        with archive.open(part_name) as part:
+            for event, elem in ET.iterparse(part, events=('start', 'end')):
+                tag = elem.tag
+                if event == 'start':
+                    # Fallback paragraphs are skipped on 'end', so they get no buffer either
+                    if tag == W_P and not fallback_depth:
+                        stack.append([])
+                    elif tag == MC_FALLBACK:
+                        fallback_depth += 1
+                    continue
+
+                if tag == MC_FALLBACK:
+                    fallback_depth -= 1
+                    elem.clear()
+                elif fallback_depth or not stack:
+                    continue
+                elif tag == W_T:
+                    if elem.text:
+                        stack[-1].append(elem.text)
+                elif tag == W_TAB:
+                    stack[-1].append('\t')
+                elif tag in (W_BR, W_CR):
+                    stack[-1].append('\n')
+                elif tag == W_P:
+                    text = ''.join(stack.pop())
+                    # Free the subtree as we go so memory stays flat on large files
+                    elem.clear()
+                    if text:
+                        yield text
+
+    def extract(self, source):
+        """
+        Extract text from a DOCX path, bytes buffer or binary stream
+
+        Headers come first and footers last so contact details stay at the top
+        """
+        with zipfile.ZipFile(source) as archive:
+            names = archive.namelist()
+            parts = []
+            if self.include_headers:
+                parts.extend(sorted((n for n in names if HEADER_PATTERN.match(n)), key=_part_sort_key))
+            parts.append('word/document.xml')
+            if self.include_footers:
+                parts.extend(sorted((n for n in names if FOOTER_PATTERN.match(n)), key=_part_sort_key))
+
+            lines = []
+            for part_name in parts:
+                lines.extend(self._iter_part_paragraphs(archive, part_name))
+
+        return '\n'.join(lines) + '\n' if lines else ''
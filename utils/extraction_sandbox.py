@@ -0,0 +1,235 @@
+"""
+Extraction Sandbox
+Runs text extraction in a recyclable child process with a wall-clock
+timeout and a memory cap, so pathological documents cannot hang or bloat
+the process that serves requests
+"""
+
+import os
+import time
+import queue
+import logging
+import multiprocessing
+
+from utils.parser import ResumeParser
+from utils.pdf_extractor import PDFExtractor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_SANDBOX = os.environ.get('EXTRACTION_SANDBOX', 'True').lower() == 'true'
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', 20))
+EXTRACTION_FALLBACK_TIMEOUT = float(os.environ.get('EXTRACTION_FALLBACK_TIMEOUT', 10))
+# Memory the child may allocate on top of what it inherited when it was started
+EXTRACTION_MAX_RSS_MB = int(os.environ.get('EXTRACTION_MAX_RSS_MB', 512))
+# Recycle the child after this many documents so heap fragmentation cannot build up
+EXTRACTION_MAX_DOCS = int(os.environ.get('EXTRACTION_MAX_DOCS', 50))
+EXTRACTION_SANDBOXES = int(os.environ.get('EXTRACTION_SANDBOXES', 2))
+
+# Cheaper backend retried when the default one times out or runs out of memory
+FALLBACK_BACKENDS = {'.pdf': 'pypdf2'}
+
+POLL_INTERVAL = 0.05
+
+
+class ExtractionFailed(Exception):
+    """Raised when a document could not be extracted within the sandbox limits"""
+
+
+def _read_rss_bytes(pid):
+    """Resident set size of a process (Linux only, None elsewhere)"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _sandbox_main(conn, parent_pid):
+    """Child process loop: extract documents sent over the pipe until told to stop"""
+    parsers = {}
+    while True:
+        # Forked siblings may hold the other end of the pipe open, so EOF alone
+        # cannot be relied on to notice that the owning process is gone
+        if not conn.poll(1.0):
+            if os.getppid() != parent_pid:
+                break
+            continue
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+
+        data, file_ext, backend = request
+        try:
+            if backend not in parsers:
+                extractor = PDFExtractor(backend=backend) if backend else PDFExtractor()
+                parsers[backend] = ResumeParser(pdf_extractor=extractor)
+            text, stats = parsers[backend].extract_text_with_stats(data, file_ext)
+            conn.send(('ok', text, stats))
+        except MemoryError:
+            conn.send(('memory', 'Out of memory', {}))
+            break
+        except Exception as e:
+            conn.send(('error', str(e), {}))
+    conn.close()
+
+
+class ExtractionSandbox:
+    """A single extraction child process (not thread-safe, see ExtractionSandboxPool)"""
+
+    def __init__(self, timeout=EXTRACTION_TIMEOUT, fallback_timeout=EXTRACTION_FALLBACK_TIMEOUT,
+                 max_rss_mb=EXTRACTION_MAX_RSS_MB, max_docs=EXTRACTION_MAX_DOCS):
+        self.timeout = timeout
+        self.fallback_timeout = fallback_timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.max_docs = max_docs
+        self.process = None
+        self.conn = None
+        self.docs_processed = 0
+        self.baseline_rss = 0
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        # Daemonic so the child never outlives the process that owns it
+        self.process = multiprocessing.Process(target=_sandbox_main, args=(child_conn, os.getpid()), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.docs_processed = 0
+        # A forked child starts out sharing its parent's pages; only growth counts against the cap
+        self.baseline_rss = _read_rss_bytes(self.process.pid) or 0
+
+    def _kill(self):
+        if self.process is not None:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def recycle(self):
+        """Stop the child gracefully; a new one is started on the next document"""
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, BrokenPipeError):
+                pass
+        self._kill()
+
+    def _run(self, data, file_ext, backend, timeout):
+        """Send one document to the child and wait for it within the limits"""
+        if self.process is None or not self.process.is_alive():
+            self._kill()
+            self._start()
+
+        try:
+            self.conn.send((data, file_ext, backend))
+        except (OSError, BrokenPipeError):
+            self._kill()
+            return 'crashed', 'Extraction worker unavailable', {}
+
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.conn.poll(POLL_INTERVAL):
+                try:
+                    outcome, payload, stats = self.conn.recv()
+                except EOFError:
+                    self._kill()
+                    return 'crashed', 'Extraction worker exited', {}
+                self.docs_processed += 1
+                if outcome == 'memory' or self.docs_processed >= self.max_docs:
+                    self.recycle()
+                return outcome, payload, stats
+
+            if not self.process.is_alive():
+                self._kill()
+                return 'crashed', 'Extraction worker exited', {}
+
+            if time.monotonic() > deadline:
+                self._kill()
+                return 'timeout', f'Extraction exceeded {timeout:g}s', {}
+
+            rss = _read_rss_bytes(self.process.pid)
+            if self.max_rss_bytes and rss and rss - self.baseline_rss > self.max_rss_bytes:
+                self._kill()
+                return 'memory', f'Extraction exceeded {self.max_rss_bytes // (1024 * 1024)}MB', {}
+
+    def extract(self, source, file_ext):
+        """
+        Extract text in the child process, retrying with a cheaper backend on failure
+
+        Returns:
+            Tuple of (text, stats) like ResumeParser.extract_text_with_stats
+
+        Raises:
+            ExtractionFailed: if every backend timed out, ran out of memory or crashed
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                data = f.read()
+        elif isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        elif isinstance(source, memoryview):
+            data = source.tobytes()
+        else:
+            data = source.read()
+
+        attempts = [(None, self.timeout)]
+        if file_ext in FALLBACK_BACKENDS:
+            attempts.append((FALLBACK_BACKENDS[file_ext], self.fallback_timeout))
+
+        reasons = []
+        for backend, timeout in attempts:
+            outcome, payload, stats = self._run(data, file_ext, backend, timeout)
+            if outcome == 'ok':
+                if backend:
+                    stats['sandbox_fallback'] = True
+                return payload, stats
+            logger.warning(f"⚠️ Sandboxed extraction {outcome} ({backend or 'default'} backend): {payload}")
+            reasons.append(payload)
+
+        raise ExtractionFailed(
+            f"Document too complex to process ({'; '.join(reasons)}). Please upload a simpler PDF or DOCX file."
+        )
+
+    def close(self):
+        self.recycle()
+
+
+class ExtractionSandboxPool:
+    """Thread-safe pool of extraction sandboxes for multi-threaded servers"""
+
+    def __init__(self, size=EXTRACTION_SANDBOXES, **sandbox_options):
+        self.sandboxes = queue.Queue()
+        for _ in range(max(1, size)):
+            self.sandboxes.put(ExtractionSandbox(**sandbox_options))
+
+    def extract(self, source, file_ext):
+        sandbox = self.sandboxes.get()
+        try:
+            return sandbox.extract(source, file_ext)
+        finally:
+            self.sandboxes.put(sandbox)
+
+    def close(self):
+        while not self.sandboxes.empty():
+            self.sandboxes.get_nowait().close()
+
+
+def create_extraction_sandbox(size=1):
+    """
+    Build the sandbox configured by EXTRACTION_SANDBOX for the current process
+
+    Returns None when sandboxing is disabled or impossible (daemonic processes
+    cannot start children), in which case extraction runs in-process
+    """
+    if not EXTRACTION_SANDBOX or multiprocessing.current_process().daemon:
+        return None
+    if size > 1:
+        return ExtractionSandboxPool(size=size)
+    return ExtractionSandbox()
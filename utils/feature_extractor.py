@@ -1,10 +1,62 @@
+import os
 import re
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from collections import Counter
+
+from config.paths import MODEL_DIR
+from utils.document import ResumeDocument
+from models.artifacts import save_artifact, load_artifact
+
+# Fitted TF-IDF and count vectorizers, saved next to the classifier versions
+FEATURE_VECTORIZERS_FILE = 'feature_vectorizers.pkl'
+
+NUMBER_PATTERN = re.compile(r'\b\d+\b')
+SENTENCE_PATTERN = re.compile(r'[.!?]+')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERNS = [
+    re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\+?[\d\s-]{10,}')
+]
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+
+SECTION_KEYWORDS = {
+    'experience': ['experience', 'work', 'employment', 'career'],
+    'education': ['education', 'academic', 'degree', 'university'],
+    'skills': ['skills', 'technical', 'programming', 'languages'],
+    'projects': ['projects', 'portfolio', 'work samples'],
+    'certifications': ['certifications', 'certificate', 'licenses']
+}
+TECHNICAL_KEYWORDS = ['python', 'java', 'javascript', 'sql', 'aws', 'docker', 'machine learning']
+BUSINESS_KEYWORDS = ['management', 'leadership', 'strategy', 'business', 'marketing']
+
+# Column order of FeatureExtractor.feature_matrix; only ever append, so saved matrices stay readable
+TEXT_FEATURE_COLUMNS = (
+    'char_count', 'word_count', 'sentence_count',
+    'avg_word_length', 'max_word_length', 'unique_word_ratio',
+    'number_count', 'avg_number', 'email_count', 'phone_count', 'url_count',
+    'experience_section', 'education_section', 'skills_section', 'projects_section', 'certifications_section',
+    'technical_keyword_density', 'business_keyword_density'
+)
+SKILL_FEATURE_COLUMNS = (
+    'total_skills', 'technical_skills_count', 'soft_skills_count', 'other_skills_count',
+    'technical_ratio', 'soft_ratio', 'skill_diversity', 'avg_skills_per_category'
+)
+# Per-document counts the text columns are derived from
+RAW_TEXT_COUNTS = (
+    'char_count', 'word_count', 'sentence_count', 'word_chars', 'max_word_length', 'unique_words',
+    'number_count', 'number_sum', 'email_count', 'phone_count', 'url_count',
+    'experience_section', 'education_section', 'skills_section', 'projects_section', 'certifications_section',
+    'technical_keywords', 'business_keywords'
+)
 
 class FeatureExtractor:
-    def __init__(self):
+    def __init__(self, model_dir=MODEL_DIR):
+        """
+        Args:
+            model_dir: Directory the fitted vectorizers are saved in and loaded
+                from (None to always start unfitted)
+        """
+        self.model_dir = model_dir
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=1000, 
             stop_words='english',
@@ -14,75 +66,135 @@ class FeatureExtractor:
             max_features=500,
             stop_words='english'
         )
+        # Documents seen and per-term document frequencies behind the IDF weights
+        self.document_count = 0
+        self.document_frequency = None
+        # Newest analysis folded in, so history updates resume after it
+        self.last_analysis_id = 0
+        
+        path = self._vectorizers_path()
+        if path and os.path.exists(path):
+            try:
+                state = load_artifact(path)
+                self.tfidf_vectorizer = state['tfidf_vectorizer']
+                self.count_vectorizer = state['count_vectorizer']
+                self.document_count = state['document_count']
+                self.document_frequency = state['document_frequency']
+                self.last_analysis_id = state.get('last_analysis_id', 0)
+            except Exception as e:
+                print(f"⚠️ Could not load feature vectorizers ({e}), starting unfitted")
+    
+    @property
+    def is_fitted(self):
+        """True once the vocabularies and IDF weights have been learned"""
+        return hasattr(self.tfidf_vectorizer, 'vocabulary_') and hasattr(self.count_vectorizer, 'vocabulary_')
+    
+    def fit(self, texts, last_analysis_id=0):
+        """
+        Learn the vocabularies and IDF weights from a corpus, replacing any earlier fit
+        
+        Args:
+            last_analysis_id: Newest analysis in the corpus, when it comes from the history
+        
+        Returns:
+            self
+        """
+        texts = self._clean_texts(texts)
+        if not texts:
+            raise ValueError("Cannot fit feature vectorizers without any text")
+        
+        X = self.tfidf_vectorizer.fit_transform(texts)
+        self.count_vectorizer.fit(texts)
+        self.document_count = len(texts)
+        self.document_frequency = self._document_frequency(X)
+        self.last_analysis_id = last_analysis_id
+        return self
+    
+    def update_idf(self, texts, last_analysis_id=None):
+        """
+        Fold new documents into the IDF weights without refitting
+        
+        The vocabulary stays fixed, so earlier feature columns keep their
+        meaning; only the document frequencies of known terms are updated.
+        Fits from scratch when nothing has been fitted yet.
+        
+        Args:
+            last_analysis_id: Newest analysis in the batch, recorded so the
+                next update resumes after it
+        
+        Returns:
+            Number of documents added
+        """
+        texts = self._clean_texts(texts)
+        if last_analysis_id is not None:
+            self.last_analysis_id = max(self.last_analysis_id, last_analysis_id)
+        if not texts:
+            return 0
+        if not self.is_fitted:
+            self.fit(texts, self.last_analysis_id)
+            return len(texts)
+        
+        self.document_count += len(texts)
+        self.document_frequency = self.document_frequency + self._document_frequency(self.tfidf_vectorizer.transform(texts))
+        # Same smoothed formula as TfidfTransformer (smooth_idf=True)
+        self.tfidf_vectorizer.idf_ = np.log((1 + self.document_count) / (1 + self.document_frequency)) + 1
+        return len(texts)
+    
+    def save(self, model_dir=None):
+        """Save the fitted vectorizers; returns the file written"""
+        if not self.is_fitted:
+            raise ValueError("Feature vectorizers are not fitted")
+        model_dir = model_dir or self.model_dir
+        os.makedirs(model_dir, exist_ok=True)
+        path = os.path.join(model_dir, FEATURE_VECTORIZERS_FILE)
+        save_artifact({
+            'tfidf_vectorizer': self.tfidf_vectorizer,
+            'count_vectorizer': self.count_vectorizer,
+            'document_count': self.document_count,
+            'document_frequency': self.document_frequency,
+            'last_analysis_id': self.last_analysis_id
+        }, path)
+        return path
     
     def extract_text_features(self, text):
-        """Extract comprehensive text-based features"""
+        """Extract comprehensive text-based features (text may be a ResumeDocument)"""
         features = {}
         
         if not text:
             return self._get_empty_features()
         
         try:
+            counts = self._text_counts(ResumeDocument.wrap(text))
+            
             # Basic text statistics
-            features['char_count'] = len(text)
-            features['word_count'] = len(text.split())
-            features['sentence_count'] = len(re.split(r'[.!?]+', text))
+            features['char_count'] = counts['char_count']
+            features['word_count'] = counts['word_count']
+            features['sentence_count'] = counts['sentence_count']
             
             # Word and character statistics
-            words = text.split()
-            if words:
-                features['avg_word_length'] = sum(len(word) for word in words) / len(words)
-                features['max_word_length'] = max(len(word) for word in words)
-                features['unique_word_ratio'] = len(set(words)) / len(words)
+            if counts['word_count']:
+                features['avg_word_length'] = counts['word_chars'] / counts['word_count']
+                features['max_word_length'] = counts['max_word_length']
+                features['unique_word_ratio'] = counts['unique_words'] / counts['word_count']
             else:
                 features['avg_word_length'] = 0
                 features['max_word_length'] = 0
                 features['unique_word_ratio'] = 0
             
-            # Extract numeric features
-            numbers = re.findall(r'\b\d+\b', text)
-            features['number_count'] = len(numbers)
-            if numbers:
-                features['avg_number'] = sum(map(int, numbers)) / len(numbers)
-            else:
-                features['avg_number'] = 0
-            
-            # Contact information features
-            emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-            features['email_count'] = len(emails)
-            
-            phone_patterns = [
-                r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-                r'\+?[\d\s-]{10,}'
-            ]
-            phone_count = 0
-            for pattern in phone_patterns:
-                phone_count += len(re.findall(pattern, text))
-            features['phone_count'] = phone_count
-            
-            # URL features
-            urls = re.findall(r'http\S+|www\S+|https\S+', text)
-            features['url_count'] = len(urls)
+            # Numeric, contact and URL features
+            features['number_count'] = counts['number_count']
+            features['avg_number'] = counts['number_sum'] / counts['number_count'] if counts['number_count'] else 0
+            features['email_count'] = counts['email_count']
+            features['phone_count'] = counts['phone_count']
+            features['url_count'] = counts['url_count']
             
             # Section detection features
-            section_keywords = {
-                'experience': ['experience', 'work', 'employment', 'career'],
-                'education': ['education', 'academic', 'degree', 'university'],
-                'skills': ['skills', 'technical', 'programming', 'languages'],
-                'projects': ['projects', 'portfolio', 'work samples'],
-                'certifications': ['certifications', 'certificate', 'licenses']
-            }
-            
-            text_lower = text.lower()
-            for section, keywords in section_keywords.items():
-                features[f'{section}_section'] = any(keyword in text_lower for keyword in keywords)
+            for section in SECTION_KEYWORDS:
+                features[f'{section}_section'] = counts[f'{section}_section']
             
             # Keyword density features
-            technical_keywords = ['python', 'java', 'javascript', 'sql', 'aws', 'docker', 'machine learning']
-            business_keywords = ['management', 'leadership', 'strategy', 'business', 'marketing']
-            
-            features['technical_keyword_density'] = sum(text_lower.count(keyword) for keyword in technical_keywords) / max(1, features['word_count'])
-            features['business_keyword_density'] = sum(text_lower.count(keyword) for keyword in business_keywords) / max(1, features['word_count'])
+            features['technical_keyword_density'] = counts['technical_keywords'] / max(1, counts['word_count'])
+            features['business_keyword_density'] = counts['business_keywords'] / max(1, counts['word_count'])
             
             return features
             
@@ -90,6 +202,79 @@ class FeatureExtractor:
             print(f"Error extracting text features: {e}")
             return self._get_empty_features()
     
+    def feature_matrix(self, texts, skills_list=None):
+        """
+        Extract text features (and skill features) for many resumes as one matrix
+        
+        Args:
+            texts: Resume texts (or ResumeDocuments)
+            skills_list: Optional skills dictionary per resume, adding SKILL_FEATURE_COLUMNS
+        
+        Returns:
+            Tuple of (float64 array with one row per resume, column names);
+            columns follow TEXT_FEATURE_COLUMNS then SKILL_FEATURE_COLUMNS
+        """
+        raw = np.zeros((len(texts), len(RAW_TEXT_COUNTS)))
+        for row, text in enumerate(texts):
+            if text:
+                counts = self._text_counts(ResumeDocument.wrap(text))
+                raw[row] = [counts[name] for name in RAW_TEXT_COUNTS]
+        raw = dict(zip(RAW_TEXT_COUNTS, raw.T))
+        
+        # Ratios for the whole batch; rows without words (or numbers) stay 0
+        words = np.maximum(raw['word_count'], 1)
+        has_words = raw['word_count'] > 0
+        columns = {name: raw[name] for name in RAW_TEXT_COUNTS if name in TEXT_FEATURE_COLUMNS}
+        columns['avg_word_length'] = np.where(has_words, raw['word_chars'] / words, 0)
+        columns['max_word_length'] = np.where(has_words, raw['max_word_length'], 0)
+        columns['unique_word_ratio'] = np.where(has_words, raw['unique_words'] / words, 0)
+        columns['avg_number'] = np.where(raw['number_count'] > 0, raw['number_sum'] / np.maximum(raw['number_count'], 1), 0)
+        columns['technical_keyword_density'] = raw['technical_keywords'] / words
+        columns['business_keyword_density'] = raw['business_keywords'] / words
+        
+        names = TEXT_FEATURE_COLUMNS
+        matrix = np.column_stack([columns[name] for name in TEXT_FEATURE_COLUMNS])
+        if skills_list is not None:
+            skill_rows = [self.extract_skill_features(skills) for skills in skills_list]
+            skill_matrix = np.array([[row[name] for name in SKILL_FEATURE_COLUMNS] for row in skill_rows], dtype=np.float64)
+            matrix = np.hstack([matrix, skill_matrix.reshape(len(texts), len(SKILL_FEATURE_COLUMNS))])
+            names = names + SKILL_FEATURE_COLUMNS
+        return matrix, names
+    
+    def _text_counts(self, document):
+        """Raw counts behind the text features"""
+        text = document.text
+        text_lower = document.lower
+        words = text.split()
+        numbers = NUMBER_PATTERN.findall(text)
+        
+        counts = {
+            'char_count': len(text),
+            'word_count': len(words),
+            'sentence_count': len(SENTENCE_PATTERN.split(text)),
+            'word_chars': sum(len(word) for word in words),
+            'max_word_length': max((len(word) for word in words), default=0),
+            'unique_words': len(set(words)),
+            'number_count': len(numbers),
+            # Parsed as floats so very long digit runs cannot overflow
+            'number_sum': sum(float(number) for number in numbers),
+            'email_count': len(EMAIL_PATTERN.findall(text)),
+            'phone_count': sum(len(pattern.findall(text)) for pattern in PHONE_PATTERNS),
+            'url_count': len(URL_PATTERN.findall(text))
+        }
+        
+        # Use the segmented headings; keyword search only for resumes without any
+        for section, keywords in SECTION_KEYWORDS.items():
+            if document.sections:
+                counts[f'{section}_section'] = section.title() in document.sections
+            else:
+                counts[f'{section}_section'] = any(keyword in text_lower for keyword in keywords)
+        
+        # Substring counts, as the features were defined ('javascript' also counts as 'java')
+        for name, keywords in (('technical_keywords', TECHNICAL_KEYWORDS), ('business_keywords', BUSINESS_KEYWORDS)):
+            counts[name] = sum(text_lower.count(keyword) for keyword in keywords)
+        return counts
+    
     def extract_skill_features(self, skills_dict):
         """Extract features from skills dictionary"""
         features = {}
@@ -209,40 +394,48 @@ class FeatureExtractor:
             return {'education_score': 0, 'degree_count': 0, 'institution_count': 0, 'has_higher_education': False}
     
     def get_tfidf_features(self, texts):
-        """Get TF-IDF features for multiple texts"""
+        """Get TF-IDF features for multiple texts (fits first if nothing is fitted yet)"""
         try:
-            if not texts or len(texts) == 0:
-                return None
-            
-            # Ensure all texts are strings
-            texts = [str(text) for text in texts if text]
+            texts = self._clean_texts(texts)
             
             if len(texts) == 0:
                 return None
             
-            return self.tfidf_vectorizer.fit_transform(texts)
+            if not self.is_fitted:
+                self.fit(texts)
+            return self.tfidf_vectorizer.transform(texts)
             
         except Exception as e:
             print(f"Error generating TF-IDF features: {e}")
             return None
     
     def get_count_features(self, texts):
-        """Get count vectorizer features"""
+        """Get count vectorizer features (fits first if nothing is fitted yet)"""
         try:
-            if not texts or len(texts) == 0:
-                return None
-            
-            texts = [str(text) for text in texts if text]
+            texts = self._clean_texts(texts)
             
             if len(texts) == 0:
                 return None
             
-            return self.count_vectorizer.fit_transform(texts)
+            if not self.is_fitted:
+                self.fit(texts)
+            return self.count_vectorizer.transform(texts)
             
         except Exception as e:
             print(f"Error generating count features: {e}")
             return None
     
+    def _vectorizers_path(self):
+        return os.path.join(self.model_dir, FEATURE_VECTORIZERS_FILE) if self.model_dir else None
+    
+    def _clean_texts(self, texts):
+        """Non-empty texts as strings"""
+        return [str(text) for text in texts or [] if text]
+    
+    def _document_frequency(self, X):
+        """Documents containing each vocabulary term, from a transformed matrix"""
+        return np.bincount(X.indices, minlength=X.shape[1]).astype(np.float64)
+    
     def _get_empty_features(self):
         """Return empty feature set"""
         return {
@@ -0,0 +1,203 @@
+"""
+Feature Store
+Columnar store of the features of every saved analysis, keyed by analysis
+id, so analytics and retraining scan numpy arrays instead of decoding the
+JSON columns row by row. Each append writes one shard directory of .npy
+files (ids, features, skills) with its column names; shards are never
+modified, only merged by compact(), and are memory-mapped on load.
+Deleted analyses are hidden by tombstones until compaction drops them
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from utils.feature_extractor import FeatureExtractor, TEXT_FEATURE_COLUMNS, SKILL_FEATURE_COLUMNS
+from utils.shards import ShardedDirectory, row_times
+from utils.skill_matcher import get_skill_matcher
+
+# Shards kept before the small ones are merged (see ShardedDirectory.tiered_run)
+FEATURE_STORE_MAX_SHARDS = int(os.environ.get('FEATURE_STORE_MAX_SHARDS', 64))
+
+# Columns from extract_experience_features and extract_education_features (numeric ones only)
+PROFILE_FEATURE_COLUMNS = (
+    'experience_years', 'position_count', 'company_count', 'senior_position_ratio', 'junior_position_ratio',
+    'education_score', 'degree_count', 'institution_count', 'has_higher_education'
+)
+# Column order of new shards; only ever append, older shards are aligned by name on load
+FEATURE_COLUMNS = TEXT_FEATURE_COLUMNS + SKILL_FEATURE_COLUMNS + PROFILE_FEATURE_COLUMNS
+
+# features: float64 (rows x feature_columns); skills: uint8 0/1 (rows x skill_columns)
+FeatureTable = namedtuple('FeatureTable', ['ids', 'features', 'feature_columns', 'skills', 'skill_columns'])
+
+
+def skill_columns():
+    """Canonical skills of the taxonomy, in taxonomy order"""
+    return tuple(get_skill_matcher().skill_categories)
+
+
+class FeatureStore(ShardedDirectory):
+    def __init__(self, directory, max_shards=FEATURE_STORE_MAX_SHARDS):
+        """
+        Args:
+            directory: Where shards are written (created on first append)
+            max_shards: Shards kept before compaction_due() (0 never)
+        """
+        super().__init__(directory)
+        self.max_shards = max_shards
+        self.extractor = FeatureExtractor(model_dir=None)
+
+    def featurize(self, texts, skills_list, experiences, educations):
+        """
+        Feature and skill rows for parsed analyses
+
+        Args:
+            texts: Resume texts ('' when the text is not available)
+            skills_list: Skills dictionary per analysis (category -> skills)
+            experiences: Experience dictionary per analysis (total_years, positions, companies)
+            educations: Education dictionary per analysis (highest_degree, degrees, institutions)
+
+        Returns:
+            Tuple of (features, skills) arrays in FEATURE_COLUMNS and skill_columns() order
+        """
+        features, _ = self.extractor.feature_matrix(texts, skills_list)
+        profiles = np.array([
+            [float(row.get(name, 0)) for name in PROFILE_FEATURE_COLUMNS]
+            for row in (
+                dict(self.extractor.extract_experience_features(experience or {}),
+                     **self.extractor.extract_education_features(education or {}))
+                for experience, education in zip(experiences, educations)
+            )
+        ], dtype=np.float64).reshape(len(texts), len(PROFILE_FEATURE_COLUMNS))
+
+        columns = {skill: index for index, skill in enumerate(skill_columns())}
+        skills = np.zeros((len(texts), len(columns)), dtype=np.uint8)
+        for row, skills_dict in enumerate(skills_list):
+            for category_skills in (skills_dict or {}).values():
+                for skill in category_skills:
+                    if skill in columns:
+                        skills[row, columns[skill]] = 1
+        return np.hstack([features, profiles]), skills
+
+    def append(self, ids, texts, skills_list, experiences, educations):
+        """Featurize analyses and write them as a new shard; returns the shard name"""
+        if not len(ids):
+            return None
+        features, skills = self.featurize(texts, skills_list, experiences, educations)
+        return self.write_table(FeatureTable(ids, features, FEATURE_COLUMNS, skills, skill_columns()))
+
+    def compaction_due(self):
+        """Whether there are more than max_shards shards, so compact(tiered=True) would merge some"""
+        return bool(self.max_shards) and len(self.shards()) > self.max_shards
+
+    def write_table(self, table, name=None):
+        """Write a FeatureTable as one shard; returns the shard name"""
+        return self.write_shard(
+            {
+                'ids': np.asarray(table.ids, dtype=np.int64),
+                'features': np.asarray(table.features, dtype=np.float64),
+                'skills': np.asarray(table.skills, dtype=np.uint8)
+            },
+            {'columns': {'features': list(table.feature_columns), 'skills': list(table.skill_columns)}},
+            name
+        )
+
+    def load(self, keep_ids=None, tombstones=None, names=None):
+        """
+        The whole store as one FeatureTable
+
+        A compacted store (one shard, no duplicates) is returned memory-mapped
+        without copying. Otherwise shards are concatenated: columns are aligned
+        by name (missing feature columns are NaN, missing skills 0) and for an
+        id written more than once the newest row wins. Deleted ids are left out.
+
+        Args:
+            keep_ids: Optional ids to keep (e.g. the analyses still in the database)
+            tombstones: A tombstones() result to apply (read from disk by default)
+            names: Only read these shards (all by default)
+        """
+        shards = list(self.iter_shards(('ids', 'features', 'skills'), ('columns',), names))
+        tables = [
+            FeatureTable(shard['ids'], shard['features'], tuple(shard['columns']['features']),
+                         shard['skills'], tuple(shard['columns']['skills']))
+            for shard in shards
+        ]
+        if not tables:
+            return FeatureTable(np.zeros(0, dtype=np.int64), np.zeros((0, len(FEATURE_COLUMNS))), FEATURE_COLUMNS,
+                                np.zeros((0, len(skill_columns())), dtype=np.uint8), skill_columns())
+
+        if len(tables) == 1:
+            table = tables[0]
+        else:
+            feature_columns = _union(table.feature_columns for table in tables)
+            columns = _union(table.skill_columns for table in tables)
+            table = FeatureTable(
+                np.concatenate([table.ids for table in tables]),
+                np.vstack([_align(table.features, table.feature_columns, feature_columns, np.nan) for table in tables]),
+                feature_columns,
+                np.vstack([_align(table.skills, table.skill_columns, columns, 0) for table in tables]),
+                columns
+            )
+
+        rows = self.live_rows(table.ids, row_times(shards), keep_ids, tombstones)
+        if len(rows) == len(table.ids):
+            return table
+        return table._replace(ids=table.ids[rows], features=table.features[rows], skills=table.skills[rows])
+
+    def compact(self, keep_ids=None, tiered=False):
+        """
+        Merge every shard into one, dropping overwritten and deleted rows (and ids not in keep_ids)
+
+        Args:
+            keep_ids: Optional ids to keep
+            tiered: Only merge the small newest shards picked by tiered_run(), and
+                only once there are more than max_shards; keep_ids then applies
+                only if that run is every shard
+
+        Returns:
+            Number of shards merged, or 0 when there was nothing to merge or another process is compacting
+        """
+        with self.compaction_lock() as acquired:
+            if not acquired:
+                return 0
+            names = self.shards()
+            tombstones = self.tombstones()
+            if tiered:
+                run = self.tiered_run(self.max_shards)
+                if not run:
+                    return 0
+                if len(run) < len(names):
+                    # The tombstones stay: they may still hide rows of the shards left alone
+                    self.write_table(self.load(None, tombstones, run), self.merged_name(run))
+                    self.remove_shards(run)
+                    return len(run)
+            if not names or (len(names) < 2 and keep_ids is None and not tombstones[0]):
+                return 0
+            table = self.load(keep_ids, tombstones)
+            if len(names) == 1 and len(table.ids) == len(self.read_shard(names[0], ('ids',))['ids']):
+                # Nothing hidden: the tombstones only name ids this store never had
+                self.remove_tombstones(tombstones[0], names[0])
+                return 0
+            merged = self.merged_name(names)
+            self.write_table(table, merged)
+            self.remove_shards(names)
+            self.remove_tombstones(tombstones[0], merged)
+            return len(names)
+
+
+def _union(column_lists):
+    """Column names of several shards, in order of first appearance"""
+    return tuple(dict.fromkeys(column for columns in column_lists for column in columns))
+
+
+def _align(matrix, columns, target_columns, fill):
+    """Reorder a shard's columns to target_columns, filling the ones it lacks"""
+    if tuple(columns) == tuple(target_columns):
+        return matrix
+    aligned = np.full((matrix.shape[0], len(target_columns)), fill, dtype=matrix.dtype)
+    index = {column: position for position, column in enumerate(columns)}
+    for position, column in enumerate(target_columns):
+        if column in index:
+            aligned[:, position] = matrix[:, index[column]]
+    return aligned
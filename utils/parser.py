@@ -1,74 +1,123 @@
-import PyPDF2
-from pdfminer.high_level import extract_text as pdfminer_extract
-from docx import Document
+import io
+import os
 import re
 from datetime import datetime
+from itertools import chain
+
+from utils.pdf_extractor import PDFExtractor
+from utils.docx_extractor import DOCXExtractor
+from utils.skill_matcher import get_skill_matcher
+from utils.document import ResumeDocument
+
+# Line-oriented experience extraction
+EXPERIENCE_SEPARATORS = ('at', '@', '|')
+WORD_PATTERN = re.compile(r'[A-Za-z]+')
+# Title words are only paired within one clause of a line
+CLAUSE_PATTERN = re.compile(r'[.,;|]')
+JOB_TITLE_PATTERN = re.compile(r'developer|engineer|analyst|manager')
+SENIORITY_WORDS = {'senior', 'junior', 'lead'}
+
+# Sections each extractor scans (the whole resume when none of them is found)
+CONTACT_SECTIONS = ('Contact',)
+SKILL_SECTIONS = ('Summary', 'Experience', 'Skills', 'Projects', 'Certifications')
+EXPERIENCE_SECTIONS = ('Experience',)
+EDUCATION_SECTIONS = ('Education',)
 
 class ResumeParser:
-    def extract_text(self, file_path, file_ext):
-        """Extract text from PDF or DOCX files with fallback methods"""
+    def __init__(self, pdf_extractor=None, docx_extractor=None, skill_matcher=None):
+        self.pdf_extractor = pdf_extractor or PDFExtractor()
+        self.docx_extractor = docx_extractor or DOCXExtractor()
+        # Compiled once per process from config/skills_taxonomy.json (see SKILLS_TAXONOMY)
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+    
+    def _open_source(self, source):
+        """Return a seekable in-memory stream for a path, bytes buffer or file-like object"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source)
+        if isinstance(source, (str, os.PathLike)):
+            # Read once so every backend works from the same buffer
+            with open(source, 'rb') as file:
+                return io.BytesIO(file.read())
+        if hasattr(source, 'seekable') and source.seekable():
+            source.seek(0)
+            return source
+        return io.BytesIO(source.read())
+    
+    def extract_text(self, source, file_ext):
+        """
+        Extract text from PDF or DOCX files
+        
+        Args:
+            source: File path, bytes buffer or binary file-like object
+            file_ext: File extension including the dot ('.pdf' or '.docx')
+        """
+        text, _ = self.extract_text_with_stats(source, file_ext)
+        return text
+    
+    def extract_text_with_stats(self, source, file_ext):
+        """Extract text and return it with extraction statistics (backend, per-page timings)"""
+        stats = {}
         try:
+            if file_ext not in ('.pdf', '.docx'):
+                return f"Unsupported file type: {file_ext}", stats
+            
+            stream = self._open_source(source)
+            
             if file_ext == '.pdf':
-                # Try pdfminer first (better for some PDFs)
                 try:
-                    text = pdfminer_extract(file_path)
-                    if text and len(text.strip()) > 100:
-                        return text
+                    # One backend per document, chosen by probing the first page
+                    result = self.pdf_extractor.extract(stream)
+                    text = result.pop('text')
+                    return text, result
                 except Exception as e:
-                    print(f"pdfminer failed: {e}, trying PyPDF2...")
-                
-                # Fallback to PyPDF2
+                    print(f"PDF extraction failed: {e}")
+                    return f"Error reading PDF: {str(e)}", stats
+                    
+            else:
+                # Fast path: stream the XML parts directly (includes tables, headers, text boxes)
                 try:
-                    with open(file_path, 'rb') as file:
-                        reader = PyPDF2.PdfReader(file)
-                        text = ""
-                        for page in reader.pages:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                        return text
+                    return self.docx_extractor.extract(stream), {'backend': 'docx-stream'}
                 except Exception as e:
-                    print(f"PyPDF2 failed: {e}")
-                    return f"Error reading PDF: {str(e)}"
-                    
-            elif file_ext == '.docx':
+                    print(f"Streaming DOCX extraction failed: {e}, trying python-docx...")
+                
                 try:
-                    doc = Document(file_path)
-                    text = ""
-                    for paragraph in doc.paragraphs:
-                        if paragraph.text:
-                            text += paragraph.text + "\n"
-                    return text
+                    # python-docx is only needed for this fallback, so import it lazily
+                    from docx import Document
+                    stream.seek(0)
+                    doc = Document(stream)
+                    text = "\n".join(paragraph.text for paragraph in doc.paragraphs if paragraph.text)
+                    return (text + "\n" if text else text), {'backend': 'python-docx'}
                 except Exception as e:
-                    return f"Error reading DOCX: {str(e)}"
-            else:
-                return f"Unsupported file type: {file_ext}"
+                    return f"Error reading DOCX: {str(e)}", stats
                 
         except Exception as e:
-            return f"Error extracting text: {str(e)}"
+            return f"Error extracting text: {str(e)}", stats
+    
+    def document(self, text):
+        """Wrap text in a ResumeDocument sharing this parser's skill matcher"""
+        return ResumeDocument.wrap(text, self.skill_matcher)
     
     def parse_personal_info(self, text):
-        """Extract personal information from resume text"""
+        """Extract personal information from resume text (a string or ResumeDocument)"""
         info = {'name': '', 'email': '', 'phone': '', 'location': ''}
         
         if not text:
             return info
+        document = self.document(text)
         
         # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
+        emails = document.emails
         if emails:
             info['email'] = emails[0]
         
         # Extract phone numbers (international format support)
         phone_patterns = [
-            r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
             r'\+?[\d\s-]{10,}',  # International format
             r'\(\d{3}\)\s*\d{3}[-.\s]?\d{4}'  # (123) 456-7890
         ]
         
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
+        # US format first, memoized on the document since fraud detection needs it too
+        for phones in chain([document.phones], (re.findall(pattern, document.text) for pattern in phone_patterns)):
             if phones:
                 # Take the first phone number found
                 phone = phones[0]
@@ -77,8 +126,12 @@ class ResumeParser:
                 info['phone'] = phone.strip()
                 break
         
+        # Name and location come from the header above the first section;
+        # email and phone are searched everywhere since some resumes put them in a footer
+        contact = document.section(*CONTACT_SECTIONS)
+        
         # Extract name (improved heuristic)
-        lines = text.split('\n')
+        lines = contact.lines
         for i, line in enumerate(lines[:15]):  # Check first 15 lines
             line = line.strip()
             if (len(line) > 2 and len(line) < 50 and 
@@ -102,7 +155,7 @@ class ResumeParser:
             'toronto', 'sydney', 'berlin', 'paris', 'tokyo'
         ]
         
-        text_lower = text.lower()
+        text_lower = contact.lower
         for location in location_keywords:
             if location in text_lower:
                 info['location'] = location.title()
@@ -110,63 +163,25 @@ class ResumeParser:
         
         return info
     
+    def match_skills(self, text):
+        """
+        Find every skill mention in one pass over the text
+        
+        Returns:
+            Dictionary mapping canonical skill to its count, (start, end)
+            offsets and categories
+        """
+        return self.document(text).skill_hits
+    
     def extract_skills(self, text):
-        """Extract skills from resume text using comprehensive skill database"""
+        """Extract skills from the skill-bearing sections using the skills taxonomy (aliases map to canonical names)"""
         if not text:
             return {}
         
-        skills_db = {
-            'Programming': [
-                'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 
-                'kotlin', 'go', 'rust', 'typescript', 'scala', 'r', 'matlab'
-            ],
-            'Web Development': [
-                'html', 'css', 'react', 'angular', 'vue', 'django', 'flask', 
-                'node.js', 'express', 'spring', 'laravel', 'bootstrap', 'jquery'
-            ],
-            'Database': [
-                'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'oracle', 
-                'sqlite', 'cassandra', 'dynamodb', 'firebase'
-            ],
-            'Cloud & DevOps': [
-                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 
-                'terraform', 'ansible', 'git', 'ci/cd', 'github', 'gitlab'
-            ],
-            'AI/ML': [
-                'machine learning', 'deep learning', 'tensorflow', 'pytorch', 
-                'nlp', 'computer vision', 'neural networks', 'scikit-learn',
-                'opencv', 'keras'
-            ],
-            'Data Science': [
-                'pandas', 'numpy', 'r', 'matplotlib', 'seaborn', 'tableau', 
-                'power bi', 'excel', 'statistics', 'analytics'
-            ],
-            'Soft Skills': [
-                'leadership', 'communication', 'teamwork', 'problem solving', 
-                'project management', 'agile', 'scrum', 'time management',
-                'critical thinking', 'creativity', 'adaptability'
-            ],
-            'Tools & Platforms': [
-                'jira', 'confluence', 'slack', 'teams', 'zoom', 'notion',
-                'trello', 'asana', 'word', 'excel', 'powerpoint', 'outlook'
-            ]
-        }
-        
-        found_skills = {}
-        text_lower = text.lower()
-        
-        for category, skills in skills_db.items():
-            found_skills[category] = []
-            for skill in skills:
-                # Use word boundaries to avoid partial matches
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    found_skills[category].append(skill)
-        
-        return found_skills
+        return self.skill_matcher.categorize(self.match_skills(self.document(text).section(*SKILL_SECTIONS)))
     
     def extract_experience(self, text):
-        """Extract work experience information"""
+        """Extract work experience information from the Experience section"""
         experience = {
             'total_years': 0,
             'positions': [],
@@ -176,9 +191,10 @@ class ResumeParser:
         if not text:
             return experience
         
+        document = self.document(text).section(*EXPERIENCE_SECTIONS)
+        
         # Extract years from text
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = [int(year) for year in re.findall(year_pattern, text)]
+        years = document.years
         
         if years:
             # Calculate approximate experience (max year - min year)
@@ -191,34 +207,61 @@ class ResumeParser:
             if len(years) == 1 and years[0] <= datetime.now().year:
                 experience['total_years'] = datetime.now().year - years[0]
         
-        # Extract job titles and companies (basic pattern matching)
-        job_patterns = [
-            r'(?i)(.*?)\s*(?:at|@|\|)\s*(.*?)(?:\n|$)',
-            r'(?i)(.*?)\s*-\s*(.*?)(?:\n|$)',
-            r'(?i)(senior|junior|lead)?\s*([a-z]+)\s*(?:developer|engineer|analyst|manager)'
-        ]
+        # Extract job titles and companies line by line: every scan is linear and
+        # stays within its line, and dicts keep first-seen order while deduping
+        separator_pairs = []
+        dash_pairs = []
+        title_pairs = []
+        for line in document.lines:
+            line_lower = line.lower()
+            
+            # "<position> at|@|| <company>" split at the leftmost separator
+            found = [(line_lower.find(separator), separator) for separator in EXPERIENCE_SEPARATORS]
+            found = [(index, separator) for index, separator in found if index >= 0]
+            if found:
+                index, separator = min(found)
+                separator_pairs.append((line[:index], line[index + len(separator):]))
+            
+            # "<position> - <company>"
+            index = line.find('-')
+            if index >= 0:
+                dash_pairs.append((line[:index], line[index + 1:]))
+            
+            # "[senior|junior|lead] <word> developer|engineer|analyst|manager"
+            for clause in CLAUSE_PATTERN.split(line):
+                words = WORD_PATTERN.findall(clause)
+                for i, word in enumerate(words):
+                    title = JOB_TITLE_PATTERN.search(word.lower())
+                    if title is None:
+                        continue
+                    if title.start() > 0:
+                        subject, before = word[:title.start()], words[i - 1] if i > 0 else ''
+                    elif i > 0:
+                        subject, before = words[i - 1], words[i - 2] if i > 1 else ''
+                    else:
+                        continue
+                    title_pairs.append((before if before.lower() in SENIORITY_WORDS else '', subject))
         
-        for pattern in job_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) == 2:
-                    position, company = match
-                    position = position.strip()
-                    company = company.strip()
-                    
-                    if (len(position) > 2 and len(company) > 2 and
-                        not any(word in position.lower() for word in ['email', 'phone', 'http']) and
-                        not any(word in company.lower() for word in ['email', 'phone', 'http'])):
-                        
-                        if position not in experience['positions']:
-                            experience['positions'].append(position)
-                        if company not in experience['companies']:
-                            experience['companies'].append(company)
+        positions = {}
+        companies = {}
+        for position, company in separator_pairs + dash_pairs + title_pairs:
+            position = position.strip()
+            company = company.strip()
+            
+            if (len(position) > 2 and len(company) > 2 and
+                not any(word in position.lower() for word in ['email', 'phone', 'http']) and
+                not any(word in company.lower() for word in ['email', 'phone', 'http'])):
+                
+                positions.setdefault(position)
+                companies.setdefault(company)
+        
+        experience['positions'] = list(positions)
+        experience['companies'] = list(companies)
         
         return experience
     
     def extract_education(self, text):
-        """Extract education information"""
+        """Extract education information from the Education section"""
         education = {
             'highest_degree': 'Unknown',
             'degrees': [],
@@ -227,8 +270,9 @@ class ResumeParser:
         
         if not text:
             return education
+        document = self.document(text).section(*EDUCATION_SECTIONS)
         
-        text_lower = text.lower()
+        text_lower = document.lower
         
         # Degree patterns with institutions
         degree_patterns = [
@@ -257,8 +301,7 @@ class ResumeParser:
         
         # Extract institution names (simple pattern)
         institution_keywords = ['university', 'college', 'institute', 'school']
-        lines = text.split('\n')
-        for line in lines:
+        for line in document.lines:
             line_lower = line.lower()
             if any(keyword in line_lower for keyword in institution_keywords):
                 # Check if this line likely contains an institution name
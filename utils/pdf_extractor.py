@@ -0,0 +1,255 @@
+"""
+PDF Extraction Engine
+Extracts text page by page with a single backend chosen per document,
+stops after a page/character budget, splits long documents across
+processes and reports per-page timings
+"""
+
+import io
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Resumes past a few pages are almost always junk, so stop early by default
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 5))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 50000))
+# Documents with more pages than this left to extract are split across processes
+# (only reached when PDF_MAX_PAGES allows it, and never inside the extraction sandbox)
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+PDF_PARALLEL_WORKERS = int(os.environ.get('PDF_PARALLEL_WORKERS', 4))
+
+# A first page with less text than this makes the probe try the other backend
+MIN_PROBE_CHARS = 100
+
+BACKENDS = ('pdfminer', 'pypdf2')
+
+
+class _PdfminerPages:
+    """Page-addressable pdfminer document (parsed once, pages extracted on demand)"""
+
+    def __init__(self, stream):
+        # Backends are imported on first use to keep application start-up fast
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfinterp import PDFResourceManager
+        from pdfminer.layout import LAParams
+
+        self.document = PDFDocument(PDFParser(stream))
+        self.pages = list(PDFPage.create_pages(self.document))
+        self.resource_manager = PDFResourceManager(caching=True)
+        self.laparams = LAParams()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def extract(self, index):
+        from pdfminer.pdfinterp import PDFPageInterpreter
+        from pdfminer.converter import TextConverter
+
+        output = io.StringIO()
+        device = TextConverter(self.resource_manager, output, laparams=self.laparams)
+        try:
+            PDFPageInterpreter(self.resource_manager, device).process_page(self.pages[index])
+        finally:
+            device.close()
+        return output.getvalue()
+
+
+class _PyPDF2Pages:
+    """Page-addressable PyPDF2 document"""
+
+    def __init__(self, stream):
+        import PyPDF2
+
+        self.reader = PyPDF2.PdfReader(stream)
+
+    def __len__(self):
+        return len(self.reader.pages)
+
+    def extract(self, index):
+        return self.reader.pages[index].extract_text() or ''
+
+
+def load_backends():
+    """Import every PDF backend now (e.g. before forking extraction processes)"""
+    import PyPDF2
+    import pdfminer.pdfparser
+    import pdfminer.pdfdocument
+    import pdfminer.pdfpage
+    import pdfminer.pdfinterp
+    import pdfminer.converter
+    import pdfminer.layout
+
+
+def _open_backend(backend, data):
+    stream = io.BytesIO(data)
+    if backend == 'pdfminer':
+        return _PdfminerPages(stream)
+    return _PyPDF2Pages(stream)
+
+
+def _extract_pages(document, indexes):
+    """Extract the given pages, returning (index, text, seconds) tuples"""
+    results = []
+    for index in indexes:
+        start = time.perf_counter()
+        text = document.extract(index)
+        results.append((index, text, time.perf_counter() - start))
+    return results
+
+
+def _extract_page_range(backend, data, indexes):
+    """Process pool entry point: open the document and extract a slice of pages"""
+    return _extract_pages(_open_backend(backend, data), indexes)
+
+
+_page_executor = None
+_page_executor_pid = None
+
+
+def _get_page_executor():
+    """Page extraction pool of the current process (a forked child never reuses its parent's)"""
+    global _page_executor, _page_executor_pid
+    if _page_executor is None or _page_executor_pid != os.getpid():
+        _page_executor = ProcessPoolExecutor(max_workers=PDF_PARALLEL_WORKERS)
+        _page_executor_pid = os.getpid()
+    return _page_executor
+
+
+def _reset_page_executor():
+    global _page_executor
+    if _page_executor is not None and _page_executor_pid == os.getpid():
+        _page_executor.shutdown(wait=False, cancel_futures=True)
+    _page_executor = None
+
+
+class PDFExtractor:
+    def __init__(self, backend='auto', max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+                 parallel_min_pages=PDF_PARALLEL_MIN_PAGES):
+        """
+        Args:
+            backend: 'auto' (probe the first page), 'pdfminer' or 'pypdf2'
+            max_pages: Stop after this many pages (None for no limit)
+            max_chars: Stop once this many characters were extracted (None for no limit)
+            parallel_min_pages: Split extraction across processes when more pages
+                than this are left to extract (None never splits)
+        """
+        if backend != 'auto' and backend not in BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        self.backend = backend
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.parallel_min_pages = parallel_min_pages
+
+    def _extract_parallel(self, backend, data, indexes):
+        """
+        Extract pages across the page pool, each worker parsing the document once
+        for its slice of pages; returns None if the pool broke (e.g. a worker was killed)
+        """
+        chunk_count = min(PDF_PARALLEL_WORKERS, len(indexes))
+        chunks = [indexes[i::chunk_count] for i in range(chunk_count)]
+        try:
+            executor = _get_page_executor()
+            futures = [executor.submit(_extract_page_range, backend, data, chunk) for chunk in chunks]
+            return sorted((page for future in futures for page in future.result()), key=lambda page: page[0])
+        except BrokenProcessPool as e:
+            logger.warning(f"⚠️ PDF page pool failed ({e}), extracting sequentially")
+            _reset_page_executor()
+            return None
+
+    def _choose_backend(self, data):
+        """
+        Pick one backend for the whole document
+
+        Returns:
+            Tuple of (backend, document, first_page) where first_page is the
+            already extracted (index, text, seconds) of page 0, if any
+        """
+        if self.backend != 'auto':
+            return self.backend, _open_backend(self.backend, data), None
+
+        errors = []
+        best = None
+        for backend in BACKENDS:
+            try:
+                document = _open_backend(backend, data)
+                if len(document) == 0:
+                    return backend, document, None
+                first_page = _extract_pages(document, [0])[0]
+            except Exception as e:
+                errors.append(f"{backend}: {e}")
+                continue
+
+            if best is None or len(first_page[1].strip()) > len(best[2][1].strip()):
+                best = (backend, document, first_page)
+            if len(first_page[1].strip()) >= MIN_PROBE_CHARS:
+                break
+
+        if best is None:
+            raise ValueError('; '.join(errors))
+        return best
+
+    def extract(self, source):
+        """
+        Extract text from PDF bytes or a binary stream
+
+        Returns:
+            Dictionary with the text, chosen backend and per-page timings
+        """
+        start = time.perf_counter()
+        data = source if isinstance(source, (bytes, bytearray)) else source.read()
+
+        backend, document, first_page = self._choose_backend(data)
+        page_count = len(document)
+        page_limit = page_count if self.max_pages is None else min(page_count, self.max_pages)
+
+        pages = [first_page] if first_page else []
+        remaining = list(range(len(pages), page_limit))
+
+        parallel = (
+            self.parallel_min_pages is not None
+            and len(remaining) > self.parallel_min_pages
+            # Daemonic processes (e.g. the extraction sandbox) cannot start child processes
+            and not multiprocessing.current_process().daemon
+        )
+        extracted = self._extract_parallel(backend, data, remaining) if parallel else None
+        if extracted is not None:
+            pages.extend(extracted)
+        else:
+            parallel = False
+            char_count = sum(len(text) for _, text, _ in pages)
+            for index in remaining:
+                if self.max_chars is not None and char_count >= self.max_chars:
+                    break
+                page = _extract_pages(document, [index])[0]
+                pages.append(page)
+                char_count += len(page[1])
+
+        # Apply the character budget (parallel extraction and the probed first page may overshoot it)
+        texts = []
+        char_count = 0
+        for _, text, _ in pages:
+            if self.max_chars is not None and char_count >= self.max_chars:
+                break
+            texts.append(text)
+            char_count += len(text)
+
+        return {
+            'text': '\n'.join(texts),
+            'backend': backend,
+            'page_count': page_count,
+            'pages_extracted': len(texts),
+            'truncated': len(texts) < page_count,
+            'parallel': parallel,
+            'total_seconds': round(time.perf_counter() - start, 4),
+            'pages': [
+                {'page': index + 1, 'chars': len(text), 'seconds': round(seconds, 4)}
+                for index, text, seconds in pages
+            ]
+        }
@@ -0,0 +1,343 @@
+"""
+Resume Analysis Pipeline
+Runs extraction, parsing, classification, fraud detection and eligibility
+scoring for a single resume without depending on Flask, so the same code
+serves the request thread and background workers
+"""
+
+import json
+import logging
+import time
+import unicodedata
+from datetime import datetime
+
+from utils.parser import (
+    ResumeParser,
+    CONTACT_SECTIONS,
+    SKILL_SECTIONS,
+    EXPERIENCE_SECTIONS,
+    EDUCATION_SECTIONS
+)
+from utils.extraction_sandbox import ExtractionFailed, create_extraction_sandbox
+from config.departments import (
+    calculate_eligibility_score,
+    calculate_all_eligibility_scores,
+    get_best_department,
+    get_ai_authenticity_status,
+    get_final_decision
+)
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of characters required to analyze a document
+MIN_TEXT_LENGTH = 50
+
+# Bump whenever parsing, classification or scoring changes so stored analyses
+# of re-uploaded documents are no longer reused
+PIPELINE_VERSION = '7'
+
+
+class AnalysisError(Exception):
+    """Raised when a document cannot be analyzed (e.g. no extractable text)"""
+
+
+def normalize_text(text):
+    """Normalize extracted text so fresh and cached extractions analyze identically"""
+    if not text:
+        return text
+    text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\x00', '')
+    return unicodedata.normalize('NFC', text)
+
+
+class ResumePipeline:
+    def __init__(self, parser=None, classifier=None, sandbox=None):
+        if classifier is None:
+            # scikit-learn is imported with the first pipeline, not with this module
+            from models.classifier import ResumeClassifier
+            classifier = ResumeClassifier()
+        self.parser = parser or ResumeParser()
+        self.classifier = classifier
+        # Optional ExtractionSandbox(Pool); extraction runs in-process without one
+        self.sandbox = sandbox
+
+    def extract_text(self, source, file_ext):
+        """
+        Extract normalized text (sandboxed if configured)
+
+        Returns:
+            Tuple of (text, stats); stats has a 'backend' key only when
+            extraction succeeded
+        """
+        if self.sandbox is None:
+            text, extraction = self.parser.extract_text_with_stats(source, file_ext)
+        else:
+            try:
+                text, extraction = self.sandbox.extract(source, file_ext)
+            except ExtractionFailed as e:
+                raise AnalysisError(str(e))
+
+        if extraction.get('pages'):
+            logger.info(
+                f"📄 {extraction['backend']}: {extraction['pages_extracted']}/{extraction['page_count']} pages "
+                f"in {extraction['total_seconds']:.3f}s "
+                f"({', '.join(str(page['seconds']) for page in extraction['pages'])}s per page)"
+            )
+        return normalize_text(text), extraction
+
+    def analyze_file(self, source, file_ext, department, start_time=None, all_departments=False):
+        """
+        Extract text from a file path, bytes buffer or stream and analyze it
+
+        The extracted text is returned in meta['text'] so callers can cache it
+        """
+        start_time = start_time or datetime.now()
+        text, extraction = self.extract_text(source, file_ext)
+        fields, meta = self.analyze_text(text, department, start_time, all_departments)
+        meta['extraction'] = extraction
+        meta['text'] = text if extraction.get('backend') else None
+        return fields, meta
+
+    def analyze_text(self, text, department, start_time=None, all_departments=False):
+        """
+        Analyze extracted resume text for a department
+
+        With all_departments the candidate is also scored against every
+        department in one pass and the results are stored in
+        fields['department_scores']; department may then be None to use the
+        best-scoring department
+
+        Returns:
+            Tuple of (fields, meta): fields are ResumeAnalysis column values
+            (without filenames), meta holds response-only values
+        """
+        start_time = start_time or datetime.now()
+
+        if not text or len(text.strip()) < MIN_TEXT_LENGTH:
+            raise AnalysisError(
+                'Could not extract sufficient text from document. The file may be corrupted, scanned, or contain mostly images.'
+            )
+
+        logger.info(f"📝 Extracted {len(text)} characters from resume")
+
+        # One shared context, so the lowercase text, years, contacts and skill
+        # hits are computed once for every stage below
+        document = self.parser.document(text)
+
+        # Segment once; each extractor then scans only its own sections
+        segment_start = time.perf_counter()
+        section_stats = {
+            'spans': {name: sum(end - start for start, end in spans) for name, spans in document.sections.items()},
+            'segmentation_seconds': round(time.perf_counter() - segment_start, 6),
+            'stages': {}
+        }
+
+        # Parse resume information
+        personal_info = self._run_stage(section_stats, 'personal_info', CONTACT_SECTIONS, self.parser.parse_personal_info, document)
+        skills = self._run_stage(section_stats, 'skills', SKILL_SECTIONS, self.parser.extract_skills, document)
+        experience = self._run_stage(section_stats, 'experience', EXPERIENCE_SECTIONS, self.parser.extract_experience, document)
+        education = self._run_stage(section_stats, 'education', EDUCATION_SECTIONS, self.parser.extract_education, document)
+
+        logger.info("🧩 Sections: " + ', '.join(
+            f"{stage} {stats['chars']} chars {stats['seconds'] * 1000:.2f}ms"
+            for stage, stats in section_stats['stages'].items()
+        ))
+
+        logger.info(f"👤 Candidate: {personal_info['name']} | Skills: {sum(len(s) for s in skills.values())}")
+
+        # Classify resume (the selected department overrides the predicted one);
+        # rule-based until the model has finished loading or training. One
+        # snapshot, so the recorded version is the one that answered
+        model = self.classifier.current_model()
+        model_ready = model is not None
+        status, _, ranking_score = self.classifier.classify_resume(document, skills, model)
+
+        # Fraud detection
+        fraud_score, fraud_findings = self.classifier.detect_fraud(document, skills, experience)
+
+        # Prepare candidate data for eligibility scoring
+        all_skills = []
+        for category in skills.values():
+            all_skills.extend(category)
+
+        candidate_data = {
+            'skills': all_skills,
+            'experience_years': experience['total_years'],
+            'education': json.dumps(education, ensure_ascii=False),
+            'work_experience': json.dumps(experience, ensure_ascii=False)
+        }
+
+        department_scores = None
+        if all_departments:
+            department_scores = calculate_all_eligibility_scores(candidate_data)
+            for result in department_scores.values():
+                result['final_decision'], result['final_decision_reason'] = get_final_decision(
+                    fraud_score, result, fraud_score
+                )
+            if not department:
+                department = get_best_department(department_scores)
+
+        if department_scores and department in department_scores:
+            eligibility_result = department_scores[department]
+        else:
+            eligibility_result = calculate_eligibility_score(candidate_data, department)
+        ai_authenticity = get_ai_authenticity_status(fraud_score)
+        final_decision, decision_reason = get_final_decision(
+            fraud_score,
+            eligibility_result,
+            fraud_score
+        )
+
+        processing_time = (datetime.now() - start_time).total_seconds()
+
+        analysis_report = build_analysis_report(
+            personal_info, department, eligibility_result, experience, education,
+            skills, ai_authenticity, fraud_score, fraud_findings,
+            final_decision, decision_reason, processing_time, department_scores
+        )
+
+        fields = {
+            'candidate_name': personal_info['name'],
+            'candidate_email': personal_info['email'],
+            'candidate_phone': personal_info['phone'],
+            'candidate_location': personal_info['location'],
+            'work_experience': json.dumps(experience, ensure_ascii=False),
+            'education': json.dumps(education, ensure_ascii=False),
+            'skills': json.dumps(skills, ensure_ascii=False),
+            'classification_status': final_decision,
+            'department': department,
+            'ranking_score': ranking_score,
+            'experience_years': experience['total_years'],
+            'education_level': education['highest_degree'],
+            'overall_fraud_score': fraud_score,
+            'ai_generated_score': fraud_score,
+            'eligibility_score': eligibility_result['total_score'],
+            'skill_match_percentage': eligibility_result['skill_match_percentage'],
+            'ai_authenticity_status': ai_authenticity,
+            'final_decision': final_decision,
+            'final_decision_reason': decision_reason,
+            'analysis_report': analysis_report,
+            'processing_time': processing_time,
+            # Fallback results are never reused for duplicate uploads
+            'pipeline_version': PIPELINE_VERSION if model_ready else f'{PIPELINE_VERSION}-fallback',
+            'model_version': model.version if model_ready else None,
+            'department_scores': json.dumps(department_scores, ensure_ascii=False) if department_scores else None
+        }
+
+        meta = {
+            'status': status,
+            'processing_time': processing_time,
+            'text_length': len(text),
+            'total_skills': sum(len(skills[cat]) for cat in skills),
+            'model_ready': model_ready,
+            'sections': section_stats
+        }
+
+        logger.info(f"✅ Analysis completed: {status} | {department} | Score: {ranking_score}")
+
+        return fields, meta
+
+    def _run_stage(self, section_stats, stage, section_names, extract, document):
+        """Run one extractor and record the sections it scanned and how long it took"""
+        start = time.perf_counter()
+        result = extract(document)
+        section_stats['stages'][stage] = {
+            'sections': [name for name in section_names if name in document.sections] or ['All'],
+            'chars': len(document.section(*section_names)),
+            'seconds': round(time.perf_counter() - start, 6)
+        }
+        return result
+
+
+def build_analysis_report(personal_info, department, eligibility_result, experience,
+                          education, skills, ai_authenticity, fraud_score,
+                          fraud_findings, final_decision, decision_reason,
+                          processing_time, department_scores=None):
+    """Render the plain-text analysis report stored with each analysis"""
+    all_departments_section = ''
+    if department_scores:
+        ranked = sorted(department_scores.items(), key=lambda item: item[1]['total_score'], reverse=True)
+        all_departments_section = """
+ALL DEPARTMENTS:
+───────────────
+""" + '\n'.join(
+            f"• {name}: {result['total_score']:.1f}/{result['min_score_required']} "
+            f"(Skill Match {result['skill_match_percentage']:.1f}%) - {result['final_decision']}"
+            for name, result in ranked
+        ) + '\n'
+
+    return f"""
+COMPREHENSIVE RESUME ANALYSIS REPORT
+====================================
+Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Processing Time: {processing_time:.2f} seconds
+
+CANDIDATE INFORMATION:
+────────────────────
+Name: {personal_info['name'] or 'Not specified'}
+Email: {personal_info['email'] or 'Not specified'}
+Phone: {personal_info['phone'] or 'Not specified'}
+Location: {personal_info['location'] or 'Not specified'}
+
+DEPARTMENT & ELIGIBILITY:
+────────────────────────
+Selected Department: {department}
+Eligibility Score: {eligibility_result['total_score']:.1f}/{eligibility_result['min_score_required']}
+Skill Match: {eligibility_result['skill_match_percentage']:.1f}%
+Status: {eligibility_result['message']}
+
+SCORE BREAKDOWN:
+───────────────
+• Skills: {eligibility_result['breakdown']['skill_score']:.1f}
+• Experience: {eligibility_result['breakdown']['experience_score']:.1f}
+• Education: {eligibility_result['breakdown']['education_score']:.1f}
+• Projects/Certs: {eligibility_result['breakdown']['projects_score']:.1f}
+{all_departments_section}
+EXPERIENCE & EDUCATION:
+──────────────────────
+Total Experience: {experience['total_years']} years
+Highest Education: {education['highest_degree']}
+
+SKILLS ANALYSIS:
+───────────────
+Total Skills Categories: {len(skills)}
+Total Skills Detected: {sum(len(skills[cat]) for cat in skills)}
+
+{json.dumps(skills, indent=2, ensure_ascii=False)}
+
+AI AUTHENTICITY & FRAUD DETECTION:
+─────────────────────────────────
+AI Authenticity Status: {ai_authenticity}
+Overall Fraud Score: {fraud_score}%
+Findings:
+{chr(10).join(['• ' + finding for finding in fraud_findings]) if fraud_findings else '• No significant fraud indicators detected'}
+
+FINAL DECISION:
+──────────────
+Decision: {final_decision}
+Reason: {decision_reason}
+{'✅ RECOMMENDED FOR HIRING' if final_decision == 'Shortlisted' else '❌ NOT RECOMMENDED'}
+"""
+
+
+# Per-process pipeline used by ProcessPoolExecutor workers
+_worker_pipeline = None
+
+
+def init_worker_pipeline():
+    """ProcessPoolExecutor initializer: build one pipeline per worker process"""
+    global _worker_pipeline
+    _worker_pipeline = ResumePipeline(sandbox=create_extraction_sandbox())
+
+
+def analyze_file_in_worker(source, file_ext, department, all_departments=False):
+    """Analyze one document (path or bytes) inside a pool worker process"""
+    if _worker_pipeline is None:
+        init_worker_pipeline()
+    return _worker_pipeline.analyze_file(source, file_ext, department, all_departments=all_departments)
+
+
+def analyze_text_in_worker(text, department, all_departments=False):
+    """Analyze already extracted text inside a pool worker process"""
+    if _worker_pipeline is None:
+        init_worker_pipeline()
+    return _worker_pipeline.analyze_text(text, department, all_departments=all_departments)
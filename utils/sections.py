@@ -0,0 +1,99 @@
+"""
+Resume Section Segmentation
+Splits resume text into Contact, Summary, Experience, Education, Skills,
+Projects and Certifications spans in one pass over its lines, so each
+extractor only scans the part of the resume it is interested in
+"""
+
+SECTION_NAMES = ('Contact', 'Summary', 'Experience', 'Education', 'Skills', 'Projects', 'Certifications')
+
+# Heading text (lowercase, without bullets or a trailing colon) -> section
+SECTION_HEADINGS = {
+    'summary': 'Summary',
+    'professional summary': 'Summary',
+    'career summary': 'Summary',
+    'profile': 'Summary',
+    'professional profile': 'Summary',
+    'objective': 'Summary',
+    'career objective': 'Summary',
+    'about me': 'Summary',
+    'experience': 'Experience',
+    'work experience': 'Experience',
+    'professional experience': 'Experience',
+    'relevant experience': 'Experience',
+    'employment': 'Experience',
+    'employment history': 'Experience',
+    'work history': 'Experience',
+    'career history': 'Experience',
+    'internships': 'Experience',
+    'education': 'Education',
+    'academic background': 'Education',
+    'academics': 'Education',
+    'academic qualifications': 'Education',
+    'educational qualifications': 'Education',
+    'qualifications': 'Education',
+    'skills': 'Skills',
+    'technical skills': 'Skills',
+    'key skills': 'Skills',
+    'core skills': 'Skills',
+    'core competencies': 'Skills',
+    'competencies': 'Skills',
+    'technologies': 'Skills',
+    'skills & tools': 'Skills',
+    'projects': 'Projects',
+    'personal projects': 'Projects',
+    'academic projects': 'Projects',
+    'key projects': 'Projects',
+    'portfolio': 'Projects',
+    'certifications': 'Certifications',
+    'certificates': 'Certifications',
+    'licenses': 'Certifications',
+    'licenses & certifications': 'Certifications',
+    'certifications & licenses': 'Certifications',
+    'courses': 'Certifications',
+}
+
+# Headings are short; longer lines are never looked up
+MAX_HEADING_LENGTH = 60
+HEADING_DECORATION = '#*•-–—=_ \t'
+
+
+def heading_section(line):
+    """Return the section a line is the heading of, or None"""
+    # "SKILLS: Python, Java" starts the Skills section on the heading line
+    label = line.partition(':')[0].strip(HEADING_DECORATION)
+    if len(label) > MAX_HEADING_LENGTH:
+        return None
+    return SECTION_HEADINGS.get(label.lower())
+
+
+def segment_sections(text):
+    """
+    Split text into section spans
+
+    Text before the first heading is the Contact section. A section may
+    appear more than once (e.g. two Experience headings).
+
+    Returns:
+        Dictionary mapping section name to a list of (start, end) character
+        offsets, in text order; sections without a heading are absent
+    """
+    sections = {}
+    if not text:
+        return sections
+
+    current, start, offset = 'Contact', 0, 0
+    for line in text.split('\n'):
+        section = heading_section(line)
+        if section is not None:
+            if offset > start and (current != 'Contact' or text[start:offset].strip()):
+                sections.setdefault(current, []).append((start, offset))
+            current, start = section, offset
+        offset += len(line) + 1
+
+    if current != 'Contact' or text[start:].strip():
+        sections.setdefault(current, []).append((start, len(text)))
+    # Without a single heading there is nothing to segment
+    if list(sections) == ['Contact']:
+        return {}
+    return sections
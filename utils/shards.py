@@ -0,0 +1,247 @@
+"""
+Sharded Directory
+Append-only storage of numpy arrays in shard directories: each shard is
+written under a temporary name and renamed into place, never modified, and
+read back memory-mapped. Deleted ids are recorded in tombstone files that
+hide the rows written before them until compaction drops those rows. Used
+by the feature store and the corpus matrix
+"""
+
+import os
+import json
+import time
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from models.artifacts import publish_permissions
+
+try:
+    import fcntl
+except ImportError:  # Windows: compactions are not serialized between processes
+    fcntl = None
+
+
+class ShardedDirectory:
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Where shards are written (created on first write)
+        """
+        self.directory = directory
+
+    def shards(self):
+        """Shard names, oldest first"""
+        return self._names('shard-')
+
+    def _names(self, prefix):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if name.startswith(prefix))
+
+    def write_shard(self, arrays, documents, name=None):
+        """
+        Write one shard under a temporary name and rename it into place, so readers never see a partial shard
+
+        Args:
+            arrays: {name: array}, each saved as <name>.npy
+            documents: {name: JSON-serializable value}, each saved as <name>.json
+            name: Shard name (defaults to a new one that sorts after every existing shard)
+
+        Returns:
+            The shard name
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        name = name or f'shard-{time.time_ns():020d}-{os.getpid()}'
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            for key, array in arrays.items():
+                np.save(os.path.join(staging, f'{key}.npy'), array)
+            for key, document in documents.items():
+                with open(os.path.join(staging, f'{key}.json'), 'w') as f:
+                    json.dump(document, f)
+            # mkdtemp creates the directory 0700; other users' workers read shards too
+            publish_permissions(staging)
+            os.rename(staging, os.path.join(self.directory, name))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return name
+
+    def read_shard(self, name, arrays, documents=()):
+        """Memory-mapped arrays and parsed JSON documents of one shard (and its name), as one dictionary"""
+        path = os.path.join(self.directory, name)
+        shard = {key: np.load(os.path.join(path, f'{key}.npy'), mmap_mode='r') for key in arrays}
+        shard['name'] = name
+        for key in documents:
+            with open(os.path.join(path, f'{key}.json')) as f:
+                shard[key] = json.load(f)
+        return shard
+
+    def iter_shards(self, arrays, documents=(), names=None):
+        """Yield every shard (or the named ones) read with read_shard, oldest first (skipping shards a compaction just removed)"""
+        for name in self.shards() if names is None else names:
+            try:
+                yield self.read_shard(name, arrays, documents)
+            except FileNotFoundError:
+                continue
+
+    def shard_rows(self, name):
+        """Number of rows in one shard"""
+        return len(self.read_shard(name, ('ids',))['ids'])
+
+    def tiered_run(self, max_shards):
+        """
+        Shards a tiered merge rewrites once there are more than max_shards: the
+        newest shard plus each older one no larger than the rows gathered so
+        far, so large shards are left alone and a row is only rewritten when
+        the shard holding it at least doubles
+
+        Returns:
+            Shard names oldest first, a suffix of shards(); empty when no merge is due
+        """
+        names = self.shards()
+        if not max_shards or len(names) <= max_shards:
+            return []
+        start = len(names) - 1
+        rows = self.shard_rows(names[start])
+        while start > 0:
+            previous = self.shard_rows(names[start - 1])
+            if len(names) - start >= 2 and previous > rows:
+                break
+            start -= 1
+            rows += previous
+        return names[start:]
+
+    def merged_name(self, names):
+        """Name for the merge of names: after the newest of them, so it sorts before any shard written since"""
+        return f"shard-{names[-1].split('-')[1]}-merged-{time.time_ns()}"
+
+    def delete(self, ids):
+        """
+        Record ids as deleted: their rows written so far are hidden on read
+        and dropped by the next compaction, rows written later are kept
+
+        Returns:
+            The tombstone file name, or None when ids is empty
+        """
+        if not len(ids):
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = f'tombstone-{time.time_ns():020d}-{os.getpid()}.npy'
+        fd, staging = tempfile.mkstemp(dir=self.directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(ids, dtype=np.int64))
+            publish_permissions(staging)
+            os.replace(staging, os.path.join(self.directory, name))
+        except BaseException:
+            if os.path.exists(staging):
+                os.remove(staging)
+            raise
+        return name
+
+    def tombstones(self):
+        """
+        Deleted ids and when they were deleted
+
+        Returns:
+            Tuple of (names, ids, times): the tombstone files read, and for
+            each deleted id the time of its newest deletion, sorted by id
+        """
+        names, ids, times = [], [], []
+        for name in self._names('tombstone-'):
+            try:
+                deleted = np.load(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            names.append(name)
+            ids.append(deleted)
+            times.append(np.full(len(deleted), shard_time(name), dtype=np.int64))
+        if not names:
+            return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        ids, times = np.concatenate(ids), np.concatenate(times)
+        # Newest deletion of each id: the last of its run once sorted by (id, time)
+        order = np.lexsort((times, ids))
+        ids, times = ids[order], times[order]
+        last = np.append(ids[1:] != ids[:-1], True)
+        return names, ids[last], times[last]
+
+    def live_rows(self, ids, row_times, keep_ids=None, tombstones=None):
+        """
+        Positions of the rows to read: newest_rows without the rows hidden by a later tombstone
+
+        Args:
+            ids: Row ids in shard order
+            row_times: shard_time() of the shard holding each row
+            keep_ids: Optional ids to keep
+            tombstones: A tombstones() result to reuse (read from disk by default)
+        """
+        rows = newest_rows(ids, keep_ids)
+        _, deleted_ids, deleted_times = tombstones or self.tombstones()
+        if len(deleted_ids) and len(rows):
+            position = np.minimum(np.searchsorted(deleted_ids, ids[rows]), len(deleted_ids) - 1)
+            hidden = (deleted_ids[position] == ids[rows]) & (deleted_times[position] > row_times[rows])
+            rows = rows[~hidden]
+        return rows
+
+    def remove_tombstones(self, names, merged_name):
+        """Remove the tombstones applied by a compaction into merged_name (ones that could hide a row of a shard written since stay)"""
+        for name in names:
+            if shard_time(name) <= shard_time(merged_name):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def remove_shards(self, names):
+        for name in names:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    @contextmanager
+    def compaction_lock(self):
+        """Non-blocking inter-process lock; yields whether it was acquired"""
+        if fcntl is None:
+            yield True
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def shard_time(name):
+    """Creation time (ns) encoded in a shard or tombstone name; merged shards keep the newest time they merged"""
+    return int(name.split('-')[1].split('.')[0])
+
+
+def row_times(shards):
+    """shard_time() of every row of shards read with read_shard, in shard order"""
+    return np.repeat(
+        np.array([shard_time(shard['name']) for shard in shards], dtype=np.int64),
+        [len(shard['ids']) for shard in shards]
+    )
+
+
+def newest_rows(ids, keep_ids=None):
+    """
+    Positions of the rows to keep from ids in shard order: the newest row
+    of each id, only for ids in keep_ids when given; in ascending order
+    """
+    ids = np.asarray(ids)
+    # Newest row of each id: first occurrence in the reversed order
+    _, last = np.unique(ids[::-1], return_index=True)
+    rows = len(ids) - 1 - last
+    if keep_ids is not None:
+        rows = rows[np.isin(ids[rows], np.asarray(list(keep_ids), dtype=np.int64))]
+    rows.sort()
+    return rows
@@ -0,0 +1,105 @@
+"""
+Skill Matcher
+Finds every skill of a taxonomy (with aliases) in one pass over the text
+using a single regex compiled from a character trie of all surface forms
+"""
+
+import os
+import re
+import json
+from functools import lru_cache
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'skills_taxonomy.json'
+)
+SKILLS_TAXONOMY = os.environ.get('SKILLS_TAXONOMY', DEFAULT_TAXONOMY_PATH)
+
+
+def _trie_pattern(node):
+    """Render a character trie as a regex; greedy optional groups prefer longer forms"""
+    terminal = '' in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        return '(?:' + body + ')?' if len(branches) > 1 or len(body) > 1 else body + '?'
+    return body
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        """
+        Args:
+            taxonomy: Dictionary mapping category to a list of skills; a skill is
+                either a string or {"skill": name, "aliases": [...]}
+        """
+        self.categories = {}  # Category -> canonical skills, in taxonomy order
+        self.skill_categories = {}  # Canonical skill -> categories
+        self.forms = {}  # Lowercase surface form (skill or alias) -> canonical skill
+
+        for category, entries in taxonomy.items():
+            self.categories[category] = []
+            for entry in entries:
+                if isinstance(entry, str):
+                    skill, aliases = entry, []
+                else:
+                    skill, aliases = entry['skill'], entry.get('aliases', [])
+                skill = skill.lower().strip()
+                self.categories[category].append(skill)
+                self.skill_categories.setdefault(skill, []).append(category)
+                for form in [skill] + [alias.lower().strip() for alias in aliases]:
+                    if self.forms.get(form, skill) != skill:
+                        raise ValueError(f"Skill form '{form}' maps to both '{self.forms[form]}' and '{skill}'")
+                    self.forms[form] = skill
+
+        trie = {}
+        for form in self.forms:
+            node = trie
+            for char in form:
+                node = node.setdefault(char, {})
+            node[''] = True
+        # A dot between word characters joins a name ("node.js"), so it is no boundary;
+        # matches never overlap, each mention counting once as its longest form
+        self.pattern = re.compile(
+            r'(?<!\w)(?<!\w\.)(' + _trie_pattern(trie) + r')(?!\w)(?!\.\w)', re.IGNORECASE
+        )
+
+    @classmethod
+    def from_file(cls, path=SKILLS_TAXONOMY):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def find(self, text):
+        """
+        Find every skill mention in the text
+
+        Returns:
+            Dictionary mapping canonical skill to {'count', 'offsets', 'categories'},
+            offsets being (start, end) positions in the text
+        """
+        hits = {}
+        if not text:
+            return hits
+
+        for match in self.pattern.finditer(text):
+            skill = self.forms[match.group(1).lower()]
+            hit = hits.get(skill)
+            if hit is None:
+                hit = hits[skill] = {'count': 0, 'offsets': [], 'categories': self.skill_categories[skill]}
+            hit['count'] += 1
+            hit['offsets'].append(match.span(1))
+        return hits
+
+    def categorize(self, hits):
+        """Group found skills by category in taxonomy order (every category present)"""
+        return {
+            category: [skill for skill in skills if skill in hits]
+            for category, skills in self.categories.items()
+        }
+
+
+@lru_cache(maxsize=None)
+def get_skill_matcher(path=SKILLS_TAXONOMY):
+    """Matcher for a taxonomy file, compiled once per process"""
+    return SkillMatcher.from_file(path)